@@ -0,0 +1,40 @@
+"""
+Gunicorn configuration.
+Serves the Flask API from pre-forked worker processes sized from Config:
+
+    gunicorn -c gunicorn.conf.py src.api.wsgi:app
+
+The application, its NumPy/scikit-learn imports and the initial job data are
+loaded once in the master process and shared copy-on-write by the workers.
+``kill -HUP <master pid>`` gracefully replaces the workers (they finish their
+requests within SERVER_GRACEFUL_TIMEOUT); since the code is preloaded, deploy
+new code by restarting the master or with a USR2 binary upgrade.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.config import Config  # noqa: E402
+
+bind = f"{Config.API_HOST}:{Config.API_PORT}"
+workers = Config.SERVER_WORKERS
+threads = Config.SERVER_THREADS
+worker_class = 'gthread'
+timeout = Config.SERVER_TIMEOUT
+graceful_timeout = Config.SERVER_GRACEFUL_TIMEOUT
+keepalive = 5
+preload_app = True
+accesslog = '-'
+
+
+def when_ready(server):
+    """Load the job data in the master before the first workers are forked."""
+    from src.api.wsgi import job_service
+    job_service.preload()
+
+
+def post_fork(server, worker):
+    """Recreate the thread pools and connections a worker cannot inherit."""
+    from src.api.wsgi import job_service
+    job_service.after_fork()
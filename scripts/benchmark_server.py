@@ -0,0 +1,108 @@
+"""
+HTTP throughput benchmark.
+Sends requests from concurrent keep-alive clients to a running API server and
+reports throughput and latency percentiles:
+
+    python scripts/benchmark_server.py --url http://127.0.0.1:5000 \
+        --path /api/jobs/statistics --concurrency 16 --duration 10
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+import numpy as np
+
+
+def run_client(host: str, port: int, paths: List[str], body: Optional[bytes], deadline: float,
+               latencies: List[float], errors: List[int]) -> None:
+    """
+    Send requests over one keep-alive connection until the deadline.
+
+    Args:
+        host: Server host
+        port: Server port
+        paths: Paths requested in turn
+        body: JSON body to POST, or None to GET
+        deadline: time.perf_counter() value at which to stop
+        latencies: Receives the latency of every successful request in seconds
+        errors: Receives one entry per failed request
+    """
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    count = 0
+    while time.perf_counter() < deadline:
+        path = paths[count % len(paths)]
+        count += 1
+        started = time.perf_counter()
+        try:
+            conn.request('POST' if body is not None else 'GET', path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                raise http.client.HTTPException(f"status {response.status}")
+            latencies.append(time.perf_counter() - started)
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+    conn.close()
+
+
+def benchmark(url: str, paths: List[str], concurrency: int, duration: float,
+              body: Optional[bytes] = None) -> Dict[str, Any]:
+    """
+    Load a server from concurrent clients for a fixed duration.
+
+    Args:
+        url: Base URL of the server
+        paths: Paths requested in turn by every client
+        concurrency: Number of concurrent clients
+        duration: Seconds to run
+        body: JSON body to POST, or None to GET
+
+    Returns:
+        Dictionary with request and error counts, throughput in requests per
+        second and p50/p95/p99 latencies in milliseconds
+    """
+    target = urlsplit(url)
+    per_client: List[List[float]] = [[] for _ in range(concurrency)]
+    errors: List[int] = []
+    deadline = time.perf_counter() + duration
+    clients = [threading.Thread(target=run_client,
+                                args=(target.hostname, target.port or 80, paths, body, deadline, latencies, errors))
+               for latencies in per_client]
+    started = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array([latency for latencies in per_client for latency in latencies]) * 1000
+    result = {'requests': int(latencies.size), 'errors': len(errors),
+              'requests_per_second': round(latencies.size / elapsed, 1)}
+    for percentile in (50, 95, 99):
+        result[f"p{percentile}_ms"] = round(float(np.percentile(latencies, percentile)), 2) if latencies.size else None
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='Base URL of the running server')
+    parser.add_argument('--path', action='append', dest='paths',
+                        help='Path to request, repeat to rotate (default: /api/jobs/statistics)')
+    parser.add_argument('--body', help='JSON body to POST instead of GET')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent keep-alive clients')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds to run')
+    args = parser.parse_args()
+
+    body = args.body.encode('utf-8') if args.body else None
+    result = benchmark(args.url, args.paths or ['/api/jobs/statistics'], args.concurrency, args.duration, body)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,324 @@
+"""
+ASGI application module.
+Serves the /api/jobs endpoints of the Flask API from async Starlette handlers
+with the same JSON envelopes, so one process can hold many concurrent slow
+clients. Blocking service calls run on a bounded thread pool, and job data is
+fetched with an async HTTP client in a single fetch shared by every request
+waiting for it.
+
+Run with any ASGI server, e.g. ``uvicorn src.api.asgi:app``.
+"""
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import httpx
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+from src.config import Config
+from src.services.cube import DIMENSIONS
+from src.services.job_service import JobService
+from src.utils.validation import ValidationError
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+API_PREFIX = '/api/jobs'
+
+
+class AsyncJobService:
+    """
+    Runs JobService calls off the event loop.
+
+    Calls go to a fixed-size thread pool, so CPU-bound aggregation and model
+    fitting never block the loop and at most ASYNC_EXECUTOR_WORKERS of them
+    run at once. Calls that need job data first wait, without holding a pool
+    thread, for a single async fetch (see JobRepository.fetch_job_data_async)
+    shared by all requests that arrive while the cache is cold.
+    """
+
+    def __init__(self, service: JobService, workers: int = None):
+        """
+        Initialize service.
+
+        Args:
+            service: JobService to call
+            workers: Pool threads. If None, uses Config.ASYNC_EXECUTOR_WORKERS
+        """
+        self.service = service
+        self._executor = ThreadPoolExecutor(max_workers=workers or Config.ASYNC_EXECUTOR_WORKERS,
+                                            thread_name_prefix='asgi')
+        # Future of the fetch in flight and the HTTP client, both bound to the running event loop
+        self._loading: Optional[asyncio.Future] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def call(self, func: Callable[..., Any], *args: Any, needs_snapshot: bool = True) -> Any:
+        """
+        Run a blocking service call on the thread pool.
+
+        Args:
+            func: Callable to run
+            *args: Arguments of func
+            needs_snapshot: Whether func reads the job data snapshot
+
+        Returns:
+            Return value of func
+        """
+        loop = asyncio.get_running_loop()
+        if needs_snapshot and not self.service.has_snapshot():
+            await self._load_snapshot(loop)
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def _load_snapshot(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Wait for the job data fetch, starting it unless one is in flight."""
+        if self._loading is None or self._loading.done() or self._loading.get_loop() is not loop:
+            self._loading = asyncio.ensure_future(self._fetch_snapshot(loop))
+        # A cancelled request must not cancel the fetch the others wait for
+        await asyncio.shield(self._loading)
+
+    async def _fetch_snapshot(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Fetch job data on the event loop and build the snapshot from it on the thread pool."""
+        if self._client is None or self._client_loop is not loop:
+            self._client = self.service.job_repository.create_async_client()
+            self._client_loop = loop
+        payload = await self.service.job_repository.fetch_job_data_async(self._client)
+        await loop.run_in_executor(self._executor, self.service.ensure_snapshot, payload)
+
+    async def shutdown(self) -> None:
+        """Close the HTTP client and stop accepting calls; running calls finish in the background."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._executor.shutdown(wait=False)
+
+
+Handler = Callable[[Request, AsyncJobService], Awaitable[Tuple[Dict[str, Any], int]]]
+
+
+def _error(message: str, error_type: str) -> Dict[str, Any]:
+    """Error envelope."""
+    return {'status': 'error', 'error': message, 'error_type': error_type}
+
+
+def _success(data: Any) -> Tuple[Dict[str, Any], int]:
+    """Success envelope with status code 200."""
+    return {'status': 'success', 'data': data}, 200
+
+
+def endpoint(handler: Handler) -> Callable[[Request], Awaitable[JSONResponse]]:
+    """
+    Turn a handler into a Starlette endpoint with the error envelopes of the Flask routes.
+
+    Handlers receive the request and the app's AsyncJobService and return a
+    (JSON body, status code) pair. ValidationError gives 400
+    'validation_error' (with 'invalid_indices' for bulk validation) and any
+    other exception 500 'server_error'.
+    """
+    @wraps(handler)
+    async def run(request: Request) -> JSONResponse:
+        try:
+            body, status = await handler(request, request.app.state.service)
+        except ValidationError as e:
+            logger.error(f"Validation error: {str(e)}")
+            body, status = _error(str(e), 'validation_error'), 400
+            if e.indices is not None:
+                body['invalid_indices'] = e.indices
+        except Exception as e:
+            logger.error(f"Error in {handler.__name__}: {str(e)}")
+            body, status = _error(str(e), 'server_error'), 500
+        return JSONResponse(body, status_code=status)
+    return run
+
+
+async def _json_body(request: Request) -> Any:
+    """
+    Decode the JSON request body.
+
+    Returns:
+        Decoded body, or None if the body is empty
+
+    Raises:
+        ValidationError: If the body is not valid JSON
+    """
+    body = await request.body()
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise ValidationError("Invalid JSON data provided")
+
+
+def _no_json_data() -> Tuple[Dict[str, Any], int]:
+    """Response to a POST request without a JSON body."""
+    return _error('No JSON data provided', 'validation_error'), 400
+
+
+@endpoint
+async def get_job_trends(request: Request, service: AsyncJobService):
+    """Endpoint to get job market trends (see routes.get_job_trends)."""
+    logger.info("Received request for job trends")
+    return _success(await service.call(service.service.get_job_trends))
+
+
+@endpoint
+async def predict_job_trends(request: Request, service: AsyncJobService):
+    """Endpoint to predict future job trends (see routes.predict_job_trends)."""
+    data = await _json_body(request)
+    if not data:
+        return _no_json_data()
+
+    logger.info("Received prediction request")
+    return _success(await service.call(service.service.predict_job_trends, data, needs_snapshot=False))
+
+
+@endpoint
+async def predict_job_trends_batch(request: Request, service: AsyncJobService):
+    """Endpoint to predict future job trends for many series (see routes.predict_job_trends_batch)."""
+    data = await _json_body(request)
+    if not data:
+        return _no_json_data()
+
+    logger.info("Received batch prediction request")
+    series = data.get('series') if isinstance(data, dict) else None
+    predictions = await service.call(service.service.predict_job_trends_batch, series, needs_snapshot=False)
+    return _success({'predictions': predictions})
+
+
+@endpoint
+async def get_statistics(request: Request, service: AsyncJobService):
+    """Endpoint to get overall job market statistics (see routes.get_statistics)."""
+    logger.info("Received request for statistics")
+    return _success(await service.call(service.service.get_statistics))
+
+
+@endpoint
+async def get_aggregates(request: Request, service: AsyncJobService):
+    """Endpoint to drill down into job market aggregates (see routes.get_aggregates)."""
+    args = request.query_params
+    group_by = [dim.strip() for dim in args.get('group_by', 'category').split(',') if dim.strip()]
+    filters = {dim: args[dim] for dim in DIMENSIONS if dim in args}
+
+    logger.info(f"Received aggregate request grouped by {group_by}")
+    return _success(await service.call(service.service.get_aggregates, group_by, filters))
+
+
+@endpoint
+async def get_forecast(request: Request, service: AsyncJobService):
+    """Endpoint to get the materialized salary forecast of a job category (see routes.get_forecast)."""
+    category = request.path_params['category']
+    location = request.query_params.get('location')
+
+    logger.info(f"Received forecast request for {category}")
+    forecast = await service.call(service.service.get_forecast, category, location)
+    if forecast is None:
+        return _error(f"No forecast available for '{category}'" + (f" in '{location}'" if location else ''),
+                      'not_found'), 404
+    return _success(forecast)
+
+
+@endpoint
+async def apply_delta(request: Request, service: AsyncJobService):
+    """Endpoint to apply incremental changes from the job feed (see routes.apply_delta)."""
+    data = await _json_body(request)
+    if not data:
+        return _no_json_data()
+
+    logger.info("Received delta request")
+    return _success(await service.call(service.service.apply_delta, data))
+
+
+@endpoint
+async def clear_cache(request: Request, service: AsyncJobService):
+    """Endpoint to clear the cache."""
+    logger.info("Received request to clear cache")
+    await service.call(service.service.clear_cache, needs_snapshot=False)
+    return {'status': 'success', 'message': 'Cache cleared successfully'}, 200
+
+
+@endpoint
+async def get_cache_stats(request: Request, service: AsyncJobService):
+    """Endpoint to get cache statistics."""
+    logger.info("Received request for cache statistics")
+    return _success(await service.call(service.service.get_cache_stats, needs_snapshot=False))
+
+
+@endpoint
+async def health_check(request: Request, service: AsyncJobService):
+    """Health check endpoint, answered on the event loop."""
+    return {
+        'status': 'success',
+        'message': 'Service is healthy',
+        'service': 'AI-Driven Job Market Insights Dashboard'
+    }, 200
+
+
+async def _http_error(request: Request, exc: HTTPException) -> JSONResponse:
+    """Error envelope for unknown paths and methods."""
+    if exc.status_code == 404:
+        body = _error(f"Not found: {request.url.path}", 'not_found')
+    elif exc.status_code == 405:
+        body = _error(f"Method {request.method} not allowed", 'method_not_allowed')
+    else:
+        body = _error(exc.detail, 'http_error')
+    return JSONResponse(body, status_code=exc.status_code, headers=exc.headers)
+
+
+def create_app(service: AsyncJobService) -> Starlette:
+    """
+    Create the ASGI application.
+
+    Args:
+        service: Service the handlers call, shut down with the app
+
+    Returns:
+        Starlette application serving the endpoints under API_PREFIX
+    """
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        logger.info("ASGI application started")
+        yield
+        await service.shutdown()
+
+    app = Starlette(
+        routes=[Mount(API_PREFIX, routes=[
+            Route('/trends', get_job_trends, methods=['GET']),
+            Route('/predict', predict_job_trends, methods=['POST']),
+            Route('/predict/batch', predict_job_trends_batch, methods=['POST']),
+            Route('/statistics', get_statistics, methods=['GET']),
+            Route('/aggregate', get_aggregates, methods=['GET']),
+            Route('/forecast/{category:path}', get_forecast, methods=['GET']),
+            Route('/delta', apply_delta, methods=['POST']),
+            Route('/cache/clear', clear_cache, methods=['POST']),
+            Route('/cache/stats', get_cache_stats, methods=['GET']),
+            Route('/health', health_check, methods=['GET'])
+        ])],
+        middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['GET', 'POST', 'OPTIONS'],
+                               allow_headers=['Content-Type'])],
+        exception_handlers={HTTPException: _http_error},
+        lifespan=lifespan
+    )
+    app.state.service = service
+    return app
+
+
+# Initialize the service
+job_service = JobService()
+async_service = AsyncJobService(job_service)
+app = create_app(async_service)
+
+logger.info(f"ASGI application initialized with API endpoints under {API_PREFIX}")
+
+if __name__ == '__main__':
+    import uvicorn
+
+    logger.info(f"Starting ASGI server on {Config.API_HOST}:{Config.API_PORT}")
+    uvicorn.run(app, host=Config.API_HOST, port=Config.API_PORT)
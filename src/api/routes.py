@@ -1,4 +1,5 @@
 from flask import Blueprint, jsonify, request, render_template
+from src.services.cube import DIMENSIONS
 from src.services.job_service import JobService
 from src.utils.validation import ValidationError
 from src.utils.logger import setup_logger
@@ -87,6 +88,50 @@ def predict_job_trends():
             'error_type': 'server_error'
         }), 500
 
+@job_routes.route('/predict/batch', methods=['POST'])
+def predict_job_trends_batch():
+    """
+    Endpoint to predict future job trends for many series at once.
+    
+    Expects JSON body with:
+    - series: List of objects, each with years, salaries and future_years
+    
+    Returns one prediction per series, in request order.
+    """
+    try:
+        data = request.json
+        
+        if not data:
+            return jsonify({
+                'status': 'error',
+                'error': 'No JSON data provided',
+                'error_type': 'validation_error'
+            }), 400
+        
+        logger.info("Received batch prediction request")
+        predictions = job_service.predict_job_trends_batch(data.get('series') if isinstance(data, dict) else None)
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'predictions': predictions
+            }
+        }), 200
+        
+    except ValidationError as e:
+        logger.error(f"Validation error: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'error_type': 'validation_error'
+        }), 400
+    except Exception as e:
+        logger.error(f"Error in predict_job_trends_batch: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'error_type': 'server_error'
+        }), 500
+
 @job_routes.route('/statistics', methods=['GET'])
 def get_statistics():
     """
@@ -113,6 +158,122 @@ def get_statistics():
             'error_type': 'server_error'
         }), 500
 
+@job_routes.route('/aggregate', methods=['GET'])
+def get_aggregates():
+    """
+    Endpoint to drill down into job market aggregates.
+    
+    Query parameters:
+    - group_by: Comma-separated dimensions (category, location, experience, company_type)
+    - category, location, experience, company_type: Optional values to slice on
+    
+    Returns salary statistics per cell served from the pre-materialized cube.
+    """
+    try:
+        group_by = [dim.strip() for dim in request.args.get('group_by', 'category').split(',') if dim.strip()]
+        filters = {dim: request.args[dim] for dim in DIMENSIONS if dim in request.args}
+        
+        logger.info(f"Received aggregate request grouped by {group_by}")
+        aggregates = job_service.get_aggregates(group_by, filters)
+        return jsonify({
+            'status': 'success',
+            'data': aggregates
+        }), 200
+    except ValidationError as e:
+        logger.error(f"Validation error: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'error_type': 'validation_error'
+        }), 400
+    except Exception as e:
+        logger.error(f"Error in get_aggregates: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'error_type': 'server_error'
+        }), 500
+
+@job_routes.route('/forecast/<path:category>', methods=['GET'])
+def get_forecast(category):
+    """
+    Endpoint to get the materialized salary forecast of a job category.
+    
+    Query parameters:
+    - location: Optional location to narrow the forecast to
+    
+    Returns the yearly history and the forecast of every model type.
+    """
+    try:
+        location = request.args.get('location')
+        
+        logger.info(f"Received forecast request for {category}")
+        forecast = job_service.get_forecast(category, location)
+        if forecast is None:
+            return jsonify({
+                'status': 'error',
+                'error': f"No forecast available for '{category}'" + (f" in '{location}'" if location else ''),
+                'error_type': 'not_found'
+            }), 404
+        
+        return jsonify({
+            'status': 'success',
+            'data': forecast
+        }), 200
+    except Exception as e:
+        logger.error(f"Error in get_forecast: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'error_type': 'server_error'
+        }), 500
+
+@job_routes.route('/delta', methods=['POST'])
+def apply_delta():
+    """
+    Endpoint to apply incremental changes from the job feed.
+    
+    Expects JSON body with:
+    - added: Optional list of jobs added since the last snapshot
+    - removed: Optional list of jobs removed since the last snapshot
+    
+    Trends and statistics are updated from the changed jobs only.
+    """
+    try:
+        data = request.json
+        
+        if not data:
+            return jsonify({
+                'status': 'error',
+                'error': 'No JSON data provided',
+                'error_type': 'validation_error'
+            }), 400
+        
+        logger.info("Received delta request")
+        result = job_service.apply_delta(data)
+        return jsonify({
+            'status': 'success',
+            'data': result
+        }), 200
+        
+    except ValidationError as e:
+        logger.error(f"Validation error: {str(e)}")
+        error = {
+            'status': 'error',
+            'error': str(e),
+            'error_type': 'validation_error'
+        }
+        if e.indices is not None:
+            error['invalid_indices'] = e.indices
+        return jsonify(error), 400
+    except Exception as e:
+        logger.error(f"Error in apply_delta: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'error_type': 'server_error'
+        }), 500
+
 @job_routes.route('/cache/clear', methods=['POST'])
 def clear_cache():
     """
@@ -135,6 +296,29 @@ def clear_cache():
             'error_type': 'server_error'
         }), 500
 
+@job_routes.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """
+    Endpoint to get cache statistics.
+    
+    Returns hit, miss, stale hit, eviction and expiration counters
+    along with entry count, approximate size and configured limits.
+    """
+    try:
+        logger.info("Received request for cache statistics")
+        stats = job_service.get_cache_stats()
+        return jsonify({
+            'status': 'success',
+            'data': stats
+        }), 200
+    except Exception as e:
+        logger.error(f"Error in get_cache_stats: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'error_type': 'server_error'
+        }), 500
+
 @job_routes.route('/health', methods=['GET'])
 def health_check():
     """
@@ -0,0 +1,9 @@
+"""
+WSGI entry point module.
+Exposes the Flask application to production WSGI servers, e.g.
+``gunicorn -c gunicorn.conf.py src.api.wsgi:app``.
+"""
+from src.api.app import app
+from src.api.routes import job_service
+
+__all__ = ['app', 'job_service']
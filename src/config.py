@@ -3,6 +3,7 @@ Configuration module for the application.
 Provides centralized configuration management with environment variable support.
 """
 import os
+import tempfile
 
 class Config:
     """Application configuration class."""
@@ -11,10 +12,24 @@ class Config:
     API_HOST = os.getenv('API_HOST', '0.0.0.0')
     API_PORT = int(os.getenv('API_PORT', 5000))
     DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', (os.cpu_count() or 1) * 2 + 1))  # gunicorn worker processes
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', 4))  # request threads per gunicorn worker
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 60))  # seconds before a silent worker is killed and restarted
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30))  # seconds workers get to finish requests on reload or shutdown
+    ASYNC_EXECUTOR_WORKERS = int(os.getenv('ASYNC_EXECUTOR_WORKERS', 8))  # threads running blocking work for the ASGI app
     
     # External API Configuration
     JOB_DATA_API_URL = os.getenv('JOB_DATA_API_URL', 'https://api.example.com/job-data')
-    API_TIMEOUT = int(os.getenv('API_TIMEOUT', 30))
+    API_TIMEOUT = int(os.getenv('API_TIMEOUT', 30))  # read timeout in seconds
+    API_CONNECT_TIMEOUT = float(os.getenv('API_CONNECT_TIMEOUT', 3.05))
+    API_MAX_RETRIES = int(os.getenv('API_MAX_RETRIES', 2))
+    API_RETRY_BACKOFF = float(os.getenv('API_RETRY_BACKOFF', 0.5))  # base delay in seconds, doubled per retry with full jitter
+    API_RETRY_BACKOFF_MAX = float(os.getenv('API_RETRY_BACKOFF_MAX', 5))
+    API_POOL_SIZE = int(os.getenv('API_POOL_SIZE', 10))  # keep-alive connections per worker
+    CIRCUIT_BREAKER_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_THRESHOLD', 3))  # consecutive failures, 0 disables
+    CIRCUIT_BREAKER_RESET_TIMEOUT = int(os.getenv('CIRCUIT_BREAKER_RESET_TIMEOUT', 60))
+    API_STREAM_CHUNK_SIZE = int(os.getenv('API_STREAM_CHUNK_SIZE', 64 * 1024))  # bytes read per chunk of the feed
+    INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', 5000))  # job records columnarized per batch
     
     # Indian Job Market Configuration
     MARKET_REGION = os.getenv('MARKET_REGION', 'India')
@@ -31,10 +46,36 @@ class Config:
     # Cache Configuration
     CACHE_ENABLED = os.getenv('CACHE_ENABLED', 'True').lower() == 'true'
     CACHE_TTL = int(os.getenv('CACHE_TTL', 300))  # 5 minutes default
+    CACHE_STALE_TTL = int(os.getenv('CACHE_STALE_TTL', 60))  # grace window serving stale data while refreshing
+    CACHE_REFRESH_AHEAD = float(os.getenv('CACHE_REFRESH_AHEAD', 0))  # fraction of TTL after which to refresh proactively, 0 disables
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 1024))  # 0 for unbounded
+    CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', 256 * 1024 * 1024))  # approximate, 0 for unbounded
+    CACHE_EVICTION_POLICY = os.getenv('CACHE_EVICTION_POLICY', 'lru')  # lru, lfu, or ttl
+    CACHE_SWEEP_INTERVAL = int(os.getenv('CACHE_SWEEP_INTERVAL', 60))  # seconds between expired-entry sweeps
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')  # memory (per process) or sqlite (shared across workers)
+    CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'job_insights_cache.sqlite3'))
+    PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv('PREDICTION_CACHE_MAX_ENTRIES', 4096))  # memoized predictions per process, LRU evicted
+    PREDICTION_CACHE_TTL = int(os.getenv('PREDICTION_CACHE_TTL', 3600))  # seconds a memoized prediction is reused
+    SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', '')  # directory of job data snapshots shared by workers, empty disables
+    SNAPSHOT_KEEP_VERSIONS = int(os.getenv('SNAPSHOT_KEEP_VERSIONS', 2))  # snapshot versions kept on disk
+    SNAPSHOT_POLL_INTERVAL = float(os.getenv('SNAPSHOT_POLL_INTERVAL', 1))  # seconds between checks for a newer snapshot version
+    DELTA_FLUSH_INTERVAL = float(os.getenv('DELTA_FLUSH_INTERVAL', 1))  # seconds deltas are batched before the job frame is rebuilt, saved and re-forecast
+    
+    # Aggregation Configuration
+    QUANTILE_MODE = os.getenv('QUANTILE_MODE', 'exact')  # exact (sorted salaries) or approximate (KLL sketches)
+    QUANTILE_SKETCH_K = int(os.getenv('QUANTILE_SKETCH_K', 200))  # sketch accuracy, rank error ~1.7/k
+    AGGREGATION_WORKERS = int(os.getenv('AGGREGATION_WORKERS', os.cpu_count() or 1))  # threads for large aggregations
+    AGGREGATION_PARALLEL_THRESHOLD = int(os.getenv('AGGREGATION_PARALLEL_THRESHOLD', 200000))  # rows before aggregating in parallel
     
     # AI Model Configuration
-    MODEL_TYPE = os.getenv('MODEL_TYPE', 'linear')  # linear, polynomial, or decision_tree
+    MODEL_TYPE = os.getenv('MODEL_TYPE', 'linear')  # linear, polynomial, decision_tree, or auto
     POLYNOMIAL_DEGREE = int(os.getenv('POLYNOMIAL_DEGREE', 2))
+    AUTO_MAX_DEGREE = int(os.getenv('AUTO_MAX_DEGREE', 3))  # highest polynomial degree tried by the auto model
+    AUTO_MODEL_BUDGET = float(os.getenv('AUTO_MODEL_BUDGET', 0.25))  # seconds the auto model waits for candidates
+    AUTO_MODEL_WORKERS = int(os.getenv('AUTO_MODEL_WORKERS', 4))  # threads evaluating auto model candidates
+    PREDICT_BATCH_MAX_SERIES = int(os.getenv('PREDICT_BATCH_MAX_SERIES', 10000))  # series per batch prediction request
+    FORECAST_HORIZON = int(os.getenv('FORECAST_HORIZON', 3))  # years forecast past the latest year in the job data
+    FORECAST_MIN_YEARS = int(os.getenv('FORECAST_MIN_YEARS', 2))  # distinct years of history needed for a forecast
     
     # Logging Configuration
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
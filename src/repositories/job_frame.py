@@ -0,0 +1,499 @@
+"""
+Columnar job data module.
+Provides a dictionary-encoded, array-backed container for job postings.
+"""
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+
+# Categorical fields carried by every job record
+CATEGORICAL_FIELDS = ('category', 'location', 'experience', 'company_type')
+
+# Code used for a missing categorical value
+MISSING_CODE = -1
+
+
+class JobFrame:
+    """
+    Columnar container for job records.
+
+    Categorical fields are dictionary-encoded: each column is an int32 array of
+    codes into the list of distinct values for that field, in order of first
+    appearance (``MISSING_CODE`` marks a missing value). Salaries and the
+    optional posting years are kept in contiguous float64 arrays where NaN
+    marks a missing or non-numeric value; ``non_numeric_salary`` tells the
+    two apart for salaries. ``validated`` is set once the frame has passed
+    validate_job_data, so later stages can skip re-validating it.
+    """
+
+    def __init__(self, salary: np.ndarray, codes: Dict[str, np.ndarray],
+                 categories: Dict[str, List[Any]], year: Optional[np.ndarray] = None,
+                 validated: bool = False, non_numeric_salary: Optional[np.ndarray] = None):
+        """
+        Initialize frame from already encoded columns.
+
+        Args:
+            salary: Salary values
+            codes: Mapping of categorical field to its code array
+            categories: Mapping of categorical field to its distinct values
+            year: Posting years (None when no job has one)
+            validated: Whether the rows are known to be valid job data
+            non_numeric_salary: Mask of rows whose salary was given but is not
+                a number (None when there are none)
+        """
+        self.validated = validated
+        self.non_numeric_salary = non_numeric_salary
+        self.salary = np.ascontiguousarray(salary, dtype=np.float64)
+        if year is None:
+            year = np.full(len(self.salary), np.nan, dtype=np.float64)
+        self.year = np.ascontiguousarray(year, dtype=np.float64)
+        self._codes = {}
+        self._categories = {}
+        for field in CATEGORICAL_FIELDS:
+            field_codes = codes.get(field)
+            if field_codes is None:
+                field_codes = np.full(len(self.salary), MISSING_CODE, dtype=np.int32)
+            self._codes[field] = np.ascontiguousarray(field_codes, dtype=np.int32)
+            self._categories[field] = list(categories.get(field, []))
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> 'JobFrame':
+        """
+        Build a frame from an iterable of job dictionaries.
+
+        Args:
+            records: Job dictionaries; fields other than salary, year and
+                the categorical fields are dropped
+
+        Returns:
+            JobFrame holding the encoded records
+        """
+        builder = JobFrameBuilder()
+        builder.extend(records)
+        return builder.build()
+
+    def append(self, other: 'JobFrame') -> 'JobFrame':
+        """
+        Build a new frame with the rows of another frame appended.
+
+        Args:
+            other: Frame whose rows are added after the rows of this frame
+
+        Returns:
+            New JobFrame, validated if both frames are; category dictionaries
+            are extended with the values only other contains
+        """
+        codes = {}
+        categories = {}
+        for field in CATEGORICAL_FIELDS:
+            merged = list(self._categories[field])
+            lookup = {value: code for code, value in enumerate(merged)}
+            # Last slot maps MISSING_CODE (index -1) onto itself
+            mapping = np.full(len(other._categories[field]) + 1, MISSING_CODE, dtype=np.int32)
+            for code, value in enumerate(other._categories[field]):
+                if value not in lookup:
+                    lookup[value] = len(merged)
+                    merged.append(value)
+                mapping[code] = lookup[value]
+            codes[field] = np.concatenate((self._codes[field], mapping[other._codes[field]]))
+            categories[field] = merged
+
+        non_numeric = None
+        if self.non_numeric_salary is not None or other.non_numeric_salary is not None:
+            non_numeric = np.concatenate((self._non_numeric_mask(), other._non_numeric_mask()))
+        return JobFrame(np.concatenate((self.salary, other.salary)), codes, categories,
+                        np.concatenate((self.year, other.year)), self.validated and other.validated, non_numeric)
+
+    def _non_numeric_mask(self) -> np.ndarray:
+        """Get non_numeric_salary as a mask over every row."""
+        if self.non_numeric_salary is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.non_numeric_salary
+
+    def remove(self, other: 'JobFrame') -> 'JobFrame':
+        """
+        Build a new frame without one matching row for every row of another frame.
+
+        Rows match when salary, year and every categorical field are equal. Category
+        values no longer used by any row are dropped from the dictionaries.
+
+        Args:
+            other: Frame of rows to remove
+
+        Returns:
+            New JobFrame (this frame itself when other is empty)
+
+        Raises:
+            ValueError: If a row of other has no remaining match in this frame
+        """
+        if len(other) == 0:
+            return self
+
+        # Encode the rows to remove with this frame's dictionaries (-2 = unknown value)
+        other_codes = {}
+        for field in CATEGORICAL_FIELDS:
+            lookup = {value: code for code, value in enumerate(self._categories[field])}
+            mapping = np.array([lookup.get(value, -2) for value in other._categories[field]] + [MISSING_CODE],
+                               dtype=np.int32)
+            other_codes[field] = mapping[other._codes[field]]
+            if np.any(other_codes[field] == -2):
+                raise ValueError(f"Cannot remove job with unknown {field}")
+
+        # Only rows sharing a salary with a removed row can match
+        candidates = np.flatnonzero(np.isin(self.salary, other.salary) | np.isnan(self.salary))
+        keys = [np.concatenate((self.salary[candidates], other.salary))]
+        keys += [np.concatenate((self._codes[field][candidates], other_codes[field])) for field in CATEGORICAL_FIELDS]
+        keys.append(np.concatenate((self.year[candidates], other.year)))
+        is_removal = np.concatenate((np.zeros(candidates.size, dtype=bool), np.ones(len(other), dtype=bool)))
+
+        # Sort into runs of equal rows with the existing rows of each run first
+        order = np.lexsort([is_removal] + keys)
+        sorted_keys = [key[order] for key in keys]
+        sorted_removal = is_removal[order]
+        boundary = np.zeros(order.size, dtype=bool)
+        boundary[0] = True
+        for key in sorted_keys:
+            same = key[1:] == key[:-1]
+            if key.dtype.kind == 'f':
+                same |= np.isnan(key[1:]) & np.isnan(key[:-1])
+            boundary[1:] |= ~same
+        run_ids = np.cumsum(boundary) - 1
+        existing = np.bincount(run_ids, weights=~sorted_removal).astype(np.int64)
+        removals = np.bincount(run_ids, weights=sorted_removal).astype(np.int64)
+        if np.any(removals > existing):
+            raise ValueError("Cannot remove job that is not present")
+
+        # Drop the first `removals` existing rows of every run
+        run_starts = np.flatnonzero(boundary)
+        rank = np.arange(order.size) - run_starts[run_ids]
+        dropped = order[~sorted_removal & (rank < removals[run_ids])]
+        keep = np.ones(len(self), dtype=bool)
+        keep[candidates[dropped]] = False
+
+        codes = {}
+        categories = {}
+        for field in CATEGORICAL_FIELDS:
+            field_codes = self._codes[field][keep]
+            used = np.bincount(field_codes[field_codes != MISSING_CODE],
+                               minlength=len(self._categories[field])) > 0
+            mapping = np.full(used.size + 1, MISSING_CODE, dtype=np.int32)
+            mapping[:-1][used] = np.arange(np.count_nonzero(used), dtype=np.int32)
+            codes[field] = mapping[field_codes]
+            categories[field] = [self._categories[field][code] for code in np.flatnonzero(used)]
+
+        non_numeric = None if self.non_numeric_salary is None else self.non_numeric_salary[keep]
+        return JobFrame(self.salary[keep], codes, categories, self.year[keep], self.validated, non_numeric)
+
+    def codes(self, field: str) -> np.ndarray:
+        """
+        Get the code array of a categorical field.
+
+        Args:
+            field: Categorical field name
+
+        Returns:
+            int32 array of codes, MISSING_CODE where the value is missing
+        """
+        return self._codes[field]
+
+    def categories(self, field: str) -> List[Any]:
+        """
+        Get the distinct values of a categorical field.
+
+        Args:
+            field: Categorical field name
+
+        Returns:
+            List of distinct values indexed by code
+        """
+        return self._categories[field]
+
+    def column(self, field: str) -> np.ndarray:
+        """
+        Decode a column into an object array (None for missing values).
+
+        Args:
+            field: 'salary', 'year' or a categorical field name
+
+        Returns:
+            Decoded column values
+        """
+        if field == 'salary':
+            return self.salary
+        if field == 'year':
+            return self.year
+
+        field_codes = self._codes[field]
+        lookup = np.empty(len(self._categories[field]) + 1, dtype=object)
+        lookup[:-1] = self._categories[field]
+        lookup[-1] = None
+        return lookup[field_codes]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory footprint of the encoded columns in bytes."""
+        return self.salary.nbytes + self.year.nbytes + sum(codes.nbytes for codes in self._codes.values())
+
+    def record(self, idx: int) -> Dict[str, Any]:
+        """
+        Decode a single row into a job dictionary.
+
+        Args:
+            idx: Row index
+
+        Returns:
+            Job dictionary with the fields present in that row
+        """
+        job = {}
+        for field in CATEGORICAL_FIELDS:
+            code = self._codes[field][idx]
+            if code != MISSING_CODE:
+                job[field] = self._categories[field][code]
+        value = self.salary[idx]
+        if not np.isnan(value):
+            job['salary'] = float(value)
+        year = self.year[idx]
+        if not np.isnan(year):
+            job['year'] = int(year) if year.is_integer() else float(year)
+        return job
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Decode all rows into a list of job dictionaries."""
+        return [self.record(idx) for idx in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.salary)
+
+    def __getitem__(self, idx: int) -> Dict[str, Any]:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("JobFrame index out of range")
+        return self.record(idx)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for idx in range(len(self)):
+            yield self.record(idx)
+
+    def __repr__(self) -> str:
+        return f"JobFrame(rows={len(self)}, categories={len(self._categories['category'])})"
+
+
+class JobFrameBuilder:
+    """
+    Incremental JobFrame encoder.
+
+    Records are encoded one chunk at a time into column arrays, sharing the
+    category dictionaries across chunks, so a large feed never has to be held
+    as Python dictionaries all at once.
+    """
+
+    def __init__(self):
+        """Initialize an empty builder."""
+        self._lookups = {field: {} for field in CATEGORICAL_FIELDS}
+        self._salary_chunks: List[np.ndarray] = []
+        self._year_chunks: List[np.ndarray] = []
+        self._code_chunks: Dict[str, List[np.ndarray]] = {field: [] for field in CATEGORICAL_FIELDS}
+        # Rows whose salary is given but not a number, by chunk
+        self._non_numeric_chunks: List[np.ndarray] = []
+        self._size = 0
+
+    def extend(self, records: Iterable[Any]) -> None:
+        """
+        Encode a chunk of job dictionaries.
+
+        Args:
+            records: Job dictionaries; fields other than salary, year and
+                the categorical fields are dropped
+        """
+        records = list(records)
+        size = len(records)
+        salary = np.full(size, np.nan, dtype=np.float64)
+        year = np.full(size, np.nan, dtype=np.float64)
+        codes = {field: np.full(size, MISSING_CODE, dtype=np.int32) for field in CATEGORICAL_FIELDS}
+        non_numeric = np.zeros(size, dtype=bool)
+
+        for idx, job in enumerate(records):
+            if not isinstance(job, dict):
+                continue
+
+            value = job.get('salary')
+            if isinstance(value, (int, float)) and value == value:
+                salary[idx] = value
+            elif 'salary' in job:
+                non_numeric[idx] = True
+
+            value = job.get('year')
+            if isinstance(value, (int, float)):
+                year[idx] = value
+
+            for field in CATEGORICAL_FIELDS:
+                value = job.get(field)
+                if value is None:
+                    continue
+                lookup = self._lookups[field]
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+                codes[field][idx] = code
+
+        self._salary_chunks.append(salary)
+        self._year_chunks.append(year)
+        self._non_numeric_chunks.append(non_numeric)
+        for field in CATEGORICAL_FIELDS:
+            self._code_chunks[field].append(codes[field])
+        self._size += size
+
+    def build(self) -> JobFrame:
+        """
+        Concatenate the encoded chunks into a frame.
+
+        Returns:
+            JobFrame holding every record added so far
+        """
+        def concat(chunks, dtype):
+            return np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+
+        salary = concat(self._salary_chunks, np.float64)
+        year = concat(self._year_chunks, np.float64)
+        codes = {field: concat(self._code_chunks[field], np.int32) for field in CATEGORICAL_FIELDS}
+        categories = {field: list(self._lookups[field]) for field in CATEGORICAL_FIELDS}
+        non_numeric = concat(self._non_numeric_chunks, bool)
+        return JobFrame(salary, codes, categories, year, non_numeric_salary=non_numeric if non_numeric.any() else None)
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class JobFrameChanges:
+    """
+    Jobs added to and removed from a JobFrame, not yet applied to it.
+
+    Recording k changed jobs costs O(k log n): every removed job is matched
+    against the jobs added earlier and against the frame, through an index
+    of the frame's salaries built on the first removal. apply() then builds
+    the updated frame with a single remove and append, so the O(n) copy is
+    paid once per batch of changes rather than once per change.
+    """
+
+    def __init__(self, frame: JobFrame):
+        """
+        Initialize without changes.
+
+        Args:
+            frame: Frame the changes apply to
+        """
+        self.frame = frame
+        # Row key -> number of added jobs, and of removed jobs of the frame
+        self._added: Counter = Counter()
+        self._removed: Counter = Counter()
+        self._validated = True
+        self._salary_order = None
+        self._sorted_salary = None
+        self._lookups = None
+
+    @staticmethod
+    def _row_keys(frame: JobFrame) -> List[Tuple]:
+        """Get a hashable (salary, year, categorical values...) key for every row of a frame."""
+        columns = [frame.salary.tolist(), [None if year != year else year for year in frame.year.tolist()]]
+        for field in CATEGORICAL_FIELDS:
+            # Last slot maps MISSING_CODE (index -1) onto None
+            values = list(frame.categories(field)) + [None]
+            columns.append([values[code] for code in frame.codes(field).tolist()])
+        return list(zip(*columns))
+
+    def _frame_count(self, key: Tuple) -> int:
+        """Count the rows of the frame matching a row key."""
+        frame = self.frame
+        if self._salary_order is None:
+            self._salary_order = np.argsort(frame.salary, kind='stable')
+            self._sorted_salary = frame.salary[self._salary_order]
+            self._lookups = {field: {value: code for code, value in enumerate(frame.categories(field))}
+                             for field in CATEGORICAL_FIELDS}
+
+        salary, year = key[0], key[1]
+        rows = self._salary_order[np.searchsorted(self._sorted_salary, salary, side='left'):
+                                  np.searchsorted(self._sorted_salary, salary, side='right')]
+        match = np.isnan(frame.year[rows]) if year is None else frame.year[rows] == year
+        for field, value in zip(CATEGORICAL_FIELDS, key[2:]):
+            code = MISSING_CODE if value is None else self._lookups[field].get(value)
+            if code is None:
+                return 0
+            match &= frame.codes(field)[rows] == code
+        return int(np.count_nonzero(match))
+
+    def record(self, added: Optional[JobFrame] = None, removed: Optional[JobFrame] = None) -> None:
+        """
+        Record jobs added and removed, removals first.
+
+        Args:
+            added: Frame of jobs to add
+            removed: Frame of jobs to remove
+
+        Raises:
+            ValueError: If a removed job is not present; nothing is recorded
+        """
+        plan = []
+        if removed is not None and len(removed):
+            for key, count in Counter(self._row_keys(removed)).items():
+                from_added = min(count, self._added[key])
+                if count - from_added > self._frame_count(key) - self._removed[key]:
+                    raise ValueError("Cannot remove job that is not present")
+                plan.append((key, from_added, count - from_added))
+
+        for key, from_added, from_frame in plan:
+            self._added[key] -= from_added
+            if not self._added[key]:
+                del self._added[key]
+            if from_frame:
+                self._removed[key] += from_frame
+        if added is not None and len(added):
+            self._added.update(self._row_keys(added))
+            self._validated = self._validated and added.validated
+
+    @staticmethod
+    def _records(keys: Counter) -> List[Dict[str, Any]]:
+        """Decode counted row keys into job dictionaries."""
+        records = []
+        for key, count in keys.items():
+            job = {field: value for field, value in zip(CATEGORICAL_FIELDS, key[2:]) if value is not None}
+            job['salary'] = key[0]
+            if key[1] is not None:
+                job['year'] = key[1]
+            records.extend([job] * count)
+        return records
+
+    @property
+    def pending(self) -> bool:
+        """Whether any change is recorded."""
+        return bool(self._added or self._removed)
+
+    def apply(self) -> JobFrame:
+        """
+        Build the frame with every recorded change applied.
+
+        Returns:
+            New JobFrame (the frame itself without changes)
+        """
+        if not self.pending:
+            return self.frame
+        added = JobFrame.from_records(self._records(self._added))
+        added.validated = self._validated
+        return self.frame.remove(JobFrame.from_records(self._records(self._removed))).append(added)
+
+
+def as_job_frame(job_data: Any) -> Optional[JobFrame]:
+    """
+    Coerce job data into a JobFrame.
+
+    Args:
+        job_data: JobFrame or list of job dictionaries
+
+    Returns:
+        JobFrame, or None if job_data is neither
+    """
+    if isinstance(job_data, JobFrame):
+        return job_data
+    if isinstance(job_data, list):
+        return JobFrame.from_records(job_data)
+    return None
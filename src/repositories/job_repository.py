@@ -1,50 +1,378 @@
+import asyncio
+import random
+import time
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from src.config import Config
+from src.repositories.job_frame import JobFrame, JobFrameBuilder
+from src.utils.circuit_breaker import CircuitBreaker
+from src.utils.json_stream import parse_json_stream
 from src.utils.logger import setup_logger
 from datetime import datetime, timezone
 
 logger = setup_logger(__name__)
 
+# Status codes worth retrying before falling back
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+def _iter_async_chunks(chunks, loop):
+    """
+    Iterate an async byte stream from a worker thread.
+    
+    Every chunk is awaited on the event loop only when the thread asks for
+    it, so the consumer sets the pace and at most one chunk is buffered.
+    
+    Args:
+        chunks: Async iterator of byte chunks (e.g. ``response.aiter_bytes()``)
+        loop: Event loop the iterator belongs to
+        
+    Yields:
+        Byte chunks
+    """
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(chunks.__anext__(), loop).result()
+        except StopAsyncIteration:
+            return
+
 class JobRepository:
     def __init__(self):
         self.api_url = Config.JOB_DATA_API_URL
-        self.timeout = Config.API_TIMEOUT
+        self.timeout = (Config.API_CONNECT_TIMEOUT, Config.API_TIMEOUT)
+        self.max_retries = Config.API_MAX_RETRIES
         self.market_region = Config.MARKET_REGION
         self.currency = Config.CURRENCY
+        
+        self.session = self._create_session()
+        
+        # Validators and parsed payload of the last 200 response, for conditional GETs
+        self._last_response = None
+        
+        self.circuit_breaker = CircuitBreaker(
+            'job_data_api',
+            failure_threshold=Config.CIRCUIT_BREAKER_THRESHOLD,
+            reset_timeout=Config.CIRCUIT_BREAKER_RESET_TIMEOUT
+        )
         logger.info(f"JobRepository initialized for {self.market_region} market with API URL: {self.api_url}")
 
+    def _create_session(self):
+        """Create a session pooling keep-alive connections; retries are handled in _get_with_retries."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=Config.API_POOL_SIZE, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def after_fork(self):
+        """Replace the connection pool inherited by a forked worker, whose sockets belong to the parent."""
+        self.session = self._create_session()
+
+    def create_async_client(self):
+        """
+        Create an async HTTP client for fetch_job_data_async.
+        
+        The client pools keep-alive connections on the event loop it is first
+        used on; the caller owns it and closes it with ``await client.aclose()``.
+        """
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(Config.API_TIMEOUT, connect=Config.API_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=Config.API_POOL_SIZE)
+        )
+
     def fetch_job_data(self):
         """
         Fetch job market data from an external API with fallback to Indian market data.
         
+        The fallback is used straight away while the circuit breaker is open
+        after repeated API failures. Requests are conditional on the ETag and
+        Last-Modified validators of the previous response; on 304 Not Modified
+        the previously parsed payload (the same JobFrame object) is returned
+        without downloading or parsing the feed again.
+        
+        The response body is parsed as a stream (see _parse_response), so the
+        raw document is never held in memory as a whole.
+        
         Returns:
-            Dictionary with job data and metadata including data sources
+            Dictionary with job data (as a JobFrame) and metadata including data sources
         """
+        if not self.circuit_breaker.allow_request():
+            logger.warning("Job data API circuit is open. Using Indian market fallback data.")
+            return self._get_indian_market_data()
+        
         try:
             logger.info(f"Fetching job data from: {self.api_url}")
-            response = requests.get(self.api_url, timeout=self.timeout)
+            last_response = self._last_response
+            response = self._get_with_retries(self._conditional_headers(last_response))
+            
+            if response.status_code == 304 and last_response is not None:
+                logger.info("Job data not modified since last fetch, reusing parsed payload")
+                # Reading the empty body returns the streamed connection to the pool; close() would drop it
+                response.content
+                self.circuit_breaker.record_success()
+                return last_response['payload']
             
             if response.status_code == 200:
-                logger.info("Successfully fetched job data from API")
-                data = response.json()
-                
-                # Add metadata if not present
-                if isinstance(data, dict) and 'jobs' in data:
-                    return data
+                data = self._parse_response(response)
+                if isinstance(data['jobs'], JobFrame):
+                    logger.info(f"Successfully fetched {len(data['jobs'])} jobs from API")
                 else:
-                    # Wrap plain list in metadata structure
-                    return {
-                        'jobs': data,
-                        'metadata': self._get_metadata(),
-                        'last_updated': datetime.now(timezone.utc).isoformat()
-                    }
+                    # Returned as is for validation to reject
+                    logger.warning("API response has no list of jobs")
+                self.circuit_breaker.record_success()
+                self._remember_response(response, data)
+                return data
             else:
+                # Errors, redirects left unfollowed and a 304 without a remembered payload all fail the fetch
                 logger.warning(f"API returned status code: {response.status_code}")
+                response.close()
                 response.raise_for_status()
+                raise requests.exceptions.HTTPError(f"Unexpected status code: {response.status_code}",
+                                                    response=response)
                 
         except requests.exceptions.RequestException as e:
+            self.circuit_breaker.record_failure()
             logger.warning(f"Failed to fetch from API: {str(e)}. Using Indian market fallback data.")
             return self._get_indian_market_data()
+        except Exception:
+            # Any other error still ends the attempt, so a half-open trial is not left pending
+            self.circuit_breaker.record_failure()
+            raise
+    
+    async def fetch_job_data_async(self, client):
+        """
+        Fetch job market data without blocking the event loop (see fetch_job_data).
+        
+        The request, its retries and the download run on the event loop with
+        an httpx client. The body is parsed as a stream on a worker thread,
+        which pulls one chunk at a time from the loop, so the raw document is
+        never held in memory and the loop is never blocked by JSON decoding.
+        Conditional requests, retries, the circuit breaker and the fallback
+        behave as in fetch_job_data.
+        
+        Args:
+            client: httpx.AsyncClient (see create_async_client)
+            
+        Returns:
+            Dictionary with job data (as a JobFrame) and metadata including data sources
+        """
+        if not self.circuit_breaker.allow_request():
+            logger.warning("Job data API circuit is open. Using Indian market fallback data.")
+            return self._get_indian_market_data()
+        
+        try:
+            logger.info(f"Fetching job data asynchronously from: {self.api_url}")
+            last_response = self._last_response
+            response = await self._get_with_retries_async(client, self._conditional_headers(last_response))
+            try:
+                if response.status_code == 304 and last_response is not None:
+                    logger.info("Job data not modified since last fetch, reusing parsed payload")
+                    # As in fetch_job_data, the empty body is read so the connection is reused
+                    await response.aread()
+                    self.circuit_breaker.record_success()
+                    return last_response['payload']
+                
+                if response.status_code != 200:
+                    # Errors, redirects left unfollowed and a 304 without a remembered payload all fail the fetch
+                    raise httpx.HTTPStatusError(f"Unexpected status code: {response.status_code}",
+                                                request=response.request, response=response)
+                
+                loop = asyncio.get_running_loop()
+                chunks = _iter_async_chunks(response.aiter_bytes(Config.API_STREAM_CHUNK_SIZE), loop)
+                data = await loop.run_in_executor(None, self._parse_chunks, chunks)
+            finally:
+                await response.aclose()
+            
+            if isinstance(data['jobs'], JobFrame):
+                logger.info(f"Successfully fetched {len(data['jobs'])} jobs from API")
+            else:
+                # Returned as is for validation to reject
+                logger.warning("API response has no list of jobs")
+            self.circuit_breaker.record_success()
+            self._remember_response(response, data)
+            return data
+            
+        except (httpx.HTTPError, ValueError) as e:
+            self.circuit_breaker.record_failure()
+            logger.warning(f"Failed to fetch from API: {str(e)}. Using Indian market fallback data.")
+            return self._get_indian_market_data()
+        except Exception:
+            # Any other error still ends the attempt, so a half-open trial is not left pending
+            self.circuit_breaker.record_failure()
+            raise
+    
+    def _parse_response(self, response):
+        """
+        Stream-parse a job data response into a payload with a JobFrame.
+        
+        The 'jobs' array (or a top-level array) is decoded incrementally from
+        the body chunks and columnarized Config.INGEST_BATCH_SIZE records at
+        a time; the rest of the document is decoded as usual.
+        
+        Args:
+            response: Successful requests.Response opened with stream=True
+            
+        Returns:
+            Dictionary with 'jobs' and metadata
+            
+        Raises:
+            requests.exceptions.InvalidJSONError: If the body is not valid JSON
+        """
+        try:
+            return self._parse_chunks(response.iter_content(chunk_size=Config.API_STREAM_CHUNK_SIZE))
+        except ValueError as e:
+            raise requests.exceptions.InvalidJSONError(f"Invalid JSON in job data response: {str(e)}")
+        finally:
+            response.close()
+    
+    def _parse_chunks(self, chunks):
+        """
+        Stream-parse the byte chunks of a job data response body (see _parse_response).
+        
+        Args:
+            chunks: Iterable of body byte chunks
+            
+        Returns:
+            Dictionary with 'jobs' and metadata
+            
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        builder = JobFrameBuilder()
+        document, streamed = parse_json_stream(
+            chunks,
+            builder.extend,
+            array_key='jobs',
+            batch_size=Config.INGEST_BATCH_SIZE
+        )
+        
+        if streamed:
+            jobs = builder.build()
+        elif isinstance(document, dict) and 'jobs' in document:
+            jobs = self._to_frame(document.pop('jobs'))
+        else:
+            jobs = self._to_frame(document)
+            document = None
+        
+        if isinstance(document, dict):
+            document['jobs'] = jobs
+            return document
+        
+        # Wrap plain list in metadata structure
+        return {
+            'jobs': jobs,
+            'metadata': self._get_metadata(),
+            'last_updated': datetime.now(timezone.utc).isoformat()
+        }
+    
+    def _conditional_headers(self, last_response):
+        """
+        Build conditional request headers from the validators of a previous response.
+        
+        Args:
+            last_response: Remembered response entry, or None
+            
+        Returns:
+            Dictionary of request headers (empty when there is nothing to revalidate)
+        """
+        headers = {}
+        if last_response is not None:
+            if last_response['etag']:
+                headers['If-None-Match'] = last_response['etag']
+            if last_response['last_modified']:
+                headers['If-Modified-Since'] = last_response['last_modified']
+        return headers
+    
+    def _remember_response(self, response, payload):
+        """
+        Keep the validators and parsed payload of a 200 response for revalidation.
+        
+        Args:
+            response: Successful requests.Response
+            payload: Parsed job data returned for the response
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            # Replaced as a whole so concurrent readers see a consistent entry
+            self._last_response = {'etag': etag, 'last_modified': last_modified, 'payload': payload}
+        else:
+            self._last_response = None
+    
+    def _get_with_retries(self, headers=None):
+        """
+        GET the job data API, retrying transient failures with jittered backoff.
+        
+        Connection errors, timeouts and retryable status codes are retried up
+        to Config.API_MAX_RETRIES times.
+        
+        Args:
+            headers: Optional request headers
+            
+        Returns:
+            Final requests.Response
+            
+        Raises:
+            requests.exceptions.RequestException: If the last attempt fails
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(self.api_url, headers=headers, timeout=self.timeout, stream=True)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Attempt {attempt + 1} to fetch job data failed: {str(e)}")
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                    return response
+                logger.warning(f"Attempt {attempt + 1} to fetch job data returned status code: {response.status_code}")
+                response.close()
+            
+            time.sleep(self._backoff_delay(attempt))
+    
+    async def _get_with_retries_async(self, client, headers=None):
+        """
+        GET the job data API from the event loop, retrying as _get_with_retries does.
+        
+        Args:
+            client: httpx.AsyncClient
+            headers: Optional request headers
+            
+        Returns:
+            Final httpx.Response with its body not yet read
+            
+        Raises:
+            httpx.TransportError: If the last attempt fails to connect or times out
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await client.send(client.build_request('GET', self.api_url, headers=headers), stream=True)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Attempt {attempt + 1} to fetch job data failed: {str(e)}")
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                    return response
+                logger.warning(f"Attempt {attempt + 1} to fetch job data returned status code: {response.status_code}")
+                await response.aclose()
+            
+            await asyncio.sleep(self._backoff_delay(attempt))
+    
+    def _backoff_delay(self, attempt):
+        """Full-jitter exponential backoff delay in seconds for a retry attempt."""
+        return random.uniform(0, min(Config.API_RETRY_BACKOFF_MAX, Config.API_RETRY_BACKOFF * (2 ** attempt)))
+    
+    def _to_frame(self, jobs):
+        """
+        Encode a list of job records into a columnar JobFrame.
+        
+        Anything other than a list is returned unchanged so that validation
+        can report it downstream.
+        """
+        if isinstance(jobs, list):
+            return JobFrame.from_records(jobs)
+        return jobs
     
     def _get_metadata(self):
         """Get data source metadata."""
@@ -70,7 +398,7 @@ class JobRepository:
         Salaries are in INR (Indian Rupees) per annum
         
         Returns:
-            Dictionary with job data and metadata
+            Dictionary with job data (as a JobFrame) and metadata
         """
         logger.info("Using Indian market data based on real salary surveys")
         
@@ -137,7 +465,7 @@ class JobRepository:
         ]
         
         return {
-            'jobs': jobs_data,
+            'jobs': JobFrame.from_records(jobs_data),
             'metadata': {
                 'region': 'India',
                 'currency': 'INR',
@@ -0,0 +1,190 @@
+"""
+Snapshot store module.
+Persists the ingested job dataset and its derived trends and statistics to
+versioned directories of NumPy arrays that every worker process on a host
+memory-maps, so the dataset is held once in the page cache rather than once
+per process.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import numpy as np
+from src.repositories.job_frame import CATEGORICAL_FIELDS, JobFrame
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Name of the file holding the name of the current version
+CURRENT_NAME = 'CURRENT'
+
+# Name of the file describing a version
+MANIFEST_NAME = 'manifest.json'
+
+# Version of the on-disk layout
+FORMAT_VERSION = 2
+
+
+def _write_durably(path: str, write) -> None:
+    """Write a file and flush it to disk."""
+    with open(path, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class SnapshotStore:
+    """
+    Directory of versioned job data snapshots.
+
+    Each save writes a new version directory holding every JobFrame column as
+    a .npy file and a JSON manifest with the category dictionaries, metadata,
+    trends and statistics. The directory is assembled under a temporary name
+    and renamed into place, then the CURRENT file is atomically replaced
+    (os.replace) to point at it, so readers see either the previous version or
+    the new one, never a mix. Columns are loaded memory-mapped and read-only;
+    processes mapping the same version share its pages.
+    """
+
+    def __init__(self, directory: str, keep_versions: int = 2):
+        """
+        Initialize store.
+
+        Args:
+            directory: Root directory of the versions (created on first save)
+            keep_versions: Number of most recent versions kept on disk
+        """
+        self.directory = directory
+        self.keep_versions = max(1, keep_versions)
+        self._lock = threading.Lock()
+
+    def save(self, frame: JobFrame, metadata: Dict[str, Any], trends: Optional[Dict[str, Any]],
+             statistics: Dict[str, Any]) -> str:
+        """
+        Persist a snapshot as a new version and make it current.
+
+        Args:
+            frame: Job data
+            metadata: Data source metadata
+            trends: Per-category trends (None when there is no job data)
+            statistics: Overall statistics
+
+        Returns:
+            Name of the new version
+        """
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            timestamp = time.time()
+            # Names sort by save time
+            version = f"{int(timestamp * 1000):013d}-{uuid.uuid4().hex[:8]}"
+            staging = os.path.join(self.directory, f".{version}.tmp")
+            os.makedirs(staging)
+
+            try:
+                columns = {'salary': frame.salary, 'year': frame.year}
+                columns.update({field: frame.codes(field) for field in CATEGORICAL_FIELDS})
+                for name, values in columns.items():
+                    _write_durably(os.path.join(staging, f"{name}.npy"),
+                                   lambda f, values=values: np.save(f, np.ascontiguousarray(values)))
+
+                manifest = {
+                    'version': FORMAT_VERSION,
+                    'timestamp': timestamp,
+                    'saved_at': datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+                    'rows': len(frame),
+                    'validated': frame.validated,
+                    'categories': {field: frame.categories(field) for field in CATEGORICAL_FIELDS},
+                    'metadata': metadata,
+                    'trends': trends,
+                    'statistics': statistics
+                }
+                encoded = json.dumps(manifest).encode('utf-8')
+                _write_durably(os.path.join(staging, MANIFEST_NAME), lambda f: f.write(encoded))
+                os.rename(staging, os.path.join(self.directory, version))
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+            pointer = os.path.join(self.directory, f".{CURRENT_NAME}.{version}.tmp")
+            _write_durably(pointer, lambda f: f.write(version.encode('utf-8')))
+            os.replace(pointer, os.path.join(self.directory, CURRENT_NAME))
+            self._prune(version)
+
+        logger.info(f"Saved job data snapshot {version} of {len(frame)} jobs to {self.directory}")
+        return version
+
+    def _prune(self, current: str) -> None:
+        """Remove all but the most recent versions (mapped pages stay valid for their readers)."""
+        versions = sorted(name for name in os.listdir(self.directory)
+                          if not name.startswith('.') and os.path.isdir(os.path.join(self.directory, name)))
+        for name in versions[:-self.keep_versions]:
+            if name != current:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def current_version(self) -> Optional[str]:
+        """
+        Get the name of the current version.
+
+        Returns:
+            Version name, or None if nothing was saved yet
+        """
+        try:
+            with open(os.path.join(self.directory, CURRENT_NAME), 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def load(self, version: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Load a version with memory-mapped columns.
+
+        Args:
+            version: Version name. If None, loads the current version
+
+        Returns:
+            Dictionary with 'jobs' (JobFrame), 'metadata', 'trends',
+            'statistics', 'version', 'timestamp' and 'saved_at', or None if
+            there is no readable snapshot
+        """
+        version = version or self.current_version()
+        if version is None:
+            return None
+
+        path = os.path.join(self.directory, version)
+        try:
+            with open(os.path.join(path, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != FORMAT_VERSION:
+                logger.warning(f"Ignoring job data snapshot with unsupported version {manifest.get('version')}")
+                return None
+
+            names = ('salary', 'year') + CATEGORICAL_FIELDS
+            columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in names}
+            if any(len(values) != manifest['rows'] for values in columns.values()):
+                raise ValueError("column lengths do not match the manifest")
+
+            frame = JobFrame(
+                columns['salary'],
+                {field: columns[field] for field in CATEGORICAL_FIELDS},
+                manifest['categories'],
+                columns['year'],
+                manifest['validated']
+            )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable job data snapshot {version}: {str(e)}")
+            return None
+
+        logger.info(f"Loaded job data snapshot {version} of {len(frame)} jobs saved at {manifest['saved_at']}")
+        return {
+            'jobs': frame,
+            'metadata': manifest['metadata'],
+            'trends': manifest['trends'],
+            'statistics': manifest['statistics'],
+            'version': version,
+            'timestamp': manifest['timestamp'],
+            'saved_at': manifest['saved_at']
+        }
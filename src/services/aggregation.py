@@ -0,0 +1,345 @@
+"""
+Aggregation module.
+Provides a vectorized group-by engine over columnar salary data.
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+import numpy as np
+from src.config import Config
+from src.services.quantile_sketch import KLLSketch, batch_quantiles
+from src.utils.executors import get_executor
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Salary percentiles reported alongside the median
+PERCENTILES = (10, 25, 75, 90)
+
+
+def resolve_workers(rows: int, workers: Optional[int] = None) -> int:
+    """
+    Decide how many threads to aggregate a dataset with.
+
+    Args:
+        rows: Number of rows to aggregate
+        workers: Explicit worker count; if None, Config.AGGREGATION_WORKERS is
+            used for datasets of at least Config.AGGREGATION_PARALLEL_THRESHOLD rows
+
+    Returns:
+        Number of workers (1 means serial)
+    """
+    if workers is None:
+        workers = Config.AGGREGATION_WORKERS if rows >= Config.AGGREGATION_PARALLEL_THRESHOLD else 1
+    return max(1, min(workers, rows))
+
+
+def quantile_sketch_k() -> Optional[int]:
+    """
+    Get the sketch accuracy of the configured quantile mode.
+
+    Returns:
+        Config.QUANTILE_SKETCH_K when Config.QUANTILE_MODE is 'approximate',
+        None for exact quantiles
+    """
+    return Config.QUANTILE_SKETCH_K if Config.QUANTILE_MODE == 'approximate' else None
+
+
+def exact_percentiles(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray,
+                      percentiles: Iterable[int]) -> Dict[int, np.ndarray]:
+    """
+    Linearly interpolated percentiles of sorted segments (as ``np.percentile``).
+
+    Args:
+        sorted_values: Values sorted within each segment
+        starts: Start offset of every segment
+        counts: Length of every segment
+        percentiles: Percentiles in [0, 100]
+
+    Returns:
+        Mapping of percentile to an array of values aligned with the segments
+    """
+    result = {}
+    for percentile in percentiles:
+        position = (counts - 1) * (percentile / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts - 1)
+        low, high = sorted_values[starts + lower], sorted_values[starts + upper]
+        result[percentile] = low + (high - low) * (position - lower)
+    return result
+
+
+def segment_moments(values: np.ndarray, starts: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and population standard deviation of every segment, as ``np.mean`` and ``np.std``.
+
+    Results are bit-identical to reducing each segment on its own: segments
+    of the same length are gathered into one 2-D array and reduced along its
+    rows, which applies NumPy's pairwise summation to every row exactly as to
+    a 1-D array. There is one pass per distinct segment length.
+
+    Args:
+        values: Values, with every segment contiguous
+        starts: Start offset of every segment
+        counts: Length of every segment (at least 1)
+
+    Returns:
+        Tuple of (means, standard deviations) aligned with the segments
+    """
+    means = np.empty(counts.size)
+    stds = np.empty(counts.size)
+    by_length = np.argsort(counts, kind='stable')
+    lengths = counts[by_length]
+    bounds = np.concatenate(([0], np.flatnonzero(lengths[1:] != lengths[:-1]) + 1, [lengths.size]))
+    for lower, upper in zip(bounds[:-1], bounds[1:]):
+        segments = by_length[lower:upper]
+        block = values[starts[segments, np.newaxis] + np.arange(lengths[lower])]
+        means[segments] = np.mean(block, axis=1)
+        stds[segments] = np.std(block, axis=1)
+    return means, stds
+
+
+def salary_summary(values: np.ndarray, percentiles: Iterable[int] = PERCENTILES,
+                   sketch_k: Optional[int] = None, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Compute overall statistics of one set of salaries.
+
+    The salaries are split into contiguous chunks, one per worker, whose
+    count, mean, M2, min and max (and quantile sketch in approximate mode)
+    are computed in parallel and merged. Exact quantiles use a single
+    selection pass over all salaries, approximate ones the merged sketch.
+
+    Args:
+        values: Salaries (at least one)
+        percentiles: Percentiles in [0, 100] to report besides the median
+        sketch_k: Sketch accuracy for approximate quantiles, None for exact
+        workers: Worker threads (see resolve_workers)
+
+    Returns:
+        Dictionary with 'count', 'mean', 'std', 'min', 'max', 'median',
+        'percentiles' (formatted as by format_percentiles) and 'sketch' (the
+        KLLSketch of all salaries in approximate mode, else None)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    percentiles = tuple(percentiles)
+    chunks = np.array_split(values, resolve_workers(values.size, workers))
+
+    def summarize(chunk):
+        mean = np.mean(chunk)
+        deviations = chunk - mean
+        sketch = KLLSketch.from_values(chunk, sketch_k) if sketch_k is not None else None
+        return chunk.size, mean, np.dot(deviations, deviations), np.min(chunk), np.max(chunk), sketch
+
+    if len(chunks) == 1:
+        parts = [summarize(chunks[0])]
+    else:
+        parts = list(get_executor('aggregation', len(chunks)).map(summarize, chunks))
+
+    # Chan's parallel merge of the chunk moments
+    count, mean, m2, lowest, highest, sketch = parts[0]
+    for part_count, part_mean, part_m2, part_min, part_max, part_sketch in parts[1:]:
+        total = count + part_count
+        delta = part_mean - mean
+        mean = mean + delta * part_count / total
+        m2 = m2 + part_m2 + delta * delta * count * part_count / total
+        count = total
+        lowest, highest = min(lowest, part_min), max(highest, part_max)
+        if sketch is not None:
+            sketch = sketch.merge(part_sketch)
+
+    qs = [0.5] + [percentile / 100.0 for percentile in percentiles]
+    if sketch is not None:
+        estimates = sketch.quantiles(qs)
+    else:
+        estimates = np.percentile(values, [q * 100 for q in qs])
+
+    return {
+        'count': int(count),
+        'mean': float(mean),
+        'std': float(np.sqrt(m2 / count)),
+        'min': float(lowest),
+        'max': float(highest),
+        'median': float(estimates[0]),
+        'percentiles': {f'p{percentile}': float(estimates[idx + 1]) for idx, percentile in enumerate(percentiles)},
+        'sketch': sketch
+    }
+
+
+def format_percentiles(stats: Dict[str, np.ndarray], idx: int) -> Dict[str, float]:
+    """
+    Extract the percentiles of one group from group_salary_stats output.
+
+    Args:
+        stats: Result of group_salary_stats
+        idx: Position of the group
+
+    Returns:
+        Dictionary with a 'p<percentile>' entry per percentile, e.g. 'p90'
+    """
+    return {f'p{percentile}': float(values[idx]) for percentile, values in stats['percentiles'].items()}
+
+
+def format_trend(stats: Dict[str, np.ndarray], idx: int) -> Dict[str, Any]:
+    """
+    Extract the statistics of one group from group_salary_stats output in the
+    trend format of AIModel.analyze_trends.
+
+    Args:
+        stats: Result of group_salary_stats
+        idx: Position of the group
+
+    Returns:
+        Dictionary with average, median, min, max, std deviation, job count
+        and salary percentiles
+    """
+    return {
+        'average_salary': float(stats['mean'][idx]),
+        'median_salary': float(stats['median'][idx]),
+        'min_salary': float(stats['min'][idx]),
+        'max_salary': float(stats['max'][idx]),
+        'std_deviation': float(stats['std'][idx]),
+        'job_count': int(stats['count'][idx]),
+        'salary_percentiles': format_percentiles(stats, idx)
+    }
+
+
+def group_salary_stats(codes: np.ndarray, values: np.ndarray, percentiles: Iterable[int] = PERCENTILES,
+                       sketch_k: Optional[int] = None, workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Compute per-group salary statistics, in parallel for large inputs.
+
+    With more than one worker, rows are hash-partitioned by group code
+    (code % workers) so that every group lands in exactly one shard. Shards
+    are aggregated on a thread pool (NumPy sorts and reductions release the
+    GIL) and their results concatenated, so per-group statistics, including
+    exact medians, are identical to the serial computation. In approximate
+    mode every group's sketch is built in its shard and kept with the result,
+    to be merged with the sketches of later additions (see
+    incremental.TrendAccumulator).
+
+    Args:
+        codes: Integer group code per row (e.g. JobFrame category codes)
+        values: Salary per row
+        percentiles: Percentiles in [0, 100] to report besides the median
+        sketch_k: Sketch accuracy for approximate quantiles, None for exact
+        workers: Worker threads (see resolve_workers)
+
+    Returns:
+        Dictionary of arrays aligned by group, in ascending code order:
+        'group', 'count', 'mean', 'median', 'min', 'max', 'std', plus
+        'percentiles' mapping each percentile to an array and, in approximate
+        mode, 'sketch' (object array of KLLSketch)
+    """
+    codes = np.asarray(codes)
+    values = np.asarray(values, dtype=np.float64)
+    percentiles = tuple(percentiles)
+    workers = resolve_workers(codes.size, workers)
+    if workers == 1:
+        return _group_salary_stats(codes, values, percentiles, sketch_k)
+
+    # Hash-partition rows into contiguous shards (radix sort on the shard id)
+    shard_ids = codes % workers
+    order = np.argsort(shard_ids, kind='stable')
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(shard_ids, minlength=workers))))
+
+    def aggregate(shard):
+        rows = order[bounds[shard]:bounds[shard + 1]]
+        return _group_salary_stats(codes[rows], values[rows], percentiles, sketch_k)
+
+    shards = list(get_executor('aggregation', workers).map(aggregate, range(workers)))
+    logger.debug(f"Aggregated {codes.size} rows on {workers} workers")
+
+    groups = np.concatenate([shard['group'] for shard in shards])
+    by_group = np.argsort(groups, kind='stable')
+    merged = {
+        key: np.concatenate([shard[key] for shard in shards])[by_group]
+        for key in ('group', 'count', 'mean', 'median', 'min', 'max', 'std', 'sketch')
+        if key in shards[0]
+    }
+    merged['percentiles'] = {
+        percentile: np.concatenate([shard['percentiles'][percentile] for shard in shards])[by_group]
+        for percentile in percentiles
+    }
+    return merged
+
+
+def _group_salary_stats(codes: np.ndarray, values: np.ndarray, percentiles: tuple,
+                        sketch_k: Optional[int]) -> Dict[str, np.ndarray]:
+    """
+    Compute per-group salary statistics in a constant number of array passes.
+
+    Rows are ordered by group code, keeping their input order within a group,
+    for the mean and standard deviation (see segment_moments, which matches
+    np.mean and np.std of each group bit for bit). They are also ordered by
+    (group code, value), which turns every group into a contiguous segment
+    sorted by value: min, max, median and percentiles are direct lookups
+    into those segments.
+
+    With ``sketch_k`` set, only the first order is built. Every group gets
+    a KLL sketch instead (groups of at most sketch_k salaries are kept as
+    they are) and the median and percentiles of all groups are estimated
+    from the sketches at once (see batch_quantiles).
+
+    Args:
+        codes: Integer group code per row
+        values: Salary per row
+        percentiles: Percentiles in [0, 100] to report besides the median
+        sketch_k: Sketch accuracy for approximate quantiles, None for exact
+
+    Returns:
+        Dictionary of arrays as described in group_salary_stats
+    """
+    if codes.size == 0:
+        empty = np.empty(0, dtype=np.float64)
+        stats = {
+            'group': np.empty(0, dtype=codes.dtype),
+            'count': np.empty(0, dtype=np.int64),
+            'mean': empty, 'median': empty, 'min': empty, 'max': empty, 'std': empty,
+            'percentiles': {percentile: empty for percentile in percentiles}
+        }
+        if sketch_k is not None:
+            stats['sketch'] = np.empty(0, dtype=object)
+        return stats
+
+    # Stable sort by code (radix sort for integer codes) keeps the input order within groups
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    grouped_values = values[order]
+
+    # Segment boundaries
+    starts = np.concatenate(([0], np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1))
+    ends = np.append(starts[1:], grouped_values.size)
+    counts = ends - starts
+
+    means, stds = segment_moments(grouped_values, starts, counts)
+
+    if sketch_k is None:
+        # Order statistics straight from the segments sorted by value
+        by_value = np.argsort(values, kind='stable')
+        sorted_values = values[by_value[np.argsort(codes[by_value], kind='stable')]]
+        lower_median = sorted_values[starts + (counts - 1) // 2]
+        upper_median = sorted_values[starts + counts // 2]
+        medians = (lower_median + upper_median) / 2
+        minimums = sorted_values[starts]
+        maximums = sorted_values[ends - 1]
+        quantiles = exact_percentiles(sorted_values, starts, counts, percentiles)
+    else:
+        sketches = np.empty(starts.size, dtype=object)
+        sketches[:] = KLLSketch.from_segments(grouped_values, starts, counts, sketch_k)
+        minimums = np.minimum.reduceat(grouped_values, starts)
+        maximums = np.maximum.reduceat(grouped_values, starts)
+        estimates = batch_quantiles(sketches, [0.5] + [percentile / 100.0 for percentile in percentiles])
+        medians = estimates[:, 0]
+        quantiles = {percentile: estimates[:, idx + 1] for idx, percentile in enumerate(percentiles)}
+
+    stats = {
+        'group': sorted_codes[starts],
+        'count': counts,
+        'mean': means,
+        'median': medians,
+        'min': minimums,
+        'max': maximums,
+        'std': stds,
+        'percentiles': quantiles
+    }
+    if sketch_k is not None:
+        stats['sketch'] = sketches
+    return stats
@@ -1,83 +1,154 @@
+import hashlib
+import json
 import numpy as np
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import PolynomialFeatures
 from sklearn.tree import DecisionTreeRegressor
 from src.config import Config
+from src.repositories.job_frame import as_job_frame
+from src.services.aggregation import format_trend, group_salary_stats, quantile_sketch_k
+from src.services.model_selection import select_model
+from src.services.regression import PolynomialFit, fit_polynomial_batch
 from src.utils.logger import setup_logger
 from src.utils.validation import validate_job_data, validate_prediction_input, ValidationError
 
 logger = setup_logger(__name__)
 
+# Model types that fit one fixed kind of model
+ESTIMATOR_TYPES = ('linear', 'polynomial', 'decision_tree')
+
+# Supported prediction model types ('auto' selects among the estimator types)
+MODEL_TYPES = ESTIMATOR_TYPES + ('auto',)
+
 class AIModel:
-    def __init__(self, model_type: str = None):
+    def __init__(self, model_type: str = None, selection_executor=None, selection_budget: float = None):
         """
         Initialize AI model with specified algorithm.
         
+        The model holds no fitted state: every prediction fits its own
+        estimator, so one instance can serve concurrent requests.
+        
         Args:
-            model_type: Type of model ('linear', 'polynomial', 'decision_tree')
+            model_type: Type of model ('linear', 'polynomial', 'decision_tree'
+                or 'auto' to select one by cross-validation per request)
+            selection_executor: Pool evaluating 'auto' candidates instead of
+                the shared one (see select_model)
+            selection_budget: Seconds 'auto' waits for candidates. If None,
+                uses Config.AUTO_MODEL_BUDGET
         """
         self.model_type = model_type or Config.MODEL_TYPE
-        self.model = self._create_model()
-        self.poly_features = None
+        self.selection_executor = selection_executor
+        self.selection_budget = selection_budget
         
-        if self.model_type == 'polynomial':
-            self.poly_features = PolynomialFeatures(degree=Config.POLYNOMIAL_DEGREE)
+        if self.model_type not in MODEL_TYPES:
+            logger.warning(f"Unknown model type: {self.model_type}, defaulting to linear")
         
         logger.info(f"Initialized AI model with type: {self.model_type}")
     
+    def _degree(self):
+        """Polynomial degree of closed-form fits (None for decision trees, the highest degree tried for 'auto')."""
+        if self.model_type == 'decision_tree':
+            return None
+        if self.model_type == 'auto':
+            return Config.AUTO_MAX_DEGREE
+        return Config.POLYNOMIAL_DEGREE if self.model_type == 'polynomial' else 1
+    
+    def cache_key(self, input_data):
+        """
+        Get a canonical key of a prediction input for this model.
+        
+        Years and salaries are normalized to floats, so inputs that differ only
+        in number formatting (2020 vs 2020.0) share a key.
+        
+        Args:
+            input_data: Validated dictionary with 'years', 'salaries' and
+                'future_years' keys
+            
+        Returns:
+            Hex SHA-256 digest of model type, degree and input series
+        """
+        canonical = json.dumps([
+            self.model_type,
+            self._degree(),
+            [float(year) for year in input_data['years']],
+            [float(salary) for salary in input_data['salaries']],
+            [float(year) for year in input_data['future_years']]
+        ], separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
     def _create_model(self):
-        """Create model instance based on model_type."""
-        if self.model_type == 'linear':
-            return LinearRegression()
-        elif self.model_type == 'polynomial':
-            return LinearRegression()
-        elif self.model_type == 'decision_tree':
-            return DecisionTreeRegressor(random_state=42, max_depth=5)
-        else:
-            logger.warning(f"Unknown model type: {self.model_type}, defaulting to linear")
-            return LinearRegression()
+        """Create a new, unfitted estimator based on model_type."""
+        if self.model_type == 'decision_tree':
+            return self._create_tree()
+        return LinearRegression()
+
+    @staticmethod
+    def _create_tree():
+        """Create a new, unfitted decision tree estimator."""
+        return DecisionTreeRegressor(random_state=42, max_depth=5)
+
+    def _create_feature_transform(self):
+        """Create a new feature transform for model_type (None if features are used as-is)."""
+        if self.model_type == 'polynomial':
+            return PolynomialFeatures(degree=Config.POLYNOMIAL_DEGREE)
+        return None
+
+    def _predict_with_estimator(self, years, salaries, future_years):
+        """
+        Fit a request-local scikit-learn estimator and predict.
+        
+        Used for decision trees and for inputs the closed-form fit cannot
+        solve uniquely (too few distinct years for the polynomial degree).
+        
+        Args:
+            years: Training years
+            salaries: Salaries aligned with years
+            future_years: Years to predict
+            
+        Returns:
+            Tuple of (predictions array, R² score on the training data)
+        """
+        X = years.reshape(-1, 1)
+        future_X = future_years.reshape(-1, 1)
+        
+        # Fit a request-local estimator so concurrent predictions never share state
+        model = self._create_model()
+        poly_features = self._create_feature_transform()
+        
+        # Apply polynomial features if needed
+        if poly_features is not None:
+            X = poly_features.fit_transform(X)
+            future_X = poly_features.transform(future_X)
+        
+        model.fit(X, salaries)
+        return model.predict(future_X), model.score(X, salaries)
 
     def analyze_trends(self, job_data):
         """
         Analyze job market trends from data.
         
         Args:
-            job_data: List of job dictionaries with 'category' and 'salary' keys
+            job_data: JobFrame or list of job dictionaries with 'category' and 'salary' keys
             
+        Medians and percentiles are exact, or estimated from quantile sketches
+        when Config.QUANTILE_MODE is 'approximate'.
+        
         Returns:
             Dictionary with statistics per category
         """
+        # Validate the encoded frame (skipped when it was validated at ingestion)
+        frame = as_job_frame(job_data)
         try:
-            validate_job_data(job_data)
+            validate_job_data(job_data if frame is None else frame)
         except ValidationError as e:
             logger.error(f"Validation error in analyze_trends: {str(e)}")
             raise
         
-        # Calculate comprehensive statistics per job category
-        trends = {}
-        for job in job_data:
-            category = job['category']
-            salary = job['salary']
-            if category not in trends:
-                trends[category] = {
-                    'salaries': [],
-                    'count': 0
-                }
-            trends[category]['salaries'].append(salary)
-            trends[category]['count'] += 1
+        categories = frame.categories('category')
+        stats = group_salary_stats(frame.codes('category'), frame.salary, sketch_k=quantile_sketch_k())
         
         # Compute statistics
-        result = {}
-        for category, data in trends.items():
-            salaries = np.array(data['salaries'])
-            result[category] = {
-                'average_salary': float(np.mean(salaries)),
-                'median_salary': float(np.median(salaries)),
-                'min_salary': float(np.min(salaries)),
-                'max_salary': float(np.max(salaries)),
-                'std_deviation': float(np.std(salaries)),
-                'job_count': data['count']
-            }
+        result = {categories[code]: format_trend(stats, idx) for idx, code in enumerate(stats['group'])}
         
         logger.info(f"Analyzed trends for {len(result)} categories")
         return result
@@ -98,23 +169,23 @@ class AIModel:
             logger.error(f"Validation error in predict: {str(e)}")
             raise
         
-        X = np.array(input_data['years']).reshape(-1, 1)
-        y = np.array(input_data['salaries'])
-        future_years = np.array(input_data['future_years']).reshape(-1, 1)
-        
-        # Apply polynomial features if needed
-        if self.model_type == 'polynomial' and self.poly_features:
-            X = self.poly_features.fit_transform(X)
-            future_years = self.poly_features.transform(future_years)
+        years = np.array(input_data['years'], dtype=np.float64)
+        salaries = np.array(input_data['salaries'], dtype=np.float64)
+        future_years = np.array(input_data['future_years'], dtype=np.float64)
         
-        # Train model
-        self.model.fit(X, y)
+        if self.model_type == 'auto':
+            return self._predict_auto(years, salaries, future_years)
         
-        # Make predictions
-        predictions = self.model.predict(future_years)
+        # Closed-form least squares for linear and polynomial models
+        fit = None
+        if self.model_type != 'decision_tree':
+            fit = PolynomialFit.fit(years, salaries, self._degree())
         
-        # Calculate confidence score (R² score on training data)
-        score = self.model.score(X, y)
+        if fit is not None:
+            predictions = fit.predict(future_years)
+            score = fit.score(years, salaries)
+        else:
+            predictions, score = self._predict_with_estimator(years, salaries, future_years)
         
         result = {
             'predictions': predictions.tolist(),
@@ -124,3 +195,102 @@ class AIModel:
         
         logger.info(f"Prediction completed with {self.model_type} model, confidence: {score:.3f}")
         return result
+
+    def _predict_auto(self, years, salaries, future_years):
+        """
+        Predict with the model that cross-validates best.
+        
+        The confidence score is the leave-one-out R² of the selected model,
+        which, unlike training R², does not reward overfitting. When no
+        candidate can be cross-validated (e.g. a single point) a linear fit
+        is used and the confidence score is None: its training R² would
+        not be comparable.
+        
+        Args:
+            years: Training years
+            salaries: Salaries aligned with years
+            future_years: Years to predict
+            
+        Returns:
+            Dictionary with predictions, model type, the selected model and
+            degree, the confidence score and 'budget_exceeded', True when
+            candidates were dropped by AUTO_MODEL_BUDGET
+        """
+        selected, complete = select_model(years, salaries, future_years, self._create_tree,
+                                          budget=self.selection_budget, executor=self.selection_executor)
+        if selected is None:
+            fallback = AIModel('linear').predict({
+                'years': years.tolist(),
+                'salaries': salaries.tolist(),
+                'future_years': future_years.tolist()
+            })
+            selected = {'model_type': 'linear', 'degree': 1, 'predictions': np.array(fallback['predictions']),
+                        'score': None}
+        
+        result = {
+            'predictions': selected['predictions'].tolist(),
+            'model_type': self.model_type,
+            'selected_model': selected['model_type'],
+            'degree': selected['degree'],
+            'confidence_score': None if selected['score'] is None else float(selected['score']),
+            'budget_exceeded': not complete
+        }
+        
+        logger.info(f"Prediction completed with auto model ({selected['model_type']}), "
+                    f"held-out confidence: {result['confidence_score']}")
+        return result
+
+    def predict_batch(self, series):
+        """
+        Predict future job trends for many series at once.
+        
+        Linear and polynomial series are fitted together with batched least
+        squares (see fit_polynomial_batch); decision trees, rank-deficient
+        series and 'auto' model selection run one series at a time.
+        
+        Args:
+            series: List of dictionaries, each with 'years', 'salaries' and
+                'future_years' keys
+            
+        Returns:
+            List of prediction dictionaries in the order of series
+            
+        Raises:
+            ValidationError: If any series is invalid (the message names its index)
+        """
+        for idx, input_data in enumerate(series):
+            try:
+                validate_prediction_input(input_data)
+            except ValidationError as e:
+                logger.error(f"Validation error in predict_batch: series {idx}: {str(e)}")
+                raise ValidationError(f"Series {idx}: {str(e)}")
+        
+        if self.model_type == 'auto':
+            return [self.predict(input_data) for input_data in series]
+        
+        fits = [None] * len(series)
+        if self.model_type != 'decision_tree':
+            fits = fit_polynomial_batch(
+                [input_data['years'] for input_data in series],
+                [input_data['salaries'] for input_data in series],
+                [input_data['future_years'] for input_data in series],
+                self._degree()
+            )
+        
+        results = []
+        for input_data, fit in zip(series, fits):
+            if fit is None:
+                fit = self._predict_with_estimator(
+                    np.array(input_data['years'], dtype=np.float64),
+                    np.array(input_data['salaries'], dtype=np.float64),
+                    np.array(input_data['future_years'], dtype=np.float64)
+                )
+            predictions, score = fit
+            results.append({
+                'predictions': predictions.tolist(),
+                'model_type': self.model_type,
+                'confidence_score': float(score)
+            })
+        
+        logger.info(f"Batch prediction completed for {len(results)} series with {self.model_type} model")
+        return results
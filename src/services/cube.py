@@ -0,0 +1,400 @@
+"""
+Job cube module.
+Provides a pre-materialized aggregation cube over the categorical job dimensions.
+"""
+import threading
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from src.repositories.job_frame import CATEGORICAL_FIELDS, JobFrame
+from src.services.aggregation import group_salary_stats
+from src.utils.logger import setup_logger
+from src.utils.validation import ValidationError
+
+logger = setup_logger(__name__)
+
+# Dimensions available for drill-down, in canonical order
+DIMENSIONS = CATEGORICAL_FIELDS
+
+
+def _split_by(groups: np.ndarray, values: np.ndarray, count: int) -> List[np.ndarray]:
+    """Split values into one array per group id in [0, count)."""
+    order = np.argsort(groups, kind='stable')
+    return np.split(values[order], np.cumsum(np.bincount(groups, minlength=count))[:-1])
+
+
+class JobCube:
+    """
+    Aggregation cube over category, location, experience and company_type.
+
+    The base cuboid (one cell per distinct combination of all dimensions) is
+    aggregated once from the raw salaries. Every other cuboid is rolled up from
+    the base cells using mergeable moments (count, sum, M2, min, max), so all
+    2^4 group-by combinations are materialized without rescanning raw jobs.
+
+    Feed deltas are applied in place with the same moment merges (and their
+    inverse for removed jobs), touching only the cells of the changed jobs.
+    Min and max cannot be un-merged, so the salaries of every base cell are
+    kept as well; a cell whose min or max was removed is recomputed from the
+    base cell salaries. Cells whose jobs were all removed stay in the cube
+    with a zero count and are not served.
+
+    Cell codes are shifted by one so that 0 stands for a missing value.
+    """
+
+    def __init__(self, frame: JobFrame):
+        """
+        Build and materialize the cube.
+
+        Args:
+            frame: Validated JobFrame to aggregate
+        """
+        self._values = {}
+        self._lookups = {}
+        for dim in DIMENSIONS:
+            values = [None] + list(frame.categories(dim))
+            self._values[dim] = values
+            self._lookups[dim] = {value: code for code, value in enumerate(values) if code}
+
+        self._cuboids = {}
+        base = self._build_base(frame)
+        for size in range(len(DIMENSIONS) + 1):
+            for dims in combinations(DIMENSIONS, size):
+                self._cuboids[frozenset(dims)] = base if size == len(DIMENSIONS) else self._roll_up(base, dims)
+
+        # Per-cuboid lookup of cell rows and the per-base-cell salaries,
+        # prepared on the first delta (see apply)
+        self._lock = threading.Lock()
+        self._frame = frame
+        self._indexes = {}
+        self._salaries = None
+        self._offsets = None
+        self._cell_salaries = {}
+
+        logger.info(f"Materialized job cube with {len(base['count'])} base cells and {len(self._cuboids)} cuboids")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Cached snapshots may be pickled (SQLite cache backend); locks cannot be
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _composite_key(self, codes: Dict[str, np.ndarray], dims: Iterable[str], size: int = 0) -> np.ndarray:
+        """Combine per-dimension codes into a single mixed-radix key (zeros of length size without dims)."""
+        key = None
+        for dim in dims:
+            radix = len(self._values[dim])
+            key = codes[dim].astype(np.int64) if key is None else key * radix + codes[dim]
+        return np.zeros(size, dtype=np.int64) if key is None else key
+
+    def _build_base(self, frame: JobFrame) -> Dict[str, Any]:
+        """Aggregate raw salaries into the base cuboid."""
+        shifted = {dim: frame.codes(dim).astype(np.int64) + 1 for dim in DIMENSIONS}
+        stats = group_salary_stats(self._composite_key(shifted, DIMENSIONS), frame.salary)
+
+        # Decode the composite keys back into per-dimension codes
+        codes = {}
+        key = stats['group']
+        for dim in reversed(DIMENSIONS):
+            radix = len(self._values[dim])
+            codes[dim] = key % radix
+            key = key // radix
+
+        count = stats['count']
+        return {
+            'codes': codes,
+            'count': count,
+            'sum': stats['mean'] * count,
+            'm2': stats['std'] ** 2 * count,
+            'min': stats['min'],
+            'max': stats['max']
+        }
+
+    def _roll_up(self, base: Dict[str, Any], dims: Iterable[str]) -> Dict[str, Any]:
+        """Merge base cells into the cuboid grouped by dims."""
+        dims = tuple(dims)
+        if dims:
+            key = self._composite_key(base['codes'], dims)
+            _, inverse = np.unique(key, return_inverse=True)
+        else:
+            inverse = np.zeros(len(base['count']), dtype=np.int64)
+
+        order = np.argsort(inverse, kind='stable')
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(inverse[order])) + 1))
+        first_cells = order[starts]
+
+        count = np.bincount(inverse, weights=base['count']).astype(np.int64)
+        total = np.bincount(inverse, weights=base['sum'])
+        mean = total / count
+
+        # Chan et al. parallel variance merge
+        cell_mean = base['sum'] / base['count']
+        shift = cell_mean - mean[inverse]
+        m2 = np.bincount(inverse, weights=base['m2'] + base['count'] * shift * shift)
+
+        return {
+            'codes': {dim: base['codes'][dim][first_cells] for dim in dims},
+            'count': count,
+            'sum': total,
+            'm2': m2,
+            'min': np.minimum.reduceat(base['min'][order], starts),
+            'max': np.maximum.reduceat(base['max'][order], starts)
+        }
+
+    def apply(self, added: Optional[JobFrame] = None, removed: Optional[JobFrame] = None) -> None:
+        """
+        Update the cube in place with jobs added and removed.
+
+        Removals are applied first. Cost is proportional to the changed jobs
+        and the cells they fall into, except that a delta creating new cells
+        inserts them into the lookup of each cuboid (a copy of its cell keys),
+        and the first delta prepares the lookups and base cell salaries from
+        the frame the cube was built from.
+
+        Args:
+            added: Validated frame of jobs to add
+            removed: Frame of jobs to remove; every job must be present
+
+        Raises:
+            ValidationError: If a removed job is not present (nothing is changed)
+        """
+        with self._lock:
+            if self._frame is not None:
+                self._index_base_salaries()
+
+            batches = []
+            if removed is not None and len(removed):
+                codes = self._encode(removed, extend=False)
+                self._check_present(codes, removed.salary)
+                batches.append((codes, removed.salary, False))
+            if added is not None and len(added):
+                batches.append((self._encode(added, extend=True), added.salary, True))
+
+            for codes, salaries, adding in batches:
+                self._merge_base(codes, salaries, adding)
+                for dims, cuboid in self._cuboids.items():
+                    if len(dims) < len(DIMENSIONS):
+                        self._merge_cuboid(dims, cuboid, codes, salaries, adding)
+
+    def _encode(self, frame: JobFrame, extend: bool) -> Dict[str, np.ndarray]:
+        """Translate the codes of a frame into shifted cube codes, adding unseen values if extend."""
+        codes = {}
+        for dim in DIMENSIONS:
+            mapping = np.zeros(len(frame.categories(dim)) + 1, dtype=np.int64)
+            for code, value in enumerate(frame.categories(dim)):
+                if value not in self._lookups[dim]:
+                    if not extend:
+                        raise ValidationError(f"Cannot remove job with unknown {dim}")
+                    self._lookups[dim][value] = len(self._values[dim])
+                    self._values[dim].append(value)
+                mapping[code] = self._lookups[dim][value]
+            # Last slot maps MISSING_CODE (index -1) onto 0
+            codes[dim] = mapping[frame.codes(dim)]
+        return codes
+
+    def _lookup(self, dims: frozenset, cuboid: Dict[str, Any], codes: Dict[str, np.ndarray], size: int,
+                create: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the cells of rows given by shifted codes in a cuboid.
+
+        Returns:
+            Tuple of (cell row per distinct cell, index of each input row's
+            distinct cell); missing cells are created when create is set and
+            reported as -1 otherwise
+        """
+        ordered = [dim for dim in DIMENSIONS if dim in dims]
+        radices = tuple(len(self._values[dim]) for dim in ordered)
+        index = self._indexes.get(dims)
+        if index is None or index[0] != radices:
+            # (Re)build the lookup, also when new dimension values changed the key radices
+            keys = self._composite_key(cuboid['codes'], ordered, len(cuboid['count']))
+            order = np.argsort(keys, kind='stable')
+            index = self._indexes[dims] = (radices, keys[order], order)
+
+        keys, inverse = np.unique(self._composite_key(codes, ordered, size), return_inverse=True)
+        _, sorted_keys, rows = index
+        positions = np.minimum(np.searchsorted(sorted_keys, keys), max(sorted_keys.size - 1, 0))
+        found = sorted_keys[positions] == keys if sorted_keys.size else np.zeros(keys.size, dtype=bool)
+        cells = np.where(found, rows[positions] if rows.size else -1, -1)
+
+        if create and not np.all(found):
+            new_keys = keys[~found]
+            first_rows = np.unique(inverse, return_index=True)[1][~found]
+            new_cells = np.arange(len(cuboid['count']), len(cuboid['count']) + new_keys.size)
+            for dim in ordered:
+                cuboid['codes'][dim] = np.concatenate((cuboid['codes'][dim], codes[dim][first_rows]))
+            for field, fill in (('count', 0), ('sum', 0.0), ('m2', 0.0), ('min', np.nan), ('max', np.nan)):
+                cuboid[field] = np.concatenate((cuboid[field], np.full(new_keys.size, fill, dtype=cuboid[field].dtype)))
+            insert_at = np.searchsorted(sorted_keys, new_keys)
+            self._indexes[dims] = (radices, np.insert(sorted_keys, insert_at, new_keys),
+                                   np.insert(rows, insert_at, new_cells))
+            cells[~found] = new_cells
+        return cells, inverse.reshape(-1)
+
+    def _index_base_salaries(self) -> None:
+        """Keep the salaries of every base cell of the construction frame, sorted within the cell."""
+        frame, self._frame = self._frame, None
+        base = self._cuboids[frozenset(DIMENSIONS)]
+        codes = {dim: frame.codes(dim).astype(np.int64) + 1 for dim in DIMENSIONS}
+        cells, inverse = self._lookup(frozenset(DIMENSIONS), base, codes, len(frame), create=False)
+        row_cells = cells[inverse]
+        order = np.lexsort((frame.salary, row_cells))
+        self._salaries = frame.salary[order]
+        self._offsets = np.concatenate(([0], np.cumsum(np.bincount(row_cells, minlength=len(base['count'])))))
+
+    def _base_cell_salaries(self, cell: int) -> np.ndarray:
+        """Get the sorted salaries of a base cell."""
+        salaries = self._cell_salaries.get(cell)
+        if salaries is None:
+            # Cells created since the cube was built have no salaries until first updated
+            salaries = self._salaries[self._offsets[cell]:self._offsets[cell + 1]] if cell + 1 < self._offsets.size else np.empty(0)
+        return salaries
+
+    def _check_present(self, codes: Dict[str, np.ndarray], salaries: np.ndarray) -> None:
+        """Raise ValidationError unless every job to remove is in its base cell."""
+        base = self._cuboids[frozenset(DIMENSIONS)]
+        cells, inverse = self._lookup(frozenset(DIMENSIONS), base, codes, salaries.size, create=False)
+        for cell, cell_salaries in zip(cells, _split_by(inverse, salaries, cells.size)):
+            batch, counts = np.unique(cell_salaries, return_counts=True)
+            present = self._base_cell_salaries(cell) if cell >= 0 else np.empty(0)
+            available = np.searchsorted(present, batch, side='right') - np.searchsorted(present, batch, side='left')
+            if np.any(available < counts):
+                raise ValidationError("Cannot remove job that is not present")
+
+    @staticmethod
+    def _batch_moments(inverse: np.ndarray, salaries: np.ndarray, cells: int) -> Dict[str, np.ndarray]:
+        """Aggregate a batch of salaries into count, sum, M2, min and max per distinct cell."""
+        count = np.bincount(inverse, minlength=cells)
+        total = np.bincount(inverse, weights=salaries, minlength=cells)
+        shift = salaries - (total / count)[inverse]
+        lowest = np.full(cells, np.inf)
+        highest = np.full(cells, -np.inf)
+        np.minimum.at(lowest, inverse, salaries)
+        np.maximum.at(highest, inverse, salaries)
+        return {'count': count, 'sum': total, 'm2': np.bincount(inverse, weights=shift * shift, minlength=cells),
+                'min': lowest, 'max': highest}
+
+    @staticmethod
+    def _merge_moments(cuboid: Dict[str, Any], cells: np.ndarray, batch: Dict[str, np.ndarray], adding: bool) -> None:
+        """Merge batch moments into (or, for removals, out of) cells with Chan's parallel formulas."""
+        count, total, m2 = cuboid['count'][cells], cuboid['sum'][cells], cuboid['m2'][cells]
+        batch_mean = batch['sum'] / batch['count']
+        if adding:
+            merged = count + batch['count']
+            mean = np.divide(total, count, out=np.zeros(cells.size), where=count > 0)
+            delta = batch_mean - mean
+            cuboid['m2'][cells] = m2 + batch['m2'] + delta * delta * count * batch['count'] / merged
+            cuboid['sum'][cells] = total + batch['sum']
+        else:
+            merged = count - batch['count']
+            rest = total - batch['sum']
+            mean = np.divide(rest, merged, out=np.zeros(cells.size), where=merged > 0)
+            delta = batch_mean - mean
+            m2 = m2 - batch['m2'] - delta * delta * merged * batch['count'] / count
+            # A single remaining salary has no spread, whatever rounding left over
+            cuboid['m2'][cells] = np.where(merged > 1, np.maximum(m2, 0.0), 0.0)
+            cuboid['sum'][cells] = np.where(merged > 0, rest, 0.0)
+        cuboid['count'][cells] = merged
+
+    def _merge_base(self, codes: Dict[str, np.ndarray], salaries: np.ndarray, adding: bool) -> None:
+        """Apply a batch to the base cells and their salaries."""
+        base = self._cuboids[frozenset(DIMENSIONS)]
+        cells, inverse = self._lookup(frozenset(DIMENSIONS), base, codes, salaries.size, create=adding)
+        self._merge_moments(base, cells, self._batch_moments(inverse, salaries, cells.size), adding)
+
+        for cell, batch in zip(cells, _split_by(inverse, salaries, cells.size)):
+            present = self._base_cell_salaries(cell)
+            batch = np.sort(batch)
+            if adding:
+                updated = np.insert(present, np.searchsorted(present, batch, side='right'), batch)
+            else:
+                values, counts = np.unique(batch, return_counts=True)
+                first = np.repeat(np.searchsorted(present, values, side='left'), counts)
+                updated = np.delete(present, first + np.arange(batch.size) - np.repeat(np.cumsum(counts) - counts, counts))
+            self._cell_salaries[cell] = updated
+            base['min'][cell] = updated[0] if updated.size else np.nan
+            base['max'][cell] = updated[-1] if updated.size else np.nan
+
+    def _merge_cuboid(self, dims: frozenset, cuboid: Dict[str, Any], codes: Dict[str, np.ndarray],
+                      salaries: np.ndarray, adding: bool) -> None:
+        """Apply a batch to the cells of a rolled-up cuboid."""
+        cells, inverse = self._lookup(dims, cuboid, codes, salaries.size, create=adding)
+        batch = self._batch_moments(inverse, salaries, cells.size)
+        lowest, highest = cuboid['min'][cells], cuboid['max'][cells]
+        was_empty = cuboid['count'][cells] == 0
+        self._merge_moments(cuboid, cells, batch, adding)
+
+        if adding:
+            cuboid['min'][cells] = np.where(was_empty, batch['min'], np.fmin(lowest, batch['min']))
+            cuboid['max'][cells] = np.where(was_empty, batch['max'], np.fmax(highest, batch['max']))
+            return
+
+        # A removed min or max is recomputed from the (already updated) base cells
+        base = self._cuboids[frozenset(DIMENSIONS)]
+        for cell in cells[(batch['min'] <= lowest) | (batch['max'] >= highest)]:
+            members = base['count'] > 0
+            for dim in dims:
+                members &= base['codes'][dim] == cuboid['codes'][dim][cell]
+            if np.any(members):
+                cuboid['min'][cell] = base['min'][members].min()
+                cuboid['max'][cell] = base['max'][members].max()
+            else:
+                cuboid['min'][cell] = cuboid['max'][cell] = np.nan
+
+    def query(self, group_by: List[str], filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Serve a roll-up or slice from the materialized cells.
+
+        Args:
+            group_by: Dimensions to group by, in output order
+            filters: Optional mapping of dimension to the value to slice on
+
+        Returns:
+            List of cells with the group-by values and salary statistics
+
+        Raises:
+            ValidationError: If a dimension is unknown or repeated
+        """
+        filters = filters or {}
+        for dim in list(group_by) + list(filters):
+            if dim not in DIMENSIONS:
+                raise ValidationError(f"Unknown dimension: {dim}. Must be one of {', '.join(DIMENSIONS)}")
+        if len(set(group_by)) != len(group_by):
+            raise ValidationError("'group_by' dimensions must be unique")
+
+        with self._lock:
+            cuboid = self._cuboids[frozenset(group_by) | frozenset(filters)]
+            mask = cuboid['count'] > 0
+            for dim, value in filters.items():
+                code = self._lookups[dim].get(value)
+                if code is None:
+                    return []
+                mask &= cuboid['codes'][dim] == code
+
+            rows = np.flatnonzero(mask)
+            if group_by:
+                rows = rows[np.lexsort([cuboid['codes'][dim][rows] for dim in reversed(group_by)])]
+
+            codes = {dim: cuboid['codes'][dim][rows] for dim in group_by}
+            count = cuboid['count'][rows]
+            total, m2 = cuboid['sum'][rows], cuboid['m2'][rows]
+            lowest, highest = cuboid['min'][rows], cuboid['max'][rows]
+
+        mean = total / count
+        std = np.sqrt(np.maximum(m2, 0) / count)
+        cells = []
+        for idx in range(rows.size):
+            cell = {dim: self._values[dim][codes[dim][idx]] for dim in group_by}
+            cell.update({
+                'job_count': int(count[idx]),
+                'average_salary': float(mean[idx]),
+                'min_salary': float(lowest[idx]),
+                'max_salary': float(highest[idx]),
+                'std_deviation': float(std[idx])
+            })
+            cells.append(cell)
+        return cells
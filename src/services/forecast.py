@@ -0,0 +1,164 @@
+"""
+Forecast module.
+Materializes salary forecasts per category and per category and location from
+the yearly history in the job data.
+"""
+import math
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from src.config import Config
+from src.repositories.job_frame import JobFrame, MISSING_CODE
+from src.services.ai_model import AIModel, MODEL_TYPES
+from src.utils.executors import get_executor
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def yearly_series(frame: JobFrame, fields: Sequence[str]) -> Iterator[Tuple[Tuple[Any, ...], np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Yield the yearly average salary of every group of a frame.
+
+    Jobs without a year, a salary or a value for one of the fields are skipped.
+
+    Args:
+        frame: JobFrame to group
+        fields: Categorical fields identifying a group
+
+    Yields:
+        Tuple of (group values, years, average salaries, job counts), with
+        years in ascending order
+    """
+    valid = ~np.isnan(frame.year) & ~np.isnan(frame.salary)
+    for field in fields:
+        valid &= frame.codes(field) != MISSING_CODE
+    if not np.any(valid):
+        return
+
+    # One row per job: group codes followed by the year, deduplicated in sorted order
+    keys = np.column_stack([frame.codes(field)[valid].astype(np.float64) for field in fields] + [frame.year[valid]])
+    cells, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    counts = np.bincount(inverse)
+    means = np.bincount(inverse, weights=frame.salary[valid]) / counts
+
+    # Cells of one group are contiguous with ascending years
+    groups = cells[:, :-1]
+    starts = np.concatenate(([0], np.flatnonzero(np.any(groups[1:] != groups[:-1], axis=1)) + 1))
+    ends = np.append(starts[1:], len(cells))
+    lookups = [frame.categories(field) for field in fields]
+    for start, end in zip(starts, ends):
+        group = tuple(lookup[int(code)] for lookup, code in zip(lookups, groups[start]))
+        yield group, cells[start:end, -1], means[start:end], counts[start:end]
+
+
+class ForecastTable:
+    """
+    Materialized salary forecasts.
+
+    Every category, and every category and location pair, with enough years
+    of history gets a forecast from each model type for the years following
+    the latest year in the data. Lookups never fit a model.
+
+    'auto' forecasts evaluate every candidate, without a time budget, on a
+    pool of their own, so they do not depend on load and do not hold up
+    interactive 'auto' predictions; they record the selected model and degree.
+    """
+
+    def __init__(self, rows: Dict[Tuple[Any, Optional[Any]], Dict[str, Any]] = None):
+        """
+        Initialize table.
+
+        Args:
+            rows: Mapping of (category, location or None) to its forecast
+        """
+        self._rows = dict(rows or {})
+
+    @classmethod
+    def from_frame(cls, frame: JobFrame, model_types: Sequence[str] = MODEL_TYPES,
+                   horizon: int = None, min_years: int = None) -> 'ForecastTable':
+        """
+        Build forecasts for every category and category and location of a frame.
+
+        All series of one model type are predicted in a single batch.
+
+        Args:
+            frame: JobFrame with a year column
+            model_types: Model types to forecast with
+            horizon: Number of future years. If None, uses Config.FORECAST_HORIZON
+            min_years: Minimum distinct years of history. If None, uses
+                Config.FORECAST_MIN_YEARS
+
+        Returns:
+            ForecastTable (empty when no job has a year)
+        """
+        horizon = horizon or Config.FORECAST_HORIZON
+        min_years = min_years or Config.FORECAST_MIN_YEARS
+
+        keys = []
+        series = []
+        for fields in (('category',), ('category', 'location')):
+            for group, years, salaries, counts in yearly_series(frame, fields):
+                if years.size < min_years:
+                    continue
+                keys.append((group[0], group[1] if len(group) > 1 else None))
+                series.append((years, salaries, counts))
+        if not series:
+            return cls()
+
+        last_year = int(np.nanmax(frame.year))
+        future_years = [float(year) for year in range(last_year + 1, last_year + horizon + 1)]
+        inputs = [{'years': years.tolist(), 'salaries': salaries.tolist(), 'future_years': future_years}
+                  for years, salaries, _ in series]
+
+        rows = {}
+        for (category, location), (years, salaries, counts) in zip(keys, series):
+            rows[(category, location)] = {
+                'category': category,
+                'location': location,
+                'history': {
+                    'years': [int(year) for year in years],
+                    'average_salaries': salaries.tolist(),
+                    'job_counts': counts.tolist()
+                },
+                'future_years': [int(year) for year in future_years],
+                'forecasts': {}
+            }
+        for model_type in model_types:
+            if model_type == 'auto':
+                model = AIModel(model_type, selection_executor=get_executor('forecast-selection', Config.AUTO_MODEL_WORKERS),
+                                selection_budget=math.inf)
+            else:
+                model = AIModel(model_type)
+            for key, prediction in zip(keys, model.predict_batch(inputs)):
+                forecast = {
+                    'predictions': prediction['predictions'],
+                    'confidence_score': prediction['confidence_score']
+                }
+                if model_type == 'auto':
+                    forecast['selected_model'] = prediction['selected_model']
+                    forecast['degree'] = prediction['degree']
+                rows[key]['forecasts'][model_type] = forecast
+
+        logger.info(f"Materialized forecasts for {len(rows)} series with {len(model_types)} model types")
+        return cls(rows)
+
+    def get(self, category: Any, location: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up the forecast of a category, optionally in one location.
+
+        Args:
+            category: Job category
+            location: Location, or None for the whole category
+
+        Returns:
+            Forecast dictionary, or None if there is no forecast for it
+        """
+        return self._rows.get((category, location))
+
+    def categories(self) -> List[Any]:
+        """Categories with a forecast."""
+        return [category for category, location in self._rows if location is None]
+
+    def __len__(self) -> int:
+        return len(self._rows)
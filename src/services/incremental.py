@@ -0,0 +1,608 @@
+"""
+Incremental aggregation module.
+Maintains per-category salary statistics that are updated from added and
+removed jobs instead of being recomputed over the whole dataset.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from src.repositories.job_frame import JobFrame
+from src.services.aggregation import PERCENTILES, format_trend, group_salary_stats, salary_summary
+from src.services.quantile_sketch import KLLSketch
+from src.utils.validation import ValidationError
+
+# Number of salaries a SortedSalaries block is split into; blocks hold
+# between BLOCK_SIZE / 2 and 2 * BLOCK_SIZE salaries once there is more than one
+BLOCK_SIZE = 1024
+
+
+class SortedSalaries:
+    """
+    Immutable multiset of salaries kept as a list of sorted blocks.
+
+    Adding or removing k salaries copies only the blocks they fall into (and
+    the list of block references), never the whole sorted array, so a change
+    costs O(k * BLOCK_SIZE + n / BLOCK_SIZE). Order statistics find their
+    block by binary search over the block boundaries.
+    """
+
+    __slots__ = ('blocks', 'lasts', 'starts', 'count')
+
+    def __init__(self, blocks: List[np.ndarray]):
+        """
+        Initialize from sorted blocks.
+
+        Args:
+            blocks: Non-empty sorted arrays, each one's values not below the
+                previous one's
+        """
+        self.blocks = blocks
+        self.lasts = np.array([block[-1] for block in blocks], dtype=np.float64)
+        sizes = np.array([block.size for block in blocks], dtype=np.int64)
+        self.starts = np.concatenate(([0], np.cumsum(sizes)))
+        self.count = int(self.starts[-1])
+
+    @classmethod
+    def from_sorted(cls, values: np.ndarray) -> 'SortedSalaries':
+        """
+        Build from salaries in ascending order.
+
+        Args:
+            values: Sorted salaries
+
+        Returns:
+            SortedSalaries holding values
+        """
+        return cls(_split(values))
+
+    def rank(self, values: np.ndarray, side: str = 'left') -> np.ndarray:
+        """
+        Count the salaries below (side='left') or not above (side='right') each value.
+
+        Args:
+            values: Values to rank
+            side: 'left' or 'right', as in np.searchsorted
+
+        Returns:
+            Array of counts aligned with values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        # All salaries of the blocks before the first one that can contain a value rank below it
+        block_ids = np.searchsorted(self.lasts, values, side=side)
+        ranks = np.full(values.size, self.count, dtype=np.int64)
+        for block_id in np.unique(block_ids[block_ids < len(self.blocks)]):
+            selected = block_ids == block_id
+            ranks[selected] = self.starts[block_id] + np.searchsorted(self.blocks[block_id], values[selected], side=side)
+        return ranks
+
+    def take(self, ranks: np.ndarray) -> np.ndarray:
+        """
+        Get the salaries at positions of the sorted order.
+
+        Args:
+            ranks: Positions in [0, count)
+
+        Returns:
+            Array of salaries aligned with ranks
+        """
+        ranks = np.asarray(ranks, dtype=np.int64)
+        block_ids = np.searchsorted(self.starts, ranks, side='right') - 1
+        result = np.empty(ranks.size, dtype=np.float64)
+        for block_id in np.unique(block_ids):
+            selected = block_ids == block_id
+            result[selected] = self.blocks[block_id][ranks[selected] - self.starts[block_id]]
+        return result
+
+    def add(self, values: np.ndarray) -> 'SortedSalaries':
+        """
+        Get the multiset with sorted salaries added.
+
+        Args:
+            values: Salaries to add, in ascending order
+
+        Returns:
+            New SortedSalaries
+        """
+        # Every salary goes into the first block whose last salary is not below it
+        block_ids = np.minimum(np.searchsorted(self.lasts, values, side='left'), len(self.blocks) - 1)
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(block_ids)) + 1, [values.size]))
+        changed = {}
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            block_id = int(block_ids[start])
+            block = self.blocks[block_id]
+            batch = values[start:end]
+            changed[block_id] = np.insert(block, np.searchsorted(block, batch, side='right'), batch)
+        return SortedSalaries(self._replace(changed))
+
+    def remove(self, values: np.ndarray) -> Optional['SortedSalaries']:
+        """
+        Get the multiset with salaries removed.
+
+        Args:
+            values: Salaries to remove; each must be present
+
+        Returns:
+            New SortedSalaries, or None if no salaries remain
+
+        Raises:
+            ValidationError: If a salary to remove is not present
+        """
+        removed, removed_counts = np.unique(np.asarray(values, dtype=np.float64), return_counts=True)
+        left = self.rank(removed, side='left')
+        missing = (self.rank(removed, side='right') - left) < removed_counts
+        if np.any(missing):
+            raise ValidationError(f"Cannot remove salary {removed[missing][0]}: no such job")
+        if removed_counts.sum() == self.count:
+            return None
+
+        # Ranks of the first removed_counts occurrences of every removed value
+        offsets = np.arange(removed_counts.sum()) - np.repeat(np.cumsum(removed_counts) - removed_counts, removed_counts)
+        ranks = np.repeat(left, removed_counts) + offsets
+        block_ids = np.searchsorted(self.starts, ranks, side='right') - 1
+        changed = {}
+        for block_id in np.unique(block_ids):
+            block_id = int(block_id)
+            positions = ranks[block_ids == block_id] - self.starts[block_id]
+            changed[block_id] = np.delete(self.blocks[block_id], positions)
+        return SortedSalaries(self._replace(changed))
+
+    def _replace(self, changed: Dict[int, np.ndarray]) -> List[np.ndarray]:
+        """
+        Get the block list with some blocks replaced, keeping block sizes in bounds.
+
+        A block grown beyond 2 * BLOCK_SIZE is split, one shrunk below
+        BLOCK_SIZE / 2 is merged into the next block (the previous one at the end).
+        """
+        blocks = []
+        pending = None
+
+        def push(block):
+            nonlocal pending
+            if pending is not None:
+                block = np.concatenate((pending, block))
+                pending = None
+            if block.size < BLOCK_SIZE // 2:
+                pending = block
+            else:
+                blocks.extend(_split(block))
+
+        previous = 0
+        for block_id in sorted(changed):
+            if pending is not None and previous < block_id:
+                push(self.blocks[previous])
+                previous += 1
+            blocks.extend(self.blocks[previous:block_id])
+            push(changed[block_id])
+            previous = block_id + 1
+        if pending is not None and previous < len(self.blocks):
+            push(self.blocks[previous])
+            previous += 1
+        blocks.extend(self.blocks[previous:])
+        if pending is not None and pending.size:
+            if blocks:
+                blocks[-1:] = _split(np.concatenate((blocks[-1], pending)))
+            else:
+                blocks.append(pending)
+        return blocks
+
+    def values(self) -> np.ndarray:
+        """Get all salaries in ascending order (a copy)."""
+        return np.concatenate(self.blocks)
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def _split(values: np.ndarray) -> List[np.ndarray]:
+    """Split sorted values into blocks of BLOCK_SIZE (the last one taking the remainder)."""
+    if values.size <= 2 * BLOCK_SIZE:
+        return [values] if values.size else []
+    bounds = np.arange(BLOCK_SIZE, values.size - BLOCK_SIZE // 2, BLOCK_SIZE)
+    return np.split(values, bounds)
+
+
+def _moments(sorted_values: np.ndarray) -> Tuple[float, float]:
+    """Get the mean and M2 (sum of squared deviations from the mean) of values."""
+    mean = float(np.mean(sorted_values))
+    deviations = sorted_values - mean
+    return mean, float(np.dot(deviations, deviations))
+
+
+def _add_moments(count: int, mean: float, m2: float, values: np.ndarray) -> Tuple[int, float, float]:
+    """Get count, mean and M2 with a batch of values added (Chan's parallel merge)."""
+    batch_mean, batch_m2 = _moments(values)
+    total = count + values.size
+    delta = batch_mean - mean
+    return total, mean + delta * values.size / total, m2 + batch_m2 + delta * delta * count * values.size / total
+
+
+def _remove_moments(count: int, mean: float, m2: float, values: np.ndarray) -> Tuple[int, float, float]:
+    """Get count, mean and M2 with a batch of values removed (the inverse of the parallel merge)."""
+    remaining = count - values.size
+    batch_mean, batch_m2 = _moments(values)
+    remaining_mean = (count * mean - values.size * batch_mean) / remaining
+    delta = batch_mean - remaining_mean
+    remaining_m2 = m2 - batch_m2 - delta * delta * remaining * values.size / count
+    return remaining, remaining_mean, max(remaining_m2, 0.0)
+
+
+class SalaryState:
+    """
+    Immutable running salary statistics of one group.
+
+    Count, mean and M2 (sum of squared deviations from the mean) are updated
+    with Chan's parallel formulas, so adding or removing a batch of k salaries
+    costs O(k) for the moments. The salaries themselves are kept in a
+    SortedSalaries, which gives exact min, max, median and percentiles and
+    only copies the blocks a batch touches. The summary is computed once per
+    state.
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'salaries', '_summary')
+
+    def __init__(self, count: int, mean: float, m2: float, salaries: SortedSalaries,
+                 summary: Optional[Dict[str, Any]] = None):
+        """
+        Initialize state.
+
+        Args:
+            count: Number of salaries
+            mean: Mean salary
+            m2: Sum of squared deviations from the mean
+            salaries: All salaries
+            summary: Known summary of the salaries, computed on demand if None
+        """
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.salaries = salaries
+        self._summary = summary
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, summary: Optional[Dict[str, Any]] = None) -> 'SalaryState':
+        """
+        Build state from a batch of salaries.
+
+        Args:
+            values: Salaries (at least one)
+            summary: Known summary of the salaries (e.g. from analyze_trends)
+
+        Returns:
+            SalaryState describing values
+        """
+        values = np.sort(np.asarray(values, dtype=np.float64))
+        mean, m2 = _moments(values)
+        return cls(values.size, mean, m2, SortedSalaries.from_sorted(values), summary)
+
+    def add(self, values: np.ndarray) -> 'SalaryState':
+        """
+        Get the state with a batch of salaries added.
+
+        Args:
+            values: Salaries to add
+
+        Returns:
+            New SalaryState
+        """
+        values = np.sort(np.asarray(values, dtype=np.float64))
+        count, mean, m2 = _add_moments(self.count, self.mean, self.m2, values)
+        return SalaryState(count, mean, m2, self.salaries.add(values))
+
+    def remove(self, values: np.ndarray) -> Optional['SalaryState']:
+        """
+        Get the state with a batch of salaries removed.
+
+        Args:
+            values: Salaries to remove; each must be present
+
+        Returns:
+            New SalaryState, or None if no salaries remain
+
+        Raises:
+            ValidationError: If a salary to remove is not present
+        """
+        values = np.sort(np.asarray(values, dtype=np.float64))
+        remaining = self.salaries.remove(values)
+        if remaining is None:
+            return None
+
+        count, mean, m2 = _remove_moments(self.count, self.mean, self.m2, values)
+        return SalaryState(count, mean, m2, remaining)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get the statistics in the trend format of AIModel.analyze_trends.
+
+        Returns:
+            Dictionary with average, median, min, max, std deviation, job count
+            and salary percentiles
+        """
+        if self._summary is None:
+            count = self.count
+            positions = (count - 1) * (np.array(PERCENTILES) / 100.0)
+            lower = np.floor(positions).astype(np.int64)
+            upper = np.minimum(lower + 1, count - 1)
+            ranks = np.concatenate(([0, count - 1, (count - 1) // 2, count // 2], lower, upper))
+            values = self.salaries.take(ranks)
+            low, high = values[4:4 + lower.size], values[4 + lower.size:]
+            percentiles = low + (high - low) * (positions - lower)
+            self._summary = {
+                'average_salary': float(self.mean),
+                'median_salary': float((values[2] + values[3]) / 2),
+                'min_salary': float(values[0]),
+                'max_salary': float(values[1]),
+                'std_deviation': float(np.sqrt(self.m2 / count)),
+                'job_count': int(count),
+                'salary_percentiles': {f'p{percentile}': float(value)
+                                       for percentile, value in zip(PERCENTILES, percentiles)}
+            }
+        return self._summary
+
+
+class SketchedSalaryState(SalaryState):
+    """
+    Immutable running salary statistics of one group with approximate quantiles.
+
+    Count, mean and M2 are exact and updated as in SalaryState, but instead
+    of every salary the state keeps a KLLSketch of the salaries added and one
+    of the salaries removed, so it holds O(k) values and a batch costs one
+    sketch merge. Quantiles are estimated from the difference of the two
+    sketches (see KLLSketch.quantiles), whose rank error grows with the
+    number of removed salaries. Removed salaries are only checked against the
+    count; JobFrameChanges checks that every removed job exists.
+    """
+
+    __slots__ = ('sketch', 'removed')
+
+    def __init__(self, count: int, mean: float, m2: float, sketch: KLLSketch,
+                 removed: Optional[KLLSketch] = None, summary: Optional[Dict[str, Any]] = None):
+        """
+        Initialize state.
+
+        Args:
+            count: Number of salaries
+            mean: Mean salary
+            m2: Sum of squared deviations from the mean
+            sketch: Sketch of all salaries ever added
+            removed: Sketch of the salaries since removed, None if none were
+            summary: Known summary of the salaries, computed on demand if None
+        """
+        super().__init__(count, mean, m2, None, summary)
+        self.sketch = sketch
+        self.removed = removed
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, k: int = 200) -> 'SketchedSalaryState':
+        """
+        Build state from a batch of salaries.
+
+        Args:
+            values: Salaries (at least one)
+            k: Sketch accuracy parameter
+
+        Returns:
+            SketchedSalaryState describing values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        mean, m2 = _moments(values)
+        return cls(values.size, mean, m2, KLLSketch.from_values(values, k))
+
+    def add(self, values: np.ndarray) -> 'SketchedSalaryState':
+        """
+        Get the state with a batch of salaries added.
+
+        Args:
+            values: Salaries to add
+
+        Returns:
+            New SketchedSalaryState
+        """
+        values = np.asarray(values, dtype=np.float64)
+        count, mean, m2 = _add_moments(self.count, self.mean, self.m2, values)
+        sketch = self.sketch.merge(KLLSketch.from_values(values, self.sketch.k))
+        return SketchedSalaryState(count, mean, m2, sketch, self.removed)
+
+    def remove(self, values: np.ndarray) -> Optional['SketchedSalaryState']:
+        """
+        Get the state with a batch of salaries removed.
+
+        Args:
+            values: Salaries to remove
+
+        Returns:
+            New SketchedSalaryState, or None if no salaries remain
+
+        Raises:
+            ValidationError: If more salaries are removed than present
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.size > self.count:
+            raise ValidationError(f"Cannot remove {values.size} salaries: only {self.count} present")
+        if values.size == self.count:
+            return None
+
+        count, mean, m2 = _remove_moments(self.count, self.mean, self.m2, values)
+        removed = KLLSketch.from_values(values, self.sketch.k)
+        if self.removed is not None:
+            removed = self.removed.merge(removed)
+        return SketchedSalaryState(count, mean, m2, self.sketch, removed)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get the statistics in the trend format of AIModel.analyze_trends.
+
+        Returns:
+            Dictionary with average, median, min, max, std deviation, job count
+            and estimated salary percentiles
+        """
+        if self._summary is None:
+            qs = [0.0, 1.0, 0.5] + [percentile / 100.0 for percentile in PERCENTILES]
+            values = self.sketch.quantiles(qs, self.removed)
+            self._summary = {
+                'average_salary': float(self.mean),
+                'median_salary': float(values[2]),
+                'min_salary': float(values[0]),
+                'max_salary': float(values[1]),
+                'std_deviation': float(np.sqrt(self.m2 / self.count)),
+                'job_count': int(self.count),
+                'salary_percentiles': {f'p{percentile}': float(value)
+                                       for percentile, value in zip(PERCENTILES, values[3:])}
+            }
+        return self._summary
+
+
+def _category_segments(frame: JobFrame) -> Iterator[Tuple[Any, np.ndarray]]:
+    """Yield (category, salaries) for every category present in a frame, in code order."""
+    codes = frame.codes('category')
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    starts = np.concatenate(([0], np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1))
+    categories = frame.categories('category')
+    for code, salaries in zip(sorted_codes[starts], np.split(frame.salary[order], starts[1:])):
+        yield categories[code], salaries
+
+
+class TrendAccumulator:
+    """
+    Immutable per-category and overall salary state of a job dataset.
+
+    Applying a delta returns a new accumulator that shares the state (and
+    summary) of every untouched category. Only the touched categories are
+    updated, in time proportional to their changed jobs plus one pass over
+    the block list of each touched SortedSalaries.
+
+    In approximate mode (sketch_k set) every category and the total keep a
+    KLL quantile sketch instead of their salaries (see SketchedSalaryState):
+    the sketches are built per shard when the accumulator is built and
+    merged with a sketch of every later batch.
+    """
+
+    def __init__(self, states: Dict[Any, SalaryState] = None, total: Optional[SalaryState] = None,
+                 sketch_k: Optional[int] = None):
+        """
+        Initialize accumulator.
+
+        Args:
+            states: Mapping of category to its SalaryState
+            total: SalaryState over all jobs (None when empty)
+            sketch_k: Sketch accuracy of approximate quantiles, None for exact
+        """
+        self._states = dict(states or {})
+        self._total = total
+        self._sketch_k = sketch_k
+
+    @classmethod
+    def from_frame(cls, frame: JobFrame, trends: Optional[Dict[Any, Dict[str, Any]]] = None,
+                   sketch_k: Optional[int] = None) -> 'TrendAccumulator':
+        """
+        Build an accumulator over every job of a frame.
+
+        Args:
+            frame: JobFrame with valid category and salary columns
+            trends: Exact trends already computed for frame (as by
+                AIModel.analyze_trends), reused as the category summaries
+                in exact mode
+            sketch_k: Sketch accuracy of approximate quantiles, None for exact
+
+        Returns:
+            TrendAccumulator describing frame
+        """
+        if not len(frame):
+            return cls(sketch_k=sketch_k)
+        if sketch_k is not None:
+            return cls._sketch_frame(frame, sketch_k)
+        trends = trends or {}
+        states = {category: SalaryState.from_values(salaries, trends.get(category))
+                  for category, salaries in _category_segments(frame)}
+        return cls(states, SalaryState.from_values(frame.salary))
+
+    @classmethod
+    def _sketch_frame(cls, frame: JobFrame, sketch_k: int) -> 'TrendAccumulator':
+        """Build an approximate accumulator from per-category and overall sketches aggregated in parallel."""
+        categories = frame.categories('category')
+        stats = group_salary_stats(frame.codes('category'), frame.salary, sketch_k=sketch_k)
+        states = {}
+        for idx, code in enumerate(stats['group']):
+            count = int(stats['count'][idx])
+            states[categories[code]] = SketchedSalaryState(
+                count, float(stats['mean'][idx]), float(stats['std'][idx]) ** 2 * count, stats['sketch'][idx],
+                summary=format_trend(stats, idx))
+        summary = salary_summary(frame.salary, sketch_k=sketch_k)
+        total = SketchedSalaryState(summary['count'], summary['mean'], summary['std'] ** 2 * summary['count'],
+                                    summary['sketch'])
+        return cls(states, total, sketch_k)
+
+    @property
+    def sketch_k(self) -> Optional[int]:
+        """Sketch accuracy of approximate quantiles, None when quantiles are exact."""
+        return self._sketch_k
+
+    @property
+    def total(self) -> Optional[SalaryState]:
+        """SalaryState over all jobs, or None when empty."""
+        return self._total
+
+    @property
+    def categories(self) -> List[Any]:
+        """Categories with at least one job, in order of first appearance."""
+        return list(self._states)
+
+    def apply(self, added: Optional[JobFrame] = None, removed: Optional[JobFrame] = None) -> 'TrendAccumulator':
+        """
+        Get the accumulator with jobs added and removed.
+
+        Removals are applied first. The accumulator itself is left unchanged,
+        also when a removal fails.
+
+        Args:
+            added: Frame of jobs to add
+            removed: Frame of jobs to remove
+
+        Returns:
+            New TrendAccumulator
+
+        Raises:
+            ValidationError: If a removed job is not present
+        """
+        states = dict(self._states)
+        total = self._total
+
+        if removed is not None and len(removed):
+            for category, salaries in _category_segments(removed):
+                state = states.get(category)
+                if state is None:
+                    raise ValidationError(f"Cannot remove job in unknown category '{category}'")
+                try:
+                    remaining = state.remove(salaries)
+                except ValidationError as e:
+                    raise ValidationError(f"{str(e)} in category '{category}'")
+                if remaining is None:
+                    del states[category]
+                else:
+                    states[category] = remaining
+            total = total.remove(removed.salary)
+
+        if added is not None and len(added):
+            for category, salaries in _category_segments(added):
+                state = states.get(category)
+                states[category] = self._new_state(salaries) if state is None else state.add(salaries)
+            total = self._new_state(added.salary) if total is None else total.add(added.salary)
+
+        return TrendAccumulator(states, total, self._sketch_k)
+
+    def _new_state(self, salaries: np.ndarray) -> SalaryState:
+        """Build the state of a category (or the total) that had no jobs."""
+        if self._sketch_k is not None:
+            return SketchedSalaryState.from_values(salaries, self._sketch_k)
+        return SalaryState.from_values(salaries)
+
+    def trends(self) -> Dict[Any, Dict[str, Any]]:
+        """
+        Get per-category statistics in the format of AIModel.analyze_trends.
+
+        Returns:
+            Dictionary with statistics per category
+        """
+        return {category: state.summary() for category, state in self._states.items()}
+
+    def __len__(self) -> int:
+        return 0 if self._total is None else self._total.count
@@ -1,18 +1,261 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from src.config import Config
+from src.repositories.job_frame import JobFrameBuilder, JobFrameChanges, as_job_frame
 from src.repositories.job_repository import JobRepository
+from src.repositories.snapshot_store import SnapshotStore
+from src.services.aggregation import quantile_sketch_k, salary_summary
 from src.services.ai_model import AIModel
+from src.services.cube import JobCube
+from src.services.forecast import ForecastTable
+from src.services.incremental import TrendAccumulator
 from src.utils.cache import Cache
+from src.utils.cache_backends import MemoryBackend
 from src.utils.logger import setup_logger
-from src.utils.validation import ValidationError
+from src.utils.singleflight import SingleFlight
+from src.utils.validation import ValidationError, validate_job_data, validate_prediction_input
 
 logger = setup_logger(__name__)
 
 class JobService:
+    # Cache key of the job data snapshot and its derived artifacts
+    SNAPSHOT_CACHE_KEY = 'job_snapshot'
+
     def __init__(self):
         self.job_repository = JobRepository()
         self.ai_model = AIModel()
         self.cache = Cache()
+        # Predictions depend only on their input, so they are memoized per process
+        self.prediction_cache = Cache(
+            ttl=Config.PREDICTION_CACHE_TTL,
+            stale_ttl=0,
+            backend=MemoryBackend(Config.PREDICTION_CACHE_TTL, max_entries=Config.PREDICTION_CACHE_MAX_ENTRIES,
+                                  policy='lru')
+        )
+        self._single_flight = SingleFlight()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-refresh')
+        self._refresh_lock = threading.Lock()
+        self._pending_refreshes = set()
+        self._last_snapshot = None
+        self._delta_lock = threading.Lock()
+        # Timer applying recorded deltas to the job frame (see flush_deltas)
+        self._flush_timer = None
+        # Materialized forecasts as (source frame, ForecastTable), built one at a time
+        # on a dedicated worker from the latest requested frame as (frame, future)
+        self._forecasts = None
+        self._pending_forecast = None
+        self._forecast_running = False
+        self._forecast_lock = threading.Lock()
+        self._forecast_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='forecast')
+        
+        # Optional snapshot store shared by the workers on this host, written in order by one thread
+        self.snapshot_store = (SnapshotStore(Config.SNAPSHOT_DIR, Config.SNAPSHOT_KEEP_VERSIONS)
+                               if Config.SNAPSHOT_DIR else None)
+        self._persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='snapshot-store')
+        self._store_lock = threading.Lock()
+        self._store_version = None
+        self._next_store_poll = 0.0
+        # Time the served snapshot was built (or saved, when adopted from the store)
+        self._snapshot_time = 0.0
+        self._warm_start()
         logger.info("JobService initialized")
 
+    def preload(self):
+        """
+        Load job data and its forecasts before a pre-fork server starts workers.
+        
+        Workers forked afterwards share the loaded data copy-on-write instead
+        of each fetching it. Background work scheduled by the load is awaited,
+        so no thread is running or holding a lock when the process forks;
+        call after_fork in every worker.
+        """
+        try:
+            self.ensure_snapshot()
+        except Exception as e:
+            logger.warning(f"Preloading job data failed, workers will load it on demand: {str(e)}")
+            return
+        
+        with self._forecast_lock:
+            pending = self._pending_forecast
+        if pending is not None:
+            try:
+                pending[1].result()
+            except Exception:
+                pass  # already logged by _build_forecasts
+        self._forecast_executor.submit(lambda: None).result()
+        self._persist_executor.submit(lambda: None).result()
+        logger.info("Job data preloaded")
+
+    def after_fork(self):
+        """
+        Reinitialize per-process resources in a worker forked from a preloaded process.
+        
+        Threads do not survive fork and sockets must not be shared between
+        processes, so the thread pools and the job feed connection pool are
+        recreated; cached data is kept.
+        """
+        self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-refresh')
+        self._persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='snapshot-store')
+        self._forecast_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='forecast')
+        self._forecast_running = False
+        self._pending_refreshes.clear()
+        self._flush_timer = None
+        self.job_repository.after_fork()
+
+    def _warm_start(self):
+        """
+        Seed the cache with the current snapshot of the snapshot store, if any.
+        
+        A snapshot older than the cache TTL is cached as stale: the first
+        request is answered from it right away and triggers a fresh fetch in
+        the background.
+        """
+        if self.snapshot_store is None or self.cache.get_with_refresh(self.SNAPSHOT_CACHE_KEY)[0] is not None:
+            return
+        self._adopt_stored_snapshot()
+
+    def _adopt_stored_snapshot(self, version=None, max_age=None, published=None):
+        """
+        Serve a snapshot saved to the snapshot store (possibly by another worker).
+        
+        The job frame is memory-mapped, so every worker serving the same
+        version shares its pages instead of holding its own copy. A version is
+        only adopted when it is newer than the snapshot already served.
+        
+        Args:
+            version: Version to adopt. If None, the current version
+            max_age: Only adopt a version saved less than max_age seconds ago
+            published: Publication time of the entry of another worker this
+                catches up with (see _publish_snapshot), None to publish
+            
+        Returns:
+            The adopted snapshot, or None if there was nothing newer to adopt
+        """
+        saved = self.snapshot_store.load(version)
+        if saved is None:
+            return None
+        
+        age = max(time.time() - saved['timestamp'], 0.0)
+        with self._store_lock:
+            self._store_version = saved['version']
+            if saved['timestamp'] <= self._snapshot_time or (max_age is not None and age >= max_age):
+                return None
+            self._snapshot_time = saved['timestamp']
+        
+        snapshot = self._stored_snapshot(saved)
+        # Keep the saved age so an old snapshot is served as stale and refreshed
+        self._publish_snapshot(snapshot, age=min(age, self.cache.ttl), published=published)
+        logger.info(f"Serving job data snapshot {saved['version']} saved at {saved['saved_at']}")
+        return snapshot
+
+    def _stored_snapshot(self, saved):
+        """Snapshot dictionary of a version loaded from the snapshot store."""
+        frame = saved['jobs']
+        return {
+            'jobs': frame,
+            'metadata': saved['metadata'],
+            'trends': saved['trends'],
+            'statistics': saved['statistics'],
+            'cube': JobCube(frame) if len(frame) else None,
+            'accumulator': None,
+            'changes': None,
+            'base': (saved['version'], []),
+            'deltas': []
+        }
+
+    def _restore_snapshot(self, version, deltas):
+        """
+        Rebuild a snapshot from a version in the snapshot store and the deltas applied to it since.
+        
+        Args:
+            version: Saved version
+            deltas: List of (added, removed) JobFrames in the order they were applied
+            
+        Returns:
+            The snapshot, or None if the version is no longer kept or a delta
+            does not apply to it
+        """
+        saved = self.snapshot_store.load(version)
+        if saved is None:
+            return None
+        with self._store_lock:
+            self._store_version = saved['version']
+        
+        snapshot = self._stored_snapshot(saved)
+        try:
+            for added, removed in deltas:
+                snapshot = self._apply_frames(snapshot, added, removed)
+        except ValidationError as e:
+            logger.warning(f"Replaying deltas on job data snapshot {version} failed: {str(e)}")
+            return None
+        logger.info(f"Serving job data snapshot {version} with {len(deltas)} deltas applied")
+        return snapshot
+
+    def _poll_snapshot_store(self):
+        """Switch to a version another worker made current, checking at most every SNAPSHOT_POLL_INTERVAL seconds."""
+        # With a shared cache its entry names the version to serve (see _publish_snapshot)
+        if self.snapshot_store is None or self.cache.shared:
+            return
+        
+        now = time.monotonic()
+        with self._store_lock:
+            if now < self._next_store_poll:
+                return
+            self._next_store_poll = now + Config.SNAPSHOT_POLL_INTERVAL
+            known = self._store_version
+        
+        version = self.snapshot_store.current_version()
+        if version is not None and version != known:
+            self._adopt_stored_snapshot(version)
+
+    def _persist_snapshot(self, snapshot):
+        """Save a snapshot to the snapshot store in the background."""
+        if self.snapshot_store is None or snapshot['jobs'] is None or len(snapshot['jobs']) == 0:
+            return
+        self._persist_executor.submit(self._save_snapshot, snapshot)
+
+    def _save_snapshot(self, snapshot):
+        """Write a snapshot to the snapshot store on the persistence worker."""
+        try:
+            version = self.snapshot_store.save(snapshot['jobs'], snapshot['metadata'], snapshot['trends'],
+                                               snapshot['statistics'])
+        except Exception as e:
+            logger.warning(f"Saving job data snapshot failed: {str(e)}")
+            return
+        with self._store_lock:
+            self._store_version = version
+        
+        with self._delta_lock:
+            current = self._last_snapshot
+            if current is None or current['jobs'] is not snapshot['jobs']:
+                return
+            # Deltas applied while saving stay in the log, they are not in the saved frame
+            current['base'] = (version, list(current['deltas']))
+            entry, age = self.cache.peek(self.SNAPSHOT_CACHE_KEY)
+            if entry is not None and entry['published'] == current['published']:
+                # Republished so the other workers load the saved version instead of replaying the log
+                self._publish_snapshot(current, age=age)
+
+    def _fetch_job_data(self, job_data_response=None):
+        """
+        Fetch job data from the repository.
+        
+        Args:
+            job_data_response: Repository response fetched by the caller, or
+                None to fetch it now
+        
+        Returns:
+            Tuple of (job data, metadata dictionary)
+        """
+        if job_data_response is None:
+            job_data_response = self.job_repository.fetch_job_data()
+        
+        # Handle both old format (list) and new format (dict with metadata)
+        if isinstance(job_data_response, dict) and 'jobs' in job_data_response:
+            return job_data_response['jobs'], job_data_response.get('metadata', {})
+        return job_data_response, {}
+
     def get_job_trends(self):
         """
         Fetch and process job market trends with caching.
@@ -20,51 +263,543 @@ class JobService:
         Returns:
             Dictionary with job market trends and metadata
         """
-        cache_key = 'job_trends'
+        try:
+            snapshot = self._get_snapshot(jobs=False)
+            if snapshot['trends'] is None:
+                raise ValidationError("Job data cannot be empty")
+            
+            return {
+                'trends': snapshot['trends'],
+                'metadata': snapshot['metadata']
+            }
+            
+        except ValidationError as e:
+            logger.error(f"Validation error: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching job trends: {str(e)}")
+            raise
+
+    def _get_snapshot(self, jobs=True):
+        """
+        Get the current job data snapshot, building it if needed.
         
-        # Try to get from cache first
-        cached_trends = self.cache.get(cache_key)
-        if cached_trends is not None:
-            logger.info("Returning cached job trends")
-            return cached_trends
+        Args:
+            jobs: Whether the job data is needed. If False, the trends,
+                statistics and metadata of a snapshot another worker published
+                to a shared cache are returned from its cache entry without
+                loading the job data
         
-        try:
-            logger.info("Fetching fresh job data")
-            job_data_response = self.job_repository.fetch_job_data()
+        Returns:
+            Dictionary with the job data and every artifact derived from it
+            (or only 'metadata', 'trends' and 'statistics' if jobs is False)
+        """
+        self._poll_snapshot_store()
+        entry = self._get_cached(self.SNAPSHOT_CACHE_KEY, self._build_snapshot)
+        snapshot = self._last_snapshot
+        if snapshot is None or snapshot['published'] < entry['published']:
+            # Published by another worker sharing the cache
+            if not jobs and 'trends' in entry:
+                return entry
+            snapshot = self._single_flight.do('sync:' + self.SNAPSHOT_CACHE_KEY, lambda: self._sync_snapshot(entry))
+        return snapshot
+
+    def _publish_snapshot(self, snapshot, age=0.0, published=None):
+        """
+        Serve a snapshot and mark it current in the cache.
+        
+        The snapshot is held by the service. The cache entry records when it
+        was published and its 'base': the version in the snapshot store and
+        the deltas applied since, from which other workers rebuild it. A
+        shared cache (e.g. the SQLite backend) also gets its metadata, trends
+        and statistics, so other workers serve those without loading the job
+        data. The job data never goes into the entry: the cache TTL, grace
+        window and clearing apply to the snapshot without it counting against
+        CACHE_MAX_BYTES (an entry refused for its size would refetch on every
+        request) or being pickled for every worker.
+        
+        Args:
+            snapshot: Snapshot dictionary (see _build_snapshot)
+            age: Seconds since the snapshot's data was current (see Cache.set)
+            published: Publication time of the entry of another worker the
+                snapshot catches up with; the entry is then left as it is
+        """
+        if published is not None:
+            snapshot['published'] = published
+            self._last_snapshot = snapshot
+            return
+        snapshot['published'] = time.time()
+        self._last_snapshot = snapshot
+        self.cache.set(self.SNAPSHOT_CACHE_KEY, self._snapshot_entry(snapshot, derived=True), age=age)
+        if self.cache.shared and not self.cache.contains(self.SNAPSHOT_CACHE_KEY):
+            # Refused for its size: other workers derive the results from the base instead
+            self.cache.set(self.SNAPSHOT_CACHE_KEY, self._snapshot_entry(snapshot, derived=False), age=age)
+
+    def _snapshot_entry(self, snapshot, derived):
+        """Cache entry of a snapshot (see _publish_snapshot), with its derived results if derived and the cache is shared."""
+        entry = {'published': snapshot['published'], 'base': snapshot['base']}
+        if derived and self.cache.shared:
+            entry.update(metadata=snapshot['metadata'], trends=snapshot['trends'],
+                         statistics=snapshot['statistics'])
+        return entry
+
+    def _sync_snapshot(self, entry):
+        """
+        Catch up with a snapshot another worker published to a shared cache.
+        
+        The snapshot is rebuilt in this process from the entry's base (the
+        saved version is memory-mapped from the snapshot store and the deltas
+        logged since are replayed), or fetched when there is no base. It is
+        served under the other worker's entry instead of publishing a new one,
+        so workers do not keep superseding each other.
+        
+        Args:
+            entry: Cache entry of the other worker's snapshot
             
-            # Handle both old format (list) and new format (dict with metadata)
-            if isinstance(job_data_response, dict) and 'jobs' in job_data_response:
-                job_data = job_data_response['jobs']
-                metadata = job_data_response.get('metadata', {})
+        Returns:
+            Snapshot at least as new as the entry
+        """
+        snapshot = self._last_snapshot
+        if snapshot is not None and snapshot['published'] >= entry['published']:
+            return snapshot
+        
+        base = entry.get('base')
+        if base is not None and self.snapshot_store is not None:
+            snapshot = self._restore_snapshot(*base)
+            if snapshot is not None:
+                self._publish_snapshot(snapshot, published=entry['published'])
+                self._snapshot_time = time.time()
+                return snapshot
+        return self._build_snapshot(published=entry['published'])
+
+    def has_snapshot(self):
+        """
+        Check whether job data can be served without waiting for a fetch.
+        
+        Returns:
+            True if a fresh or stale snapshot is cached (only the entry's
+            timestamp is read, see Cache.contains)
+        """
+        return self.cache.contains(self.SNAPSHOT_CACHE_KEY)
+
+    def ensure_snapshot(self, job_data_response=None):
+        """
+        Fetch job data and build the snapshot unless one is already cached.
+        
+        Args:
+            job_data_response: Repository response already fetched by the
+                caller (e.g. with JobRepository.fetch_job_data_async), or None
+                to fetch it here
+        """
+        if job_data_response is None:
+            self._get_snapshot()
+            return
+        
+        self._poll_snapshot_store()
+        # Coalesced with concurrent builds like a cache miss, but built from the given response
+        self._single_flight.do(self.SNAPSHOT_CACHE_KEY, lambda: self._build_if_needed(
+            self.SNAPSHOT_CACHE_KEY, lambda: self._build_snapshot(job_data_response)))
+
+    def _build_snapshot(self, job_data_response=None, published=None):
+        """
+        Fetch job data once and derive trends, statistics and the job cube from it.
+        
+        All artifacts are cached together under a single key, so they always
+        describe the same fetch and expire together. When the repository
+        returns the very same JobFrame as last time (the feed answered 304 Not
+        Modified), the previous artifacts are reused instead of recomputed.
+        
+        With a snapshot store, a version another worker saved within the
+        cache TTL is adopted instead of fetching again.
+        
+        Args:
+            job_data_response: Repository response already fetched, or None to fetch it
+            published: Publication time of another worker's entry to serve
+                the snapshot under (see _publish_snapshot), None to publish it
+        
+        Returns:
+            Dictionary with 'jobs', 'metadata', 'trends', 'statistics', 'cube',
+            'accumulator' (built here in approximate quantile mode, else by
+            the first delta), 'changes' and 'deltas' (set by deltas, see
+            apply_delta), 'base' and 'published' (see _publish_snapshot)
+        """
+        if self.snapshot_store is not None:
+            version = self.snapshot_store.current_version()
+            if version is not None and version != self._store_version:
+                adopted = self._adopt_stored_snapshot(version, max_age=self.cache.ttl, published=published)
+                if adopted is not None:
+                    return adopted
+        
+        logger.info("Fetching fresh job data")
+        job_data, metadata = self._fetch_job_data(job_data_response)
+        
+        frame = as_job_frame(job_data)
+        previous = self._last_snapshot
+        if (frame is not None and previous is not None and frame is previous['jobs']
+                and previous['changes'] is None):
+            logger.info("Job data unchanged, reusing derived artifacts")
+            snapshot = dict(previous)
+            self._publish_snapshot(snapshot, published=published)
+            self._snapshot_time = time.time()
+            return snapshot
+        
+        if frame is None or len(frame) == 0:
+            if job_data:
+                # Not a list or JobFrame; report why
+                validate_job_data(job_data)
+            trends = None
+            cube = None
+            accumulator = None
+        else:
+            # Validate once at ingestion; the frame is marked and not re-validated downstream
+            validate_job_data(frame)
+            sketch_k = quantile_sketch_k()
+            if sketch_k is not None:
+                # The per-category and overall sketches are kept and merged with later deltas
+                accumulator = TrendAccumulator.from_frame(frame, sketch_k=sketch_k)
+                trends = accumulator.trends()
             else:
-                job_data = job_data_response
-                metadata = {}
-            
-            trends = self.ai_model.analyze_trends(job_data)
+                accumulator = None
+                trends = self.ai_model.analyze_trends(frame)
+            cube = JobCube(frame)
+        
+        snapshot = {
+            'jobs': frame,
+            'metadata': metadata,
+            'trends': trends,
+            'statistics': self._compute_statistics(frame, metadata, accumulator),
+            'cube': cube,
+            'accumulator': accumulator,
+            'changes': None,
+            'base': None,
+            'deltas': []
+        }
+        
+        self._publish_snapshot(snapshot, published=published)
+        self._snapshot_time = time.time()
+        if cube is not None:
+            self._schedule_forecasts(frame)
+            self._persist_snapshot(snapshot)
+        
+        logger.info("Successfully built job data snapshot")
+        return snapshot
+
+    def apply_delta(self, delta):
+        """
+        Apply added and removed jobs to the current snapshot.
+        
+        Trends and statistics are updated from per-category running state and
+        the job cube's cells with moment merges, so their cost is proportional
+        to the number of changed jobs. The running state and cube lookups are
+        prepared on the first delta after a full fetch, the index matching
+        removed jobs on the first removal after every flush. The changed jobs
+        are only recorded against the job frame; the frame is rebuilt, saved
+        and re-forecast by flush_deltas once per Config.DELTA_FLUSH_INTERVAL,
+        however many deltas arrive.
+        
+        Args:
+            delta: Dictionary with optional 'added' and 'removed' job lists
+                (or JobFrames)
             
-            # Add metadata to trends
-            result = {
-                'trends': trends,
-                'metadata': metadata
-            }
+        Returns:
+            Dictionary with the number of jobs added, removed and in total
             
-            # Cache the results
-            self.cache.set(cache_key, result)
+        Raises:
+            ValidationError: If the delta is malformed or removes jobs that
+                are not present
+        """
+        if not isinstance(delta, dict):
+            raise ValidationError("Delta must be a dictionary")
+        
+        frames = {}
+        for key in ('added', 'removed'):
+            jobs = delta.get(key) or []
+            frame = as_job_frame(jobs)
+            if frame is None:
+                raise ValidationError(f"'{key}' must be a list of jobs")
+            if len(frame):
+                try:
+                    validate_job_data(frame)
+                except ValidationError as e:
+                    raise ValidationError(f"'{key}': {str(e)}", e.indices)
+            frames[key] = frame
+        added, removed = frames['added'], frames['removed']
+        
+        try:
+            with self._delta_lock:
+                updated = self._apply_frames(self._get_snapshot(), added, removed)
+                total_jobs = len(updated['accumulator'])
+                self._publish_snapshot(updated)
+                self._snapshot_time = time.time()
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(Config.DELTA_FLUSH_INTERVAL, self.flush_deltas)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
             
-            logger.info("Successfully analyzed job trends")
-            return result
+            logger.info(f"Applied delta: {len(added)} added, {len(removed)} removed, {total_jobs} jobs")
+            return {
+                'added': len(added),
+                'removed': len(removed),
+                'total_jobs': total_jobs
+            }
             
         except ValidationError as e:
             logger.error(f"Validation error: {str(e)}")
             raise
         except Exception as e:
-            logger.error(f"Error fetching job trends: {str(e)}")
+            logger.error(f"Error applying delta: {str(e)}")
             raise
 
+    def _apply_frames(self, snapshot, added, removed):
+        """
+        Derive the snapshot with a delta applied (see apply_delta).
+        
+        With a snapshot store the delta is also logged, so other workers can
+        replay it on the saved version (see _restore_snapshot).
+        
+        Args:
+            snapshot: Current snapshot
+            added: JobFrame of added jobs
+            removed: JobFrame of removed jobs
+            
+        Returns:
+            The updated snapshot, not yet published
+            
+        Raises:
+            ValidationError: If the delta removes jobs that are not present
+        """
+        frame = snapshot['jobs']
+        if frame is None:
+            frame = JobFrameBuilder().build()
+        
+        accumulator = snapshot['accumulator']
+        if accumulator is None:
+            accumulator = TrendAccumulator.from_frame(frame, snapshot['trends'], sketch_k=quantile_sketch_k())
+        accumulator = accumulator.apply(added=added, removed=removed)
+        
+        changes = snapshot['changes']
+        if changes is None:
+            changes = JobFrameChanges(frame)
+        try:
+            changes.record(added=added, removed=removed)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        
+        cube = snapshot['cube']
+        if cube is None and len(added):
+            cube = JobCube(added)
+        elif cube is not None:
+            cube.apply(added=added, removed=removed)
+        
+        base, deltas = snapshot['base'], snapshot['deltas']
+        if self.snapshot_store is not None:
+            deltas = deltas + [(added, removed)]
+            if base is not None:
+                base = (base[0], base[1] + [(added, removed)])
+        
+        total_jobs = len(accumulator)
+        return {
+            'jobs': frame,
+            'metadata': snapshot['metadata'],
+            'trends': accumulator.trends() if total_jobs else None,
+            'statistics': self._compute_statistics(frame, snapshot['metadata'], accumulator),
+            'cube': cube if total_jobs else None,
+            'accumulator': accumulator,
+            'changes': changes,
+            'base': base,
+            'deltas': deltas
+        }
+
+    def flush_deltas(self):
+        """
+        Apply the deltas recorded since the last flush to the job frame.
+        
+        The frame is rebuilt once for the whole batch, then its forecasts are
+        rebuilt and the snapshot is saved to the snapshot store in the
+        background. Called by a timer DELTA_FLUSH_INTERVAL seconds after the
+        first delta of a batch. The snapshot's content does not change, so
+        it is not republished until it is saved (see _save_snapshot).
+        """
+        with self._delta_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            snapshot = self._last_snapshot
+            if (snapshot is None or snapshot['changes'] is None
+                    or not self.cache.contains(self.SNAPSHOT_CACHE_KEY)):
+                return
+            
+            try:
+                frame = snapshot['changes'].apply()
+            except Exception as e:
+                logger.error(f"Error applying deltas to job data: {str(e)}")
+                return
+            # The base keeps describing the snapshot until the new frame is saved
+            updated = dict(snapshot, jobs=frame, changes=None, deltas=[])
+            self._publish_snapshot(updated, published=snapshot['published'])
+        
+        logger.info(f"Flushed deltas: {len(frame)} jobs")
+        if len(frame):
+            self._schedule_forecasts(frame)
+            self._persist_snapshot(updated)
+
+    def _schedule_forecasts(self, frame):
+        """
+        Materialize the forecasts of a job frame on the forecast worker.
+        
+        The worker builds one table at a time and only ever from the latest
+        requested frame: a frame superseded before its build started is
+        skipped, and the callers waiting on it receive the newer table.
+        
+        Args:
+            frame: JobFrame of the current snapshot
+            
+        Returns:
+            Future of the ForecastTable (shared by every call until a build starts)
+        """
+        with self._forecast_lock:
+            pending = self._pending_forecast
+            if pending is not None and pending[0] is frame:
+                return pending[1]
+            if pending is not None and not pending[1].running() and not pending[1].done():
+                future = pending[1]
+            else:
+                future = Future()
+            self._pending_forecast = (frame, future)
+            if not self._forecast_running:
+                self._forecast_running = True
+                self._forecast_executor.submit(self._run_forecasts)
+            return future
+
+    def _run_forecasts(self):
+        """Build forecasts on the forecast worker until no newer frame is pending."""
+        while True:
+            with self._forecast_lock:
+                frame, future = self._pending_forecast
+                if future.running() or future.done():
+                    self._forecast_running = False
+                    return
+                future.set_running_or_notify_cancel()
+            self._build_forecasts(frame, future)
+
+    def _build_forecasts(self, frame, future):
+        """Build the forecast table of a frame, publish it and resolve its future."""
+        try:
+            table = ForecastTable.from_frame(frame)
+        except Exception as e:
+            logger.warning(f"Building forecasts failed: {str(e)}")
+            future.set_exception(e)
+            return
+        
+        with self._forecast_lock:
+            self._forecasts = (frame, table)
+        future.set_result(table)
+
+    def get_forecast(self, category, location=None):
+        """
+        Look up the materialized salary forecast of a category.
+        
+        Forecasts are built in the background whenever the snapshot changes;
+        until the new table is ready the previous one is served. Only the very
+        first lookup in a process waits for a build.
+        
+        Args:
+            category: Job category
+            location: Optional location to narrow the forecast to
+            
+        Returns:
+            Dictionary with the yearly history and the forecast of every model
+            type, or None if there is no forecast (no yearly history)
+        """
+        try:
+            frame = self._get_snapshot()['jobs']
+            if frame is None or len(frame) == 0:
+                return None
+            
+            with self._forecast_lock:
+                published = self._forecasts
+            if published is None or published[0] is not frame:
+                future = self._schedule_forecasts(frame)
+                table = future.result() if published is None else published[1]
+            else:
+                table = published[1]
+            
+            forecast = table.get(category, location)
+            logger.info(f"Forecast lookup for {category}" + (f" in {location}" if location else "")
+                        + (" found" if forecast is not None else " not found"))
+            return forecast
+            
+        except Exception as e:
+            logger.error(f"Error fetching forecast: {str(e)}")
+            raise
+
+    def _get_cached(self, cache_key, builder):
+        """
+        Serve a cached value, rebuilding it when missing or stale.
+        
+        Stale values within the cache grace window (and values due for
+        proactive refresh) are returned immediately while a background worker
+        rebuilds them. Misses are built inline, coalesced across concurrent
+        callers.
+        
+        Args:
+            cache_key: Cache key of the value
+            builder: Callable that computes and caches the value
+            
+        Returns:
+            Cached or freshly built value
+        """
+        value, needs_refresh = self.cache.get_with_refresh(cache_key)
+        if value is not None:
+            if needs_refresh:
+                self._refresh_in_background(cache_key, builder)
+            else:
+                logger.info(f"Returning cached {cache_key}")
+            return value
+        
+        # Coalesce concurrent cache misses into a single build
+        return self._single_flight.do(cache_key, lambda: self._build_if_needed(cache_key, builder))
+
+    def _build_if_needed(self, cache_key, builder):
+        """Run builder unless another call already refreshed the cached value."""
+        value, needs_refresh = self.cache.get_with_refresh(cache_key)
+        if value is not None and not needs_refresh:
+            return value
+        return builder()
+
+    def _refresh_in_background(self, cache_key, builder):
+        """
+        Schedule a background rebuild of a cached value.
+        
+        Args:
+            cache_key: Cache key of the value
+            builder: Callable that computes and caches the value
+        """
+        with self._refresh_lock:
+            if cache_key in self._pending_refreshes:
+                return
+            self._pending_refreshes.add(cache_key)
+        
+        logger.info(f"Serving stale {cache_key}, refreshing in background")
+        self._refresh_executor.submit(self._background_refresh, cache_key, builder)
+
+    def _background_refresh(self, cache_key, builder):
+        """Rebuild a cached value on the refresh worker."""
+        try:
+            self._single_flight.do(cache_key, lambda: self._build_if_needed(cache_key, builder))
+        except Exception as e:
+            logger.warning(f"Background refresh of {cache_key} failed: {str(e)}")
+        finally:
+            with self._refresh_lock:
+                self._pending_refreshes.discard(cache_key)
+
     def predict_job_trends(self, input_data):
         """
         Predict future job trends based on input data.
         
+        Results are memoized by a canonical hash of the model and input, so
+        repeated requests skip the fit.
+        
         Args:
             input_data: Dictionary with prediction parameters
             
@@ -73,7 +808,19 @@ class JobService:
         """
         try:
             logger.info("Processing prediction request")
+            validate_prediction_input(input_data)
+            
+            # Identical inputs (e.g. the dashboard defaults) reuse the memoized result
+            cache_key = self.ai_model.cache_key(input_data)
+            prediction = self.prediction_cache.get(cache_key)
+            if prediction is not None:
+                logger.info("Prediction served from cache")
+                return dict(prediction, predictions=list(prediction['predictions']))
+            
             prediction = self.ai_model.predict(input_data)
+            # A model selection cut short by its budget depends on load, so it is not reused
+            if not prediction.get('budget_exceeded'):
+                self.prediction_cache.set(cache_key, dict(prediction, predictions=tuple(prediction['predictions'])))
             logger.info("Prediction completed successfully")
             return prediction
             
@@ -84,6 +831,32 @@ class JobService:
             logger.error(f"Error predicting job trends: {str(e)}")
             raise
     
+    def predict_job_trends_batch(self, series):
+        """
+        Predict future job trends for many series in one pass.
+        
+        Args:
+            series: List of prediction inputs, each as accepted by predict_job_trends
+            
+        Returns:
+            List of predictions in request order
+        """
+        if not isinstance(series, list) or len(series) == 0:
+            raise ValidationError("'series' must be a non-empty list")
+        if len(series) > Config.PREDICT_BATCH_MAX_SERIES:
+            raise ValidationError(f"At most {Config.PREDICT_BATCH_MAX_SERIES} series can be predicted per request")
+        
+        try:
+            logger.info(f"Processing batch prediction request for {len(series)} series")
+            return self.ai_model.predict_batch(series)
+            
+        except ValidationError as e:
+            logger.error(f"Validation error: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error predicting job trends batch: {str(e)}")
+            raise
+    
     def get_statistics(self):
         """
         Get aggregated statistics from job market data with metadata.
@@ -93,49 +866,118 @@ class JobService:
         """
         try:
             logger.info("Fetching job statistics")
-            job_data_response = self.job_repository.fetch_job_data()
+            return self._get_snapshot(jobs=False)['statistics']
             
-            # Handle both old format (list) and new format (dict with metadata)
-            if isinstance(job_data_response, dict) and 'jobs' in job_data_response:
-                job_data = job_data_response['jobs']
-                metadata = job_data_response.get('metadata', {})
-            else:
-                job_data = job_data_response
-                metadata = {}
-            
-            if not job_data:
-                return {
-                    'total_jobs': 0,
-                    'message': 'No job data available',
-                    'metadata': metadata
-                }
-            
-            # Calculate overall statistics
-            salaries = [job['salary'] for job in job_data]
-            categories = set(job['category'] for job in job_data)
-            
-            import numpy as np
-            stats = {
-                'total_jobs': len(job_data),
-                'total_categories': len(categories),
-                'categories': list(categories),
-                'overall_average_salary': float(np.mean(salaries)),
-                'overall_median_salary': float(np.median(salaries)),
-                'salary_range': {
-                    'min': float(np.min(salaries)),
-                    'max': float(np.max(salaries))
-                },
+        except Exception as e:
+            logger.error(f"Error fetching statistics: {str(e)}")
+            raise
+    
+    def _compute_statistics(self, frame, metadata, accumulator=None):
+        """
+        Compute overall statistics for a job frame.
+        
+        Args:
+            frame: JobFrame (or None when no data is available)
+            metadata: Data source metadata
+            accumulator: Optional TrendAccumulator over the jobs, used instead
+                of the frame (which may not have the latest deltas applied yet)
+            
+        Returns:
+            Dictionary with overall statistics and data sources
+        """
+        if accumulator is not None:
+            total_jobs = len(accumulator)
+        else:
+            total_jobs = 0 if frame is None else len(frame)
+        if total_jobs == 0:
+            return {
+                'total_jobs': 0,
+                'message': 'No job data available',
                 'metadata': metadata
             }
+        
+        # Calculate overall statistics
+        if accumulator is not None:
+            categories = accumulator.categories
+            sketch_k = accumulator.sketch_k
+            summary = accumulator.total.summary()
+            average, median = summary['average_salary'], summary['median_salary']
+            lowest, highest = summary['min_salary'], summary['max_salary']
+            percentiles = summary['salary_percentiles']
+        else:
+            categories = frame.categories('category')
+            sketch_k = quantile_sketch_k()
+            summary = salary_summary(frame.salary, sketch_k=sketch_k)
+            average, median = summary['mean'], summary['median']
+            lowest, highest = summary['min'], summary['max']
+            percentiles = summary['percentiles']
+        
+        stats = {
+            'total_jobs': total_jobs,
+            'total_categories': len(categories),
+            'categories': list(categories),
+            'overall_average_salary': average,
+            'overall_median_salary': median,
+            'salary_range': {
+                'min': lowest,
+                'max': highest
+            },
+            'salary_percentiles': percentiles,
+            'quantile_mode': 'exact' if sketch_k is None else 'approximate',
+            'metadata': metadata
+        }
+        
+        logger.info(f"Statistics calculated for {total_jobs} jobs")
+        return stats
+    
+    def get_aggregates(self, group_by, filters=None):
+        """
+        Get drill-down aggregates served from the materialized job cube.
+        
+        Args:
+            group_by: List of dimensions to group by
+            filters: Optional mapping of dimension to value to slice on
             
-            logger.info(f"Statistics calculated for {len(job_data)} jobs")
-            return stats
+        Returns:
+            Dictionary with aggregated cells and metadata
+        """
+        filters = filters or {}
+        
+        try:
+            snapshot = self._get_snapshot()
+            if snapshot['cube'] is None:
+                raise ValidationError("Job data cannot be empty")
             
+            cells = snapshot['cube'].query(group_by, filters)
+            logger.info(f"Served {len(cells)} aggregate cells grouped by {group_by}")
+            return {
+                'group_by': list(group_by),
+                'filters': dict(filters),
+                'cells': cells,
+                'metadata': snapshot['metadata']
+            }
+            
+        except ValidationError as e:
+            logger.error(f"Validation error: {str(e)}")
+            raise
         except Exception as e:
-            logger.error(f"Error fetching statistics: {str(e)}")
+            logger.error(f"Error fetching aggregates: {str(e)}")
             raise
     
+    def get_cache_stats(self):
+        """
+        Get cache usage and hit/miss/eviction counters.
+        
+        Returns:
+            Dictionary with cache statistics, with those of the prediction
+            cache under 'predictions'
+        """
+        stats = self.cache.stats()
+        stats['predictions'] = self.prediction_cache.stats()
+        return stats
+    
     def clear_cache(self):
         """Clear all cached data."""
         self.cache.clear()
+        self.prediction_cache.clear()
         logger.info("Cache cleared by service")
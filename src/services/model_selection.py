@@ -0,0 +1,134 @@
+"""
+Model selection module.
+Chooses a prediction model by leave-one-out cross-validation of several
+candidates evaluated in parallel under a latency budget.
+"""
+import math
+from concurrent.futures import Executor, wait
+from typing import Any, Callable, Dict, Optional, Tuple
+import numpy as np
+from src.config import Config
+from src.services.regression import PolynomialFit, loo_predictions, r2_score
+from src.utils.executors import get_executor
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def evaluate_polynomial(years: np.ndarray, salaries: np.ndarray, future_years: np.ndarray,
+                        degree: int) -> Optional[Tuple[np.ndarray, float]]:
+    """
+    Evaluate a least-squares polynomial candidate.
+
+    Args:
+        years: Training years
+        salaries: Salaries aligned with years
+        future_years: Years to predict
+        degree: Polynomial degree (1 for a linear fit)
+
+    Returns:
+        Tuple of (predictions from the fit on all points, leave-one-out R²),
+        or None when the candidate cannot be cross-validated
+    """
+    held_out = loo_predictions(years, salaries, degree)
+    if held_out is None:
+        return None
+    fit = PolynomialFit.fit(years, salaries, degree)
+    return fit.predict(future_years), r2_score(salaries, held_out)
+
+
+def evaluate_estimator(years: np.ndarray, salaries: np.ndarray, future_years: np.ndarray,
+                       create_estimator: Callable[[], Any]) -> Optional[Tuple[np.ndarray, float]]:
+    """
+    Evaluate a scikit-learn estimator candidate by refitting without each point.
+
+    Args:
+        years: Training years
+        salaries: Salaries aligned with years
+        future_years: Years to predict
+        create_estimator: Returns a new, unfitted estimator
+
+    Returns:
+        Tuple of (predictions from the fit on all points, leave-one-out R²),
+        or None with fewer than two points
+    """
+    if years.size < 2:
+        return None
+
+    X = years.reshape(-1, 1)
+    held_out = np.empty(years.size)
+    for idx in range(years.size):
+        keep = np.arange(years.size) != idx
+        held_out[idx] = create_estimator().fit(X[keep], salaries[keep]).predict(X[idx:idx + 1])[0]
+
+    model = create_estimator().fit(X, salaries)
+    return model.predict(future_years.reshape(-1, 1)), r2_score(salaries, held_out)
+
+
+def select_model(years: np.ndarray, salaries: np.ndarray, future_years: np.ndarray,
+                 create_tree: Callable[[], Any], max_degree: int = None, budget: float = None,
+                 workers: int = None, executor: Optional[Executor] = None) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Pick the candidate with the best leave-one-out R² and predict with it.
+
+    Candidates are the linear fit, polynomials of degree 2 to max_degree and
+    a decision tree. They are evaluated concurrently; candidates still running
+    when the budget runs out are dropped, so a selection cut short by the
+    budget depends on load and is reported as incomplete. Ties go to the
+    simpler candidate.
+
+    Args:
+        years: Training years
+        salaries: Salaries aligned with years
+        future_years: Years to predict
+        create_tree: Returns a new, unfitted decision tree estimator
+        max_degree: Highest polynomial degree. If None, uses Config.AUTO_MAX_DEGREE
+        budget: Seconds to wait for candidates (math.inf to wait for all of
+            them). If None, uses Config.AUTO_MODEL_BUDGET
+        workers: Evaluation threads of the shared pool. If None, uses
+            Config.AUTO_MODEL_WORKERS
+        executor: Pool to evaluate on instead of the shared one (e.g. for
+            offline work that must not starve interactive requests)
+
+    Returns:
+        Tuple of (dictionary with the selected 'model_type' and 'degree' (None
+        for the tree), its 'predictions' and held-out 'score', or None if no
+        candidate could be cross-validated in time; whether every candidate
+        was evaluated within the budget)
+    """
+    max_degree = max_degree or Config.AUTO_MAX_DEGREE
+    budget = Config.AUTO_MODEL_BUDGET if budget is None else budget
+    workers = workers or Config.AUTO_MODEL_WORKERS
+
+    executor = executor or get_executor('model-selection', workers)
+    candidates = [
+        ('linear' if degree == 1 else 'polynomial', degree,
+         executor.submit(evaluate_polynomial, years, salaries, future_years, degree))
+        for degree in range(1, max_degree + 1)
+    ]
+    candidates.append(('decision_tree', None, executor.submit(evaluate_estimator, years, salaries, future_years,
+                                                              create_tree)))
+
+    done, pending = wait([future for _, _, future in candidates], timeout=None if math.isinf(budget) else budget)
+    for future in pending:
+        future.cancel()
+    if pending:
+        logger.warning(f"Model selection budget of {budget}s exceeded, dropped {len(pending)} candidates")
+
+    best = None
+    for model_type, degree, future in candidates:
+        if future not in done:
+            continue
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning(f"Evaluating {model_type} candidate failed: {str(e)}")
+            continue
+        if result is None or np.isnan(result[1]):
+            continue
+        if best is None or result[1] > best['score']:
+            best = {'model_type': model_type, 'degree': degree, 'predictions': result[0], 'score': result[1]}
+
+    if best is not None:
+        logger.debug(f"Selected {best['model_type']} (degree {best['degree']}) with held-out R² {best['score']:.3f}")
+    return best, not pending
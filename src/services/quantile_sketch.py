@@ -0,0 +1,305 @@
+"""
+Quantile sketch module.
+Provides a mergeable KLL-style sketch for approximate salary quantiles.
+"""
+from typing import Iterable, List, Optional, Sequence
+import numpy as np
+
+# Smallest capacity of any compactor level
+_MIN_CAPACITY = 2
+
+# Capacity decay between consecutive levels, from the top level down
+_CAPACITY_DECAY = 2.0 / 3.0
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (KLL).
+
+    Values are kept in a hierarchy of compactors: an item at level h stands
+    for 2**h original values. When a level outgrows its capacity it is sorted
+    and every other item (alternating the starting offset between compactions
+    to cancel bias) is promoted to the next level. The top level has capacity
+    k and lower levels shrink geometrically, so the sketch holds O(k) items and
+    the rank error is roughly 1.7 / k of the count, independent of how many
+    values were added. Sketches with the same k merge by concatenating levels
+    and compacting, which makes them suitable for sharded or incremental data.
+
+    Sketches cannot delete values. Removals are summarized by a second sketch
+    of the removed values whose weight is subtracted from the ranks (see
+    batch_quantiles); the rank error then grows with the removed count.
+    """
+
+    def __init__(self, k: int = 200):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            k: Accuracy parameter; larger values give more accurate quantiles
+                and a larger sketch
+        """
+        if k < _MIN_CAPACITY:
+            raise ValueError(f"Sketch accuracy k must be at least {_MIN_CAPACITY}")
+        self.k = k
+        self.count = 0
+        self.min = np.nan
+        self.max = np.nan
+        self._levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._offsets: List[int] = [0]
+
+    @classmethod
+    def from_values(cls, values: Iterable[float], k: int = 200) -> 'KLLSketch':
+        """
+        Build a sketch from a batch of values.
+
+        Args:
+            values: Values to add
+            k: Accuracy parameter
+
+        Returns:
+            KLLSketch summarizing values
+        """
+        sketch = cls(k)
+        sketch.update(values)
+        return sketch
+
+    @classmethod
+    def from_segments(cls, values: np.ndarray, starts: np.ndarray, counts: np.ndarray,
+                      k: int = 200) -> List['KLLSketch']:
+        """
+        Build one sketch per contiguous segment of values.
+
+        Segments of at most k values fit the bottom level as they are, so
+        they are copied without sorting or compacting; only larger segments
+        go through update.
+
+        Args:
+            values: Values, with every segment contiguous (no NaN)
+            starts: Start offset of every segment
+            counts: Length of every segment (at least 1)
+            k: Accuracy parameter
+
+        Returns:
+            List of KLLSketch aligned with the segments
+        """
+        if starts.size == 0:
+            return []
+        minimums = np.minimum.reduceat(values, starts)
+        maximums = np.maximum.reduceat(values, starts)
+        sketches = []
+        for start, count, lowest, highest in zip(starts.tolist(), counts.tolist(), minimums.tolist(),
+                                                 maximums.tolist()):
+            if count > k:
+                sketches.append(cls.from_values(values[start:start + count], k))
+                continue
+            sketch = cls(k)
+            sketch.count = count
+            sketch.min = lowest
+            sketch.max = highest
+            sketch._levels[0] = values[start:start + count].copy()
+            sketches.append(sketch)
+        return sketches
+
+    def update(self, values: Iterable[float]) -> None:
+        """
+        Add a batch of values.
+
+        Args:
+            values: Values to add (NaN values are ignored)
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+
+        self.count += values.size
+        self.min = np.nanmin([self.min, values.min()])
+        self.max = np.nanmax([self.max, values.max()])
+        self._levels[0] = np.concatenate((self._levels[0], values))
+        self._compress()
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """
+        Merge another sketch into a new sketch.
+
+        Args:
+            other: Sketch with the same accuracy parameter
+
+        Returns:
+            New KLLSketch summarizing the values of both sketches
+
+        Raises:
+            ValueError: If the sketches have different accuracy parameters
+        """
+        if other.k != self.k:
+            raise ValueError("Cannot merge sketches with different accuracy parameters")
+
+        merged = KLLSketch(self.k)
+        merged.count = self.count + other.count
+        merged.min = np.nanmin([self.min, other.min]) if merged.count else np.nan
+        merged.max = np.nanmax([self.max, other.max]) if merged.count else np.nan
+        height = max(len(self._levels), len(other._levels))
+        merged._levels = [
+            np.concatenate((self._level(h), other._level(h))) for h in range(height)
+        ]
+        merged._offsets = [
+            (self._offsets[h] if h < len(self._offsets) else 0) ^ (other._offsets[h] if h < len(other._offsets) else 0)
+            for h in range(height)
+        ]
+        merged._compress()
+        return merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a single quantile.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        result = self.quantiles([q])
+        return None if result is None else float(result[0])
+
+    def quantiles(self, qs: Iterable[float], removed: Optional['KLLSketch'] = None) -> Optional[np.ndarray]:
+        """
+        Estimate several quantiles in one pass over the sketch.
+
+        q = 0 and q = 1 return the exact minimum and maximum unless removed
+        values reach them.
+
+        Args:
+            qs: Quantiles in [0, 1]
+            removed: Sketch of values added to this sketch and since removed
+
+        Returns:
+            Array of estimated values aligned with qs, or None if no values remain
+        """
+        qs = _check_quantiles(qs)
+        if self.count - (0 if removed is None else removed.count) <= 0:
+            return None
+
+        result = batch_quantiles([self], qs, [removed])[0]
+        if removed is None or removed.count == 0 or removed.min > self.min:
+            result[qs == 0] = self.min
+        if removed is None or removed.count == 0 or removed.max < self.max:
+            result[qs == 1] = self.max
+        return result
+
+    @property
+    def size(self) -> int:
+        """Number of items retained by the sketch."""
+        return sum(level.size for level in self._levels)
+
+    def _level(self, height: int) -> np.ndarray:
+        """Items at a level (empty above the top)."""
+        return self._levels[height] if height < len(self._levels) else np.empty(0, dtype=np.float64)
+
+    def _capacity(self, height: int) -> int:
+        """Capacity of a level given the current number of levels."""
+        depth = len(self._levels) - 1 - height
+        return max(_MIN_CAPACITY, int(np.ceil(self.k * _CAPACITY_DECAY ** depth)))
+
+    def _compress(self) -> None:
+        """Compact levels, bottom up, until each fits its capacity."""
+        height = 0
+        while height < len(self._levels):
+            level = self._levels[height]
+            if level.size > self._capacity(height):
+                if height + 1 == len(self._levels):
+                    self._levels.append(np.empty(0, dtype=np.float64))
+                    self._offsets.append(0)
+
+                # An odd item out stays behind so the retained weight is exact
+                level = np.sort(level)
+                keep = level[:level.size % 2]
+                pairs = level[level.size % 2:]
+                offset = self._offsets[height]
+                self._offsets[height] ^= 1
+                self._levels[height + 1] = np.concatenate((self._levels[height + 1], pairs[offset::2]))
+                self._levels[height] = keep
+            height += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return f"KLLSketch(k={self.k}, count={self.count}, size={self.size})"
+
+
+def _check_quantiles(qs: Iterable[float]) -> np.ndarray:
+    """Convert quantiles to an array, checking they are in [0, 1]."""
+    qs = np.asarray(list(qs), dtype=np.float64)
+    if np.any((qs < 0) | (qs > 1)):
+        raise ValueError("Quantiles must be between 0 and 1")
+    return qs
+
+
+def batch_quantiles(sketches: Sequence[KLLSketch], qs: Iterable[float],
+                    removed: Optional[Sequence[Optional[KLLSketch]]] = None) -> np.ndarray:
+    """
+    Estimate the same quantiles of many sketches in a constant number of array passes.
+
+    The retained items of all sketches are sorted by (sketch, value) at once
+    and weighted by the number of values they stand for. The estimate of q
+    is the first item whose weighted rank within its sketch covers q of the
+    sketch's weight. Items of a removed-values sketch count negatively, and
+    ranks are clamped to be non-decreasing.
+
+    Args:
+        sketches: Sketches with at least one remaining value each
+        qs: Quantiles in [0, 1]
+        removed: Optional sketch (or None) per sketch, of values added to it
+            and since removed
+
+    Returns:
+        Array of shape (len(sketches), len(qs)) of estimated values
+    """
+    qs = _check_quantiles(qs)
+    if removed is None:
+        removed = [None] * len(sketches)
+    if not len(sketches):
+        return np.empty((0, qs.size))
+
+    levels, weights, owners = [], [], []
+    for owner, (sketch, minus) in enumerate(zip(sketches, removed)):
+        # Removed items go first so that they cancel equal added items before those count
+        for sign, source in ((-1.0, minus), (1.0, sketch)):
+            if source is None:
+                continue
+            for height, level in enumerate(source._levels):
+                if level.size:
+                    levels.append(level)
+                    weights.append(sign * 2 ** height)
+                    owners.append(owner)
+    sizes = [level.size for level in levels]
+    items = np.concatenate(levels)
+    item_weights = np.repeat(np.array(weights), sizes)
+    item_owners = np.repeat(np.array(owners, dtype=np.int64), sizes)
+
+    # Order by (owner, value): stable sort by value, then by owner
+    by_value = np.argsort(items, kind='stable')
+    order = by_value[np.argsort(item_owners[by_value], kind='stable')]
+    items, item_weights, item_owners = items[order], item_weights[order], item_owners[order]
+
+    count = len(sketches)
+    starts = np.searchsorted(item_owners, np.arange(count), side='left')
+    ends = np.searchsorted(item_owners, np.arange(count), side='right')
+    totals = np.bincount(item_owners, weights=item_weights, minlength=count)
+    offsets = np.concatenate(([0.0], np.cumsum(totals)[:-1]))
+
+    # Rank within the sketch, clamped to [0, total] and shifted past the
+    # previous sketches, so that the running maximum is globally sorted
+    cumulative = np.cumsum(item_weights)
+    before = cumulative[starts] - item_weights[starts]
+    local = np.clip(cumulative - before[item_owners], 0.0, totals[item_owners])
+    ranks = np.maximum.accumulate(local + offsets[item_owners])
+
+    targets = offsets[:, np.newaxis] + qs[np.newaxis, :] * totals[:, np.newaxis]
+    # q = 0 takes the first item with a positive rank, any other q the first covering it
+    positions = np.where(qs == 0,
+                         np.searchsorted(ranks, targets, side='right'),
+                         np.searchsorted(ranks, targets, side='left'))
+    positions = np.clip(positions, starts[:, np.newaxis], ends[:, np.newaxis] - 1)
+    return items[positions]
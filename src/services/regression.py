@@ -0,0 +1,206 @@
+"""
+Regression module.
+Provides closed-form least-squares polynomial fits for salary predictions.
+"""
+from collections import defaultdict
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+
+def r2_scores(y: np.ndarray, fitted: np.ndarray) -> np.ndarray:
+    """
+    Coefficients of determination along the last axis, as scikit-learn's ``score``.
+
+    Args:
+        y: Observed values, one series per row
+        fitted: Fitted values aligned with y
+
+    Returns:
+        R² score per series; for constant y, 1.0 if the fit is perfect and 0.0 otherwise
+    """
+    ss_res = np.sum((y - fitted) ** 2, axis=-1)
+    ss_tot = np.sum((y - np.mean(y, axis=-1, keepdims=True)) ** 2, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = 1.0 - ss_res / ss_tot
+    return np.where(ss_tot == 0, np.where(ss_res == 0, 1.0, 0.0), scores)
+
+
+def r2_score(y: np.ndarray, fitted: np.ndarray) -> float:
+    """
+    Coefficient of determination, as computed by scikit-learn's ``score``.
+
+    Args:
+        y: Observed values
+        fitted: Fitted values
+
+    Returns:
+        R² score; for constant y, 1.0 if the fit is perfect and 0.0 otherwise
+    """
+    return float(r2_scores(y, fitted))
+
+
+def _vander(years: np.ndarray, degree: int) -> np.ndarray:
+    """Vandermonde matrices (increasing powers) for every row of centered years."""
+    return years[..., np.newaxis] ** np.arange(degree + 1)
+
+
+def fit_polynomial_batch(years: Sequence[Sequence[float]], salaries: Sequence[Sequence[float]],
+                         future_years: Sequence[Sequence[float]],
+                         degree: int) -> List[Optional[Tuple[np.ndarray, float]]]:
+    """
+    Fit and evaluate many least-squares polynomials in vectorized passes.
+
+    Series with the same number of training and future years are stacked
+    into one (series, points, degree + 1) array of centered Vandermonde
+    matrices and solved together through a batched SVD.
+
+    Args:
+        years: Training years per series
+        salaries: Salaries per series, aligned with years
+        future_years: Years to predict per series
+        degree: Polynomial degree (1 for linear fits)
+
+    Returns:
+        Per series, in input order: tuple of (predictions, R² on the training
+        data), or None when the series is rank deficient (fewer distinct years
+        than coefficients) and needs another solver
+    """
+    results: List[Optional[Tuple[np.ndarray, float]]] = [None] * len(years)
+    shapes = defaultdict(list)
+    for idx in range(len(years)):
+        shapes[(len(years[idx]), len(future_years[idx]))].append(idx)
+
+    for indices in shapes.values():
+        x = np.array([years[idx] for idx in indices], dtype=np.float64)
+        y = np.array([salaries[idx] for idx in indices], dtype=np.float64)
+        future = np.array([future_years[idx] for idx in indices], dtype=np.float64)
+
+        centers = np.mean(x, axis=1, keepdims=True)
+        design = _vander(x - centers, degree)
+
+        # One batched SVD gives both the pseudo-inverse solution and the rank
+        u, singular, vt = np.linalg.svd(design, full_matrices=False)
+        tolerance = singular[:, :1] * max(design.shape[1:]) * np.finfo(np.float64).eps
+        full_rank = np.sum(singular > tolerance, axis=1) == degree + 1
+        with np.errstate(divide='ignore'):
+            inverse = np.where(singular > tolerance, 1.0 / singular, 0.0)
+        projected = (np.swapaxes(u, 1, 2) @ y[..., np.newaxis]) * inverse[..., np.newaxis]
+        coefficients = np.swapaxes(vt, 1, 2) @ projected
+
+        fitted = (design @ coefficients)[..., 0]
+        predictions = (_vander(future - centers, degree) @ coefficients)[..., 0]
+        scores = r2_scores(y, fitted)
+
+        for row, idx in enumerate(indices):
+            if full_rank[row]:
+                results[idx] = (predictions[row], float(scores[row]))
+
+    return results
+
+
+def loo_predictions(years: np.ndarray, salaries: np.ndarray, degree: int) -> Optional[np.ndarray]:
+    """
+    Leave-one-out predictions of a least-squares polynomial in closed form.
+
+    With the hat matrix H = X (X^T X)^-1 X^T, the residual of point i under
+    the fit without it is e_i / (1 - h_ii) (the PRESS residual), so all n
+    refits cost a single SVD.
+
+    Args:
+        years: Training years
+        salaries: Salaries aligned with years
+        degree: Polynomial degree (1 for a linear fit)
+
+    Returns:
+        Prediction for every point from the fit without it, or None when the
+        fit is rank deficient or some point has leverage 1 (the fit without
+        it is rank deficient)
+    """
+    years = np.asarray(years, dtype=np.float64)
+    salaries = np.asarray(salaries, dtype=np.float64)
+    design = _vander(years - np.mean(years), degree)
+
+    u, singular, vt = np.linalg.svd(design, full_matrices=False)
+    if np.sum(singular > singular[0] * max(design.shape) * np.finfo(np.float64).eps) < degree + 1:
+        return None
+
+    residuals = salaries - u @ (u.T @ salaries)
+    leverage = np.sum(u ** 2, axis=1)
+    if np.any(np.isclose(leverage, 1.0)):
+        return None
+    return salaries - residuals / (1.0 - leverage)
+
+
+class PolynomialFit:
+    """
+    Least-squares polynomial fit of salaries over years.
+
+    Years are centered on their mean before building the Vandermonde matrix,
+    which keeps it well conditioned for calendar years (2020**2 and up would
+    otherwise dominate the columns).
+    """
+
+    __slots__ = ('center', 'coefficients')
+
+    def __init__(self, center: float, coefficients: np.ndarray):
+        """
+        Initialize fit.
+
+        Args:
+            center: Mean of the training years
+            coefficients: Polynomial coefficients in increasing degree
+        """
+        self.center = center
+        self.coefficients = coefficients
+
+    @classmethod
+    def fit(cls, years: np.ndarray, salaries: np.ndarray, degree: int) -> Optional['PolynomialFit']:
+        """
+        Fit a polynomial by least squares on the Vandermonde matrix.
+
+        Args:
+            years: Training years
+            salaries: Salaries aligned with years
+            degree: Polynomial degree (1 for a linear fit)
+
+        Returns:
+            PolynomialFit, or None when the system is rank deficient (fewer
+            distinct years than coefficients) and has no unique solution
+        """
+        years = np.asarray(years, dtype=np.float64)
+        center = float(np.mean(years))
+        coefficients, _, rank, _ = np.linalg.lstsq(cls._design(years, center, degree),
+                                                   np.asarray(salaries, dtype=np.float64), rcond=None)
+        if rank < degree + 1:
+            return None
+        return cls(center, coefficients)
+
+    @staticmethod
+    def _design(years: np.ndarray, center: float, degree: int) -> np.ndarray:
+        """Vandermonde matrix of centered years in increasing powers."""
+        return np.vander(np.asarray(years, dtype=np.float64) - center, degree + 1, increasing=True)
+
+    def predict(self, years: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the fitted polynomial.
+
+        Args:
+            years: Years to predict
+
+        Returns:
+            Predicted salaries
+        """
+        return self._design(years, self.center, self.coefficients.size - 1) @ self.coefficients
+
+    def score(self, years: np.ndarray, salaries: np.ndarray) -> float:
+        """
+        R² of the fit on the given data.
+
+        Args:
+            years: Years
+            salaries: Observed salaries
+
+        Returns:
+            R² score (see r2_score)
+        """
+        return r2_score(np.asarray(salaries, dtype=np.float64), self.predict(years))
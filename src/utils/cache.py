@@ -1,79 +1,235 @@
 """
 Caching utility module.
-Provides simple in-memory caching with TTL support.
+Provides bounded, thread-safe caching with TTL and stale-while-revalidate support
+over pluggable storage backends.
 """
+import threading
 import time
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
 from src.config import Config
+from src.utils.cache_backends import CacheBackend, create_backend
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 class Cache:
-    """Simple in-memory cache with TTL support."""
-    
-    def __init__(self, ttl: int = None):
+    """Bounded, thread-safe cache with TTL and stale-while-revalidate support."""
+
+    def __init__(self, ttl: int = None, stale_ttl: int = None, refresh_ahead: float = None,
+                 max_entries: int = None, max_bytes: int = None, policy: str = None,
+                 sweep_interval: int = None, backend: CacheBackend = None):
         """
         Initialize cache.
-        
+
         Args:
             ttl: Time-to-live in seconds. If None, uses Config.CACHE_TTL
+            stale_ttl: Grace window in seconds after expiry during which an entry
+                can still be served as stale. If None, uses Config.CACHE_STALE_TTL
+            refresh_ahead: Fraction of the TTL after which a fresh entry is due
+                for proactive refresh (0 disables). If None, uses Config.CACHE_REFRESH_AHEAD
+            max_entries: Maximum number of entries (0 for unbounded). If None,
+                uses Config.CACHE_MAX_ENTRIES
+            max_bytes: Maximum approximate size of all entries in bytes (0 for
+                unbounded). If None, uses Config.CACHE_MAX_BYTES
+            policy: Eviction policy, one of 'lru', 'lfu' or 'ttl'. If None,
+                uses Config.CACHE_EVICTION_POLICY
+            sweep_interval: Seconds between sweeps of expired entries. If None,
+                uses Config.CACHE_SWEEP_INTERVAL
+            backend: Storage backend. If None, one is created from
+                Config.CACHE_BACKEND with the limits above
         """
-        self._cache = {}
         self._ttl = ttl or Config.CACHE_TTL
+        self._stale_ttl = Config.CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+        self._refresh_ahead = Config.CACHE_REFRESH_AHEAD if refresh_ahead is None else refresh_ahead
+        self._sweep_interval = Config.CACHE_SWEEP_INTERVAL if sweep_interval is None else sweep_interval
         self._enabled = Config.CACHE_ENABLED
-    
+
+        if backend is None:
+            backend = create_backend(
+                Config.CACHE_BACKEND,
+                expire_after=self._ttl + self._stale_ttl,
+                max_entries=Config.CACHE_MAX_ENTRIES if max_entries is None else max_entries,
+                max_bytes=Config.CACHE_MAX_BYTES if max_bytes is None else max_bytes,
+                policy=policy or Config.CACHE_EVICTION_POLICY
+            )
+        self._backend = backend
+
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+        self._counters = {'hits': 0, 'stale_hits': 0, 'misses': 0}
+
+    @property
+    def ttl(self) -> int:
+        """Time-to-live of entries in seconds."""
+        return self._ttl
+
+    @property
+    def shared(self) -> bool:
+        """Whether entries are shared with other processes (e.g. the SQLite backend)."""
+        return self._backend.shared
+
+    def _count(self, counter: str) -> None:
+        """Increment a lookup counter."""
+        with self._lock:
+            self._counters[counter] += 1
+
     def get(self, key: str) -> Optional[Any]:
         """
         Retrieve value from cache.
-        
+
         Args:
             key: Cache key
-            
+
         Returns:
             Cached value if exists and not expired, None otherwise
         """
-        if not self._enabled:
-            return None
-            
-        if key in self._cache:
-            value, timestamp = self._cache[key]
-            if time.time() - timestamp < self._ttl:
-                logger.debug(f"Cache hit for key: {key}")
-                return value
-            else:
-                logger.debug(f"Cache expired for key: {key}")
-                del self._cache[key]
-        
+        value, age = self._lookup(key)
+        if value is not None and age < self._ttl:
+            self._count('hits')
+            logger.debug(f"Cache hit for key: {key}")
+            return value
+
+        self._count('misses')
         logger.debug(f"Cache miss for key: {key}")
         return None
-    
-    def set(self, key: str, value: Any) -> None:
+
+    def get_with_refresh(self, key: str) -> Tuple[Optional[Any], bool]:
+        """
+        Retrieve value from cache, including stale values within the grace window.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value or None, whether the entry is stale or due for
+            proactive refresh)
+        """
+        value, age = self._lookup(key)
+        if value is None:
+            self._count('misses')
+            logger.debug(f"Cache miss for key: {key}")
+            return None, False
+
+        if age >= self._ttl:
+            self._count('stale_hits')
+            logger.debug(f"Serving stale value for key: {key}")
+            return value, True
+
+        self._count('hits')
+        refresh_due = self._refresh_ahead > 0 and age >= self._ttl * self._refresh_ahead
+        logger.debug(f"Cache hit for key: {key}")
+        return value, refresh_due
+
+    def contains(self, key: str) -> bool:
+        """
+        Check for a fresh or stale value without counting a lookup.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if get_with_refresh would return a value
+        """
+        # Only the timestamp is read, so a large value is not unpickled just to check for it
+        return self._enabled and self._backend.timestamp(key) is not None
+
+    def peek(self, key: str) -> Tuple[Optional[Any], float]:
+        """
+        Retrieve a fresh or stale value without counting a lookup.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value or None, age in seconds)
         """
-        Store value in cache.
-        
+        return self._lookup(key)
+
+    def _lookup(self, key: str) -> Tuple[Optional[Any], float]:
+        """
+        Look up an entry that is fresh or within the grace window.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value or None, age in seconds)
+        """
+        if not self._enabled:
+            return None, 0.0
+
+        entry = self._backend.get(key)
+        if entry is None:
+            return None, 0.0
+
+        value, timestamp = entry
+        return value, time.time() - timestamp
+
+    def set(self, key: str, value: Any, age: float = 0.0) -> None:
+        """
+        Store value in cache, evicting entries if limits are exceeded.
+
         Args:
             key: Cache key
             value: Value to cache
+            age: Seconds since the value was computed; a value at least ttl
+                old is only served within the grace window and refreshed on
+                first access
         """
         if not self._enabled:
             return
-            
-        self._cache[key] = (value, time.time())
+
+        if time.time() - self._last_sweep >= self._sweep_interval:
+            self.sweep()
+
+        self._backend.set(key, value, time.time() - age)
         logger.debug(f"Cached value for key: {key}")
-    
+
+    def sweep(self) -> int:
+        """
+        Remove all entries past their TTL and grace window.
+
+        Returns:
+            Number of entries removed
+        """
+        self._last_sweep = time.time()
+        removed = self._backend.sweep()
+        if removed:
+            logger.debug(f"Swept {removed} expired cache entries")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters and usage.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters, entry count, size and limits
+        """
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['hits'] + counters['stale_hits'] + counters['misses']
+        return {
+            **counters,
+            **self._backend.usage(),
+            'hit_rate': (counters['hits'] + counters['stale_hits']) / lookups if lookups else 0.0,
+            'max_entries': self._backend.max_entries,
+            'max_bytes': self._backend.max_bytes,
+            'policy': self._backend.policy,
+            'backend': type(self._backend).__name__,
+            'enabled': self._enabled
+        }
+
     def clear(self) -> None:
-        """Clear all cache entries."""
-        self._cache.clear()
+        """Clear all cache entries (for every worker when the backend is shared)."""
+        self._backend.clear()
         logger.info("Cache cleared")
-    
+
     def delete(self, key: str) -> None:
         """
         Delete specific cache entry.
-        
+
         Args:
             key: Cache key to delete
         """
-        if key in self._cache:
-            del self._cache[key]
-            logger.debug(f"Deleted cache entry for key: {key}")
+        self._backend.delete(key)
+        logger.debug(f"Deleted cache entry for key: {key}")
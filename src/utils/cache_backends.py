@@ -0,0 +1,497 @@
+"""
+Cache backend module.
+Provides storage backends for Cache: a bounded in-process store and a
+SQLite store shared by every worker process on the host.
+"""
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, Iterable, Optional, Tuple
+import numpy as np
+from src.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Supported eviction policies
+EVICTION_POLICIES = ('lru', 'lfu', 'ttl')
+
+# Seconds between writes of batched SQLite hit bookkeeping
+ACCESS_FLUSH_INTERVAL = 1.0
+
+# Items measured of a large container; the rest are assumed to be alike
+SIZE_SAMPLE_ITEMS = 100
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a value in bytes.
+
+    NumPy arrays report their buffer size; containers and plain objects
+    (including ones with ``__slots__``) are walked recursively. Containers
+    of more than SIZE_SAMPLE_ITEMS items are extrapolated from their first
+    items, so the estimate costs the same for every large snapshot.
+
+    Args:
+        value: Value to measure
+
+    Returns:
+        Approximate size in bytes
+    """
+    seen = set()
+
+    def _sum_sizes(sizes: Iterable[int], count: int) -> int:
+        if count <= SIZE_SAMPLE_ITEMS:
+            return sum(sizes)
+        return sum(islice(sizes, SIZE_SAMPLE_ITEMS)) * count // SIZE_SAMPLE_ITEMS
+
+    def _size(obj: Any) -> int:
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+
+        if isinstance(obj, np.ndarray):
+            return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+
+        size = sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+            return size
+        if isinstance(obj, dict):
+            return size + _sum_sizes((_size(key) + _size(item) for key, item in obj.items()), len(obj))
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            return size + _sum_sizes((_size(item) for item in obj), len(obj))
+        if hasattr(obj, '__dict__'):
+            size += _size(vars(obj))
+        slots = getattr(type(obj), '__slots__', ())
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            size += _size(getattr(obj, slot, None))
+        return size
+
+    return _size(value)
+
+class CacheBackend:
+    """
+    Storage interface behind Cache.
+
+    Backends store (value, timestamp) pairs, drop entries older than
+    ``expire_after`` seconds and enforce their own size limits. TTL and
+    stale-while-revalidate decisions stay in Cache.
+    """
+
+    # Whether other processes see the entries (see Cache.shared)
+    shared = False
+
+    def __init__(self, expire_after: float, max_entries: int = 0, max_bytes: int = 0, policy: str = 'lru'):
+        """
+        Initialize backend limits.
+
+        Args:
+            expire_after: Age in seconds after which an entry is dropped
+            max_entries: Maximum number of entries (0 for unbounded)
+            max_bytes: Maximum approximate size of all entries in bytes (0 for unbounded)
+            policy: Eviction policy, one of 'lru', 'lfu' or 'ttl'
+        """
+        self.expire_after = expire_after
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy.lower()
+        if self.policy not in EVICTION_POLICIES:
+            logger.warning(f"Unknown eviction policy: {self.policy}, defaulting to lru")
+            self.policy = 'lru'
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, timestamp) for a live entry, or None."""
+        raise NotImplementedError
+
+    def timestamp(self, key: str) -> Optional[float]:
+        """Return the timestamp of a live entry without reading its value, or None."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, timestamp: float) -> None:
+        """Store an entry, evicting others if limits are exceeded."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Delete an entry."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Delete all entries."""
+        raise NotImplementedError
+
+    def sweep(self) -> int:
+        """Delete all entries older than expire_after and return how many were removed."""
+        raise NotImplementedError
+
+    def usage(self) -> Dict[str, Any]:
+        """Return entry count, size in bytes and eviction/expiration counters."""
+        raise NotImplementedError
+
+class _MemoryEntry:
+    """Cached value with its bookkeeping."""
+
+    __slots__ = ('value', 'timestamp', 'size', 'hits')
+
+    def __init__(self, value: Any, timestamp: float, size: int):
+        self.value = value
+        self.timestamp = timestamp
+        self.size = size
+        self.hits = 0
+
+class MemoryBackend(CacheBackend):
+    """Bounded, thread-safe in-process backend."""
+
+    def __init__(self, expire_after: float, max_entries: int = 0, max_bytes: int = 0, policy: str = 'lru'):
+        super().__init__(expire_after, max_entries, max_bytes, policy)
+        self._entries: 'OrderedDict[str, _MemoryEntry]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if time.time() - entry.timestamp >= self.expire_after:
+                self._remove(key)
+                self._expirations += 1
+                return None
+
+            entry.hits += 1
+            self._entries.move_to_end(key)
+            return entry.value, entry.timestamp
+
+    def timestamp(self, key: str) -> Optional[float]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry.timestamp >= self.expire_after:
+                return None
+            return entry.timestamp
+
+    def set(self, key: str, value: Any, timestamp: float) -> None:
+        size = estimate_size(value)
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes and size > self.max_bytes:
+                logger.warning(f"Value for key {key} ({size} bytes) exceeds cache size limit, not caching")
+                return
+
+            self._entries[key] = _MemoryEntry(value, timestamp, size)
+            self._bytes += size
+            self._evict(protect=key)
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and release its accounted size."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _over_limit(self) -> bool:
+        """Check whether the backend exceeds its entry or byte limits."""
+        return bool((self.max_entries and len(self._entries) > self.max_entries) or
+                    (self.max_bytes and self._bytes > self.max_bytes))
+
+    def _evict(self, protect: str) -> None:
+        """
+        Evict entries until the backend is within its limits.
+
+        Under LRU the least recently used entry is evicted in O(1); expired
+        entries are left to the periodic sweep. Under LFU and TTL, expired
+        entries go first, then victims chosen by the policy.
+
+        Args:
+            protect: Key of the entry just stored, which is never evicted
+        """
+        if not self._over_limit():
+            return
+
+        if self.policy == 'lru':
+            # The entry just stored is the most recent, so it is only first when it is alone
+            while self._over_limit():
+                victim = next(iter(self._entries))
+                if victim == protect:
+                    break
+                self._remove(victim)
+                self._evictions += 1
+                logger.debug(f"Evicted cache entry for key: {victim} (lru)")
+            return
+
+        self.sweep()
+        while self._over_limit():
+            candidates = [key for key in self._entries if key != protect]
+            if not candidates:
+                break
+
+            if self.policy == 'lfu':
+                # Least hits first; ties broken by least recent use
+                victim = min(candidates, key=lambda key: self._entries[key].hits)
+            else:
+                # Closest to expiry first
+                victim = min(candidates, key=lambda key: self._entries[key].timestamp)
+
+            self._remove(victim)
+            self._evictions += 1
+            logger.debug(f"Evicted cache entry for key: {victim} ({self.policy})")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def sweep(self) -> int:
+        with self._lock:
+            now = time.time()
+            expired = [key for key, entry in self._entries.items()
+                       if now - entry.timestamp >= self.expire_after]
+            for key in expired:
+                self._remove(key)
+            self._expirations += len(expired)
+        return len(expired)
+
+    def usage(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'evictions': self._evictions,
+                'expirations': self._expirations
+            }
+
+class SQLiteBackend(CacheBackend):
+    """
+    SQLite backend shared by all processes on a host.
+
+    Values are pickled into a single table, so every worker reads what any
+    worker computed and a clear from one worker invalidates all of them. The
+    last unpickled value per key is memoized and reused while the stored
+    timestamp is unchanged.
+
+    Reads only write to the database when an entry or byte limit makes the
+    hit counts and access times matter for eviction, and then in batches: a
+    process collects its accesses in memory and records them in one
+    transaction every ACCESS_FLUSH_INTERVAL seconds and before it evicts.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, expire_after: float, max_entries: int = 0, max_bytes: int = 0,
+                 policy: str = 'lru'):
+        """
+        Open (and create if needed) the shared cache database.
+
+        Args:
+            path: Path of the SQLite database file
+            expire_after: Age in seconds after which an entry is dropped
+            max_entries: Maximum number of entries (0 for unbounded)
+            max_bytes: Maximum total size of pickled values in bytes (0 for unbounded)
+            policy: Eviction policy, one of 'lru', 'lfu' or 'ttl'
+        """
+        super().__init__(expire_after, max_entries, max_bytes, policy)
+        self.path = path
+        self._local = threading.local()
+        self._memo: Dict[str, Tuple[float, Any]] = {}
+        self._memo_lock = threading.Lock()
+        # Accesses not yet recorded, as key -> [hits, last access time]
+        self._pending_access: Dict[str, list] = {}
+        self._last_access_flush = time.time()
+        self._evictions = 0
+        self._expirations = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, timestamp REAL NOT NULL, "
+                "size INTEGER NOT NULL, hits INTEGER NOT NULL DEFAULT 0, last_access REAL NOT NULL)"
+            )
+        logger.info(f"Using shared SQLite cache at {path}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection to the database."""
+        conn = getattr(self._local, 'conn', None)
+        # A connection inherited through fork (e.g. by a preloaded server worker) must not be used
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        conn = self._connection()
+        row = conn.execute("SELECT timestamp FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            with self._memo_lock:
+                self._memo.pop(key, None)
+            return None
+
+        timestamp = row[0]
+        now = time.time()
+        if now - timestamp >= self.expire_after:
+            conn.execute("DELETE FROM cache_entries WHERE key = ? AND timestamp = ?", (key, timestamp))
+            self._expirations += 1
+            return None
+
+        if self.policy != 'ttl' and (self.max_entries or self.max_bytes):
+            self._record_access(conn, key, now)
+
+        with self._memo_lock:
+            memo = self._memo.get(key)
+        if memo is not None and memo[0] == timestamp:
+            return memo[1], timestamp
+
+        row = conn.execute("SELECT value, timestamp FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value = pickle.loads(row[0])
+        with self._memo_lock:
+            self._memo[key] = (row[1], value)
+        return value, row[1]
+
+    def timestamp(self, key: str) -> Optional[float]:
+        row = self._connection().execute("SELECT timestamp FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() - row[0] >= self.expire_after:
+            return None
+        return row[0]
+
+    def _record_access(self, conn: sqlite3.Connection, key: str, now: float) -> None:
+        """Note a hit, writing the pending ones once ACCESS_FLUSH_INTERVAL has passed."""
+        with self._memo_lock:
+            pending = self._pending_access.setdefault(key, [0, now])
+            pending[0] += 1
+            pending[1] = now
+            if now - self._last_access_flush < ACCESS_FLUSH_INTERVAL:
+                return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._flush_access(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _flush_access(self, conn: sqlite3.Connection) -> None:
+        """Write the pending hit counts and access times inside the caller's transaction."""
+        with self._memo_lock:
+            pending, self._pending_access = self._pending_access, {}
+            self._last_access_flush = time.time()
+        if pending:
+            conn.executemany(
+                "UPDATE cache_entries SET hits = hits + ?, last_access = MAX(last_access, ?) WHERE key = ?",
+                [(hits, last_access, key) for key, (hits, last_access) in pending.items()]
+            )
+
+    def set(self, key: str, value: Any, timestamp: float) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.max_bytes and len(blob) > self.max_bytes:
+            logger.warning(f"Value for key {key} ({len(blob)} bytes) exceeds cache size limit, not caching")
+            self.delete(key)
+            return
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._flush_access(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, timestamp, size, hits, last_access) "
+                "VALUES (?, ?, ?, ?, 0, ?)",
+                (key, sqlite3.Binary(blob), timestamp, len(blob), timestamp)
+            )
+            self._evict(conn, protect=key)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._memo_lock:
+            self._memo[key] = (timestamp, value)
+
+    def _evict(self, conn: sqlite3.Connection, protect: str) -> None:
+        """Evict expired entries, then policy victims, until within limits."""
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+        if not ((self.max_entries and entries > self.max_entries) or (self.max_bytes and size > self.max_bytes)):
+            return
+
+        self._expirations += conn.execute(
+            "DELETE FROM cache_entries WHERE timestamp <= ?", (time.time() - self.expire_after,)
+        ).rowcount
+
+        order = {
+            'lru': 'last_access ASC',
+            'lfu': 'hits ASC, last_access ASC',
+            'ttl': 'timestamp ASC'
+        }[self.policy]
+        while True:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+            if not ((self.max_entries and entries > self.max_entries) or (self.max_bytes and size > self.max_bytes)):
+                break
+            victim = conn.execute(
+                f"SELECT key FROM cache_entries WHERE key != ? ORDER BY {order} LIMIT 1", (protect,)
+            ).fetchone()
+            if victim is None:
+                break
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", victim)
+            self._evictions += 1
+            logger.debug(f"Evicted cache entry for key: {victim[0]} ({self.policy})")
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        with self._memo_lock:
+            self._memo.pop(key, None)
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM cache_entries")
+        with self._memo_lock:
+            self._memo.clear()
+
+    def sweep(self) -> int:
+        removed = self._connection().execute(
+            "DELETE FROM cache_entries WHERE timestamp <= ?", (time.time() - self.expire_after,)
+        ).rowcount
+        self._expirations += removed
+        return removed
+
+    def usage(self) -> Dict[str, Any]:
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()
+        return {
+            'entries': entries,
+            'bytes': size,
+            'evictions': self._evictions,
+            'expirations': self._expirations
+        }
+
+def create_backend(name: str, expire_after: float, max_entries: int, max_bytes: int, policy: str) -> CacheBackend:
+    """
+    Create a cache backend by name.
+
+    Args:
+        name: 'memory' or 'sqlite'
+        expire_after: Age in seconds after which an entry is dropped
+        max_entries: Maximum number of entries (0 for unbounded)
+        max_bytes: Maximum approximate size in bytes (0 for unbounded)
+        policy: Eviction policy, one of 'lru', 'lfu' or 'ttl'
+
+    Returns:
+        CacheBackend instance
+    """
+    name = (name or 'memory').lower()
+    if name == 'sqlite':
+        return SQLiteBackend(Config.CACHE_SQLITE_PATH, expire_after, max_entries, max_bytes, policy)
+    if name != 'memory':
+        logger.warning(f"Unknown cache backend: {name}, defaulting to memory")
+    return MemoryBackend(expire_after, max_entries, max_bytes, policy)
@@ -0,0 +1,90 @@
+"""
+Circuit breaker utility module.
+Stops calling a failing dependency until a cool-down period has passed.
+"""
+import threading
+import time
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    The circuit opens after ``failure_threshold`` consecutive failures. While
+    open, requests are rejected until ``reset_timeout`` seconds have passed;
+    then a single trial request is let through (half-open). A success closes
+    the circuit, a failure re-opens it. A trial that records neither within
+    ``reset_timeout`` is treated as failed and another trial is let through.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        """
+        Initialize a closed circuit.
+
+        Args:
+            name: Name used in log messages
+            failure_threshold: Consecutive failures before opening (0 disables the breaker)
+            reset_timeout: Seconds to stay open before allowing a trial request
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        """Current circuit state."""
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be attempted.
+
+        Returns:
+            True if the circuit is closed, or if it is open past the reset
+            timeout and this caller gets the half-open trial request
+        """
+        if self.failure_threshold <= 0:
+            return True
+
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            # While half-open, _opened_at is the start of the trial
+            if self._state != self.CLOSED and time.time() - self._opened_at >= self.reset_timeout:
+                logger.info(f"Circuit {self.name} half-open, allowing trial request")
+                self._state = self.HALF_OPEN
+                self._opened_at = time.time()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit past the threshold."""
+        if self.failure_threshold <= 0:
+            return
+
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Circuit {self.name} opened after {self._failures} consecutive failures")
+                self._state = self.OPEN
+                self._opened_at = time.time()
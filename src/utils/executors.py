@@ -0,0 +1,40 @@
+"""
+Executor utility module.
+Provides named thread pools shared within a process and forgotten after fork.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
+
+_executor_lock = threading.Lock()
+_executors: Dict[Tuple[str, int], ThreadPoolExecutor] = {}
+
+
+def _reset_executors() -> None:
+    """Forget the thread pools inherited by a forked child; their threads only run in the parent."""
+    global _executor_lock
+    _executor_lock = threading.Lock()
+    _executors.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_executors)
+
+
+def get_executor(name: str, workers: int) -> ThreadPoolExecutor:
+    """
+    Get the shared thread pool of a name and worker count, creating it on first use.
+
+    Args:
+        name: Pool name, also the thread name prefix (e.g. 'aggregation')
+        workers: Number of threads
+
+    Returns:
+        ThreadPoolExecutor shared by every caller in this process
+    """
+    with _executor_lock:
+        executor = _executors.get((name, workers))
+        if executor is None:
+            executor = _executors[name, workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        return executor
@@ -0,0 +1,199 @@
+"""
+Streaming JSON utility module.
+Parses a JSON document incrementally from byte chunks, handing the elements of
+one large array to a callback in batches instead of materializing them.
+"""
+import codecs
+import json
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+# Characters that may follow a complete number
+_NUMBER_TERMINATORS = _WHITESPACE + ',]}'
+
+
+class _ChunkReader:
+    """Text buffer over an iterable of UTF-8 byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        """
+        Initialize reader.
+
+        Args:
+            chunks: Iterable of byte chunks (e.g. ``response.iter_content()``)
+        """
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """
+        Append the next non-empty chunk, dropping the consumed part of the buffer.
+
+        Returns:
+            True if text was added, False at end of input
+        """
+        while not self.eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.eof = True
+                text = self._decoder.decode(b'', final=True)
+            else:
+                text = self._decoder.decode(chunk)
+            if text:
+                self.buffer = self.buffer[self.pos:] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        Returns:
+            Next character, or '' at end of input
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def next_char(self) -> str:
+        """Consume and return the next non-whitespace character ('' at end of input)."""
+        char = self.peek()
+        self.pos += len(char)
+        return char
+
+    def expect(self, expected: str) -> None:
+        """
+        Consume the next non-whitespace character, which must be ``expected``.
+
+        Raises:
+            json.JSONDecodeError: If a different character follows
+        """
+        if self.peek() != expected:
+            self.error(f"Expecting '{expected}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """
+        Decode the next complete JSON value.
+
+        A number is only accepted once it is followed by a delimiter or the
+        input has ended, since a chunk boundary can split it anywhere (e.g.
+        '-0.' decodes as -0 before its fraction arrives).
+
+        Returns:
+            Decoded value
+
+        Raises:
+            json.JSONDecodeError: If the input is not valid JSON
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                if (end == len(self.buffer) or self.buffer[end] not in _NUMBER_TERMINATORS) and self.fill():
+                    continue
+            self.pos = end
+            return value
+
+    def error(self, message: str) -> None:
+        """Raise a JSONDecodeError at the current position."""
+        raise json.JSONDecodeError(message, self.buffer, self.pos)
+
+
+def _stream_array(reader: _ChunkReader, on_batch: Callable[[List[Any]], None], batch_size: int) -> None:
+    """Decode the array at the reader position, passing its elements on in batches."""
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+
+    batch = []
+    while True:
+        batch.append(reader.value())
+        if len(batch) >= batch_size:
+            on_batch(batch)
+            batch = []
+
+        separator = reader.next_char()
+        if separator == ']':
+            break
+        if separator != ',':
+            reader.error("Expecting ',' delimiter")
+
+    if batch:
+        on_batch(batch)
+
+
+def parse_json_stream(chunks: Iterable[bytes], on_batch: Callable[[List[Any]], None],
+                      array_key: str = 'jobs', batch_size: int = 1000) -> Tuple[Optional[Any], bool]:
+    """
+    Parse a JSON document incrementally, streaming one array through a callback.
+
+    The streamed array is either the top-level value or the value of
+    ``array_key`` in a top-level object. Only one batch of its elements and the
+    unconsumed tail of the current chunk are held in memory at a time; every
+    other value is decoded normally.
+
+    Args:
+        chunks: Iterable of UTF-8 encoded byte chunks
+        on_batch: Called with each list of up to batch_size array elements
+        array_key: Key of the array to stream in a top-level object
+        batch_size: Maximum number of elements per batch
+
+    Returns:
+        Tuple of (document, streamed): the top-level object without the
+        streamed key (None when the top-level value is the streamed array, or
+        the decoded value when it is neither), and whether an array was streamed
+
+    Raises:
+        json.JSONDecodeError: If the input is not valid JSON
+    """
+    reader = _ChunkReader(chunks)
+    first = reader.peek()
+
+    if first == '[':
+        _stream_array(reader, on_batch, batch_size)
+        document, streamed = None, True
+    elif first == '{':
+        reader.pos += 1
+        document, streamed = {}, False
+        if reader.peek() == '}':
+            reader.pos += 1
+        else:
+            while True:
+                if reader.peek() != '"':
+                    reader.error("Expecting property name enclosed in double quotes")
+                key = reader.value()
+                reader.expect(':')
+                if key == array_key and reader.peek() == '[':
+                    _stream_array(reader, on_batch, batch_size)
+                    streamed = True
+                else:
+                    document[key] = reader.value()
+
+                separator = reader.next_char()
+                if separator == '}':
+                    break
+                if separator != ',':
+                    reader.error("Expecting ',' delimiter")
+    else:
+        document, streamed = reader.value(), False
+
+    if reader.peek():
+        reader.error("Extra data")
+    return document, streamed
@@ -0,0 +1,78 @@
+"""
+Single-flight utility module.
+Coalesces concurrent calls for the same key into a single execution.
+"""
+import threading
+from typing import Any, Callable, Dict
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class _Call:
+    """In-flight call shared by the leader and its waiters."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Request coalescing per key.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight block until it finishes and share its result (or exception).
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once per key among concurrent callers.
+
+        Args:
+            key: Key identifying the work
+            fn: Zero-argument callable producing the result
+
+        Returns:
+            Result of the single in-flight execution
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            logger.debug(f"Waiting on in-flight call for key: {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self, key: str) -> bool:
+        """
+        Check whether a call is currently running for a key.
+
+        Args:
+            key: Key identifying the work
+
+        Returns:
+            True if a call for key is in flight
+        """
+        with self._lock:
+            return key in self._calls
@@ -2,14 +2,29 @@
 Validation utility module.
 Provides input validation functions for API endpoints.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.repositories.job_frame import JobFrame, MISSING_CODE
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Offending indices listed per problem in bulk validation messages
+MAX_REPORTED_INDICES = 10
+
 class ValidationError(Exception):
     """Custom exception for validation errors."""
-    pass
+
+    def __init__(self, message: str = '', indices: Optional[List[int]] = None):
+        """
+        Initialize error.
+        
+        Args:
+            message: Error message
+            indices: Sorted indices of every offending row (bulk validation only)
+        """
+        super().__init__(message)
+        self.indices = indices
 
 def validate_prediction_input(data: Dict[str, Any]) -> None:
     """
@@ -59,36 +74,74 @@ def validate_prediction_input(data: Dict[str, Any]) -> None:
     
     logger.debug("Prediction input validation passed")
 
-def validate_job_data(job_data: List[Dict[str, Any]]) -> None:
+def validate_job_data(job_data: Union[JobFrame, List[Dict[str, Any]]]) -> None:
     """
     Validate job data structure.
     
+    Whole columns are checked at once and every offending row is reported
+    (see ValidationError.indices). A JobFrame that passes is marked as
+    validated and skipped by later calls.
+    
     Args:
-        job_data: List of job data dictionaries
+        job_data: JobFrame or list of job data dictionaries
         
     Raises:
         ValidationError: If validation fails
     """
+    if isinstance(job_data, JobFrame):
+        _validate_job_frame(job_data)
+        return
+    
     if not isinstance(job_data, list):
         raise ValidationError("Job data must be a list")
     
     if len(job_data) == 0:
         raise ValidationError("Job data cannot be empty")
     
-    for idx, job in enumerate(job_data):
-        if not isinstance(job, dict):
-            raise ValidationError(f"Job at index {idx} must be a dictionary")
-        
-        if 'category' not in job:
-            raise ValidationError(f"Job at index {idx} missing 'category' field")
-        
-        if 'salary' not in job:
-            raise ValidationError(f"Job at index {idx} missing 'salary' field")
-        
-        if not isinstance(job['salary'], (int, float)):
-            raise ValidationError(f"Salary at index {idx} must be a number")
+    not_dict = np.fromiter((not isinstance(job, dict) for job in job_data), dtype=bool, count=len(job_data))
+    _validate_job_frame(JobFrame.from_records(job_data), [("must be a dictionary", not_dict)])
+
+def _validate_job_frame(frame: JobFrame, problems: Sequence[Tuple[str, np.ndarray]] = ()) -> None:
+    """
+    Validate a columnar job frame with whole-column checks.
+    
+    Args:
+        frame: JobFrame to validate
+        problems: Further (description, mask of offending rows) pairs to report
         
-        if job['salary'] < 0:
-            raise ValidationError(f"Salary at index {idx} must be non-negative")
+    Raises:
+        ValidationError: If validation fails
+    """
+    if frame.validated:
+        return
+    
+    if len(frame) == 0:
+        raise ValidationError("Job data cannot be empty")
+    
+    non_numeric = frame.non_numeric_salary
+    if non_numeric is None:
+        non_numeric = np.zeros(len(frame), dtype=bool)
+    problems = list(problems) + [
+        ("missing 'category' field", frame.codes('category') == MISSING_CODE),
+        ("missing 'salary' field", np.isnan(frame.salary) & ~non_numeric),
+        ("salary must be a number", non_numeric),
+        ("salary must be non-negative", frame.salary < 0)
+    ]
+    invalid = np.zeros(len(frame), dtype=bool)
+    messages = []
+    for description, mask in problems:
+        indices = np.flatnonzero(mask)
+        if indices.size == 0:
+            continue
+        invalid |= mask
+        shown = ', '.join(str(idx) for idx in indices[:MAX_REPORTED_INDICES])
+        more = f" and {indices.size - MAX_REPORTED_INDICES} more" if indices.size > MAX_REPORTED_INDICES else ''
+        messages.append(f"{description} at {'index' if indices.size == 1 else 'indices'} {shown}{more}")
+    
+    if messages:
+        indices = np.flatnonzero(invalid).tolist()
+        logger.debug(f"Job data validation failed for {len(indices)} of {len(frame)} jobs")
+        raise ValidationError(f"Invalid job data ({len(indices)} jobs): {'; '.join(messages)}", indices)
     
-    logger.debug(f"Job data validation passed for {len(job_data)} jobs")
+    frame.validated = True
+    logger.debug(f"Job data validation passed for {len(frame)} jobs")
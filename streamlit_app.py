@@ -328,6 +328,38 @@ def show_trends_analysis(job_service):
                 st.write(f"**Median Salary:** {currency_symbol}{category_data['median_salary']:,.0f}")
                 st.write(f"**Standard Deviation:** {currency_symbol}{category_data['std_deviation']:,.0f}")
             
+            # Drill-down served from the pre-materialized job cube
+            st.markdown("---")
+            st.subheader("🔍 Drill Down")
+            
+            dimension = st.selectbox(
+                "Break down by",
+                options=["location", "experience", "company_type"],
+                format_func=lambda dim: dim.replace('_', ' ').title()
+            )
+            aggregates = job_service.get_aggregates([dimension], {'category': selected_category})
+            cells = aggregates['cells']
+            
+            if cells:
+                labels = [cell[dimension] or 'Unknown' for cell in cells]
+                fig = px.bar(
+                    x=labels,
+                    y=[cell['average_salary'] for cell in cells],
+                    labels={'x': dimension.replace('_', ' ').title(), 'y': f'Average Salary ({currency_symbol})'},
+                    text=[cell['job_count'] for cell in cells]
+                )
+                fig.update_layout(height=400)
+                st.plotly_chart(fig, use_container_width=True)
+                
+                drill_df = pd.DataFrame([{
+                    dimension.replace('_', ' ').title(): label,
+                    'Count': cell['job_count'],
+                    'Avg Salary': f"{currency_symbol}{cell['average_salary']:,.0f}",
+                    'Min': f"{currency_symbol}{cell['min_salary']:,.0f}",
+                    'Max': f"{currency_symbol}{cell['max_salary']:,.0f}"
+                } for label, cell in zip(labels, cells)])
+                st.dataframe(drill_df, use_container_width=True, hide_index=True)
+            
     except Exception as e:
         st.error(f"Error loading trends data: {str(e)}")
         logger.error(f"Trends analysis error: {str(e)}")
@@ -0,0 +1,135 @@
+import unittest
+import numpy as np
+from src.services.aggregation import group_salary_stats, salary_summary
+
+class TestAggregation(unittest.TestCase):
+
+    def test_group_salary_stats_matches_numpy(self):
+        """Test segment reductions match per-group NumPy statistics."""
+        rng = np.random.default_rng(7)
+        codes = rng.integers(0, 50, 5000).astype(np.int32)
+        values = rng.integers(300000, 3000000, 5000).astype(np.float64)
+        
+        stats = group_salary_stats(codes, values)
+        
+        np.testing.assert_array_equal(stats['group'], np.unique(codes))
+        for idx, code in enumerate(stats['group']):
+            salaries = values[codes == code]
+            self.assertEqual(stats['count'][idx], salaries.size)
+            self.assertEqual(stats['mean'][idx], np.mean(salaries))
+            self.assertEqual(stats['median'][idx], np.median(salaries))
+            self.assertEqual(stats['min'][idx], np.min(salaries))
+            self.assertEqual(stats['max'][idx], np.max(salaries))
+            self.assertAlmostEqual(stats['std'][idx], np.std(salaries), places=6)
+
+    def test_group_salary_stats_moments_identical_for_float_salaries(self):
+        """Test mean and std match np.mean and np.std of each group bit for bit."""
+        rng = np.random.default_rng(17)
+        codes = rng.integers(0, 300, 50000).astype(np.int32)
+        values = rng.uniform(300000, 3000000, 50000)
+        
+        for workers in (1, 4):
+            stats = group_salary_stats(codes, values, workers=workers)
+            for idx, code in enumerate(stats['group']):
+                salaries = values[codes == code]
+                self.assertEqual(stats['mean'][idx], np.mean(salaries))
+                self.assertEqual(stats['std'][idx], np.std(salaries))
+
+    def test_group_salary_stats_even_and_single(self):
+        """Test medians for even-sized and single-row groups."""
+        stats = group_salary_stats(np.array([1, 0, 1, 1, 1]), np.array([4.0, 9.0, 1.0, 3.0, 2.0]))
+        np.testing.assert_array_equal(stats['group'], [0, 1])
+        np.testing.assert_array_equal(stats['median'], [9.0, 2.5])
+        np.testing.assert_array_equal(stats['std'], [0.0, np.std([4.0, 1.0, 3.0, 2.0])])
+
+    def test_group_salary_stats_empty(self):
+        """Test empty input yields empty results."""
+        stats = group_salary_stats(np.array([], dtype=np.int32), np.array([]))
+        self.assertEqual(stats['count'].size, 0)
+
+    def test_group_salary_stats_percentiles_match_numpy(self):
+        """Test exact percentiles interpolate like np.percentile."""
+        rng = np.random.default_rng(11)
+        codes = rng.integers(0, 10, 1000).astype(np.int32)
+        values = rng.normal(1000000, 200000, 1000)
+        
+        stats = group_salary_stats(codes, values)
+        
+        for idx, code in enumerate(stats['group']):
+            salaries = values[codes == code]
+            for percentile in (10, 25, 75, 90):
+                self.assertAlmostEqual(stats['percentiles'][percentile][idx],
+                                       np.percentile(salaries, percentile), delta=1e-6)
+
+    def test_group_salary_stats_approximate(self):
+        """Test sketch-based quantiles stay within the expected rank error."""
+        rng = np.random.default_rng(5)
+        codes = rng.integers(0, 3, 30000).astype(np.int32)
+        values = rng.lognormal(13, 0.5, 30000)
+        
+        stats = group_salary_stats(codes, values, sketch_k=200)
+        
+        for idx, code in enumerate(stats['group']):
+            salaries = np.sort(values[codes == code])
+            self.assertEqual(stats['min'][idx], salaries[0])
+            self.assertEqual(stats['max'][idx], salaries[-1])
+            for q, estimate in [(0.5, stats['median'][idx]), (0.9, stats['percentiles'][90][idx])]:
+                rank = np.searchsorted(salaries, estimate) / salaries.size
+                self.assertLess(abs(rank - q), 0.02)
+
+    def test_parallel_group_salary_stats_approximate(self):
+        """Test sharded sketches give the same estimates as one shard and are kept per group."""
+        rng = np.random.default_rng(9)
+        codes = rng.integers(0, 50, 20000).astype(np.int32)
+        values = rng.lognormal(13, 0.5, 20000)
+        
+        serial = group_salary_stats(codes, values, sketch_k=100, workers=1)
+        parallel = group_salary_stats(codes, values, sketch_k=100, workers=4)
+        
+        np.testing.assert_array_equal(parallel['group'], serial['group'])
+        np.testing.assert_array_equal(parallel['median'], serial['median'])
+        self.assertEqual([sketch.count for sketch in parallel['sketch']], list(serial['count']))
+        self.assertTrue(all(sketch.k == 100 for sketch in parallel['sketch']))
+
+    def test_salary_summary(self):
+        """Test overall summary of a single set of salaries."""
+        values = np.arange(1.0, 11.0)
+        summary = salary_summary(values)
+        self.assertEqual(summary['count'], 10)
+        self.assertEqual(summary['mean'], 5.5)
+        self.assertEqual(summary['median'], 5.5)
+        self.assertEqual((summary['min'], summary['max']), (1.0, 10.0))
+        self.assertEqual(set(summary['percentiles']), {'p10', 'p25', 'p75', 'p90'})
+        self.assertAlmostEqual(summary['percentiles']['p90'], np.percentile(values, 90))
+
+    def test_parallel_group_salary_stats_matches_serial(self):
+        """Test hash-partitioned aggregation gives identical per-group results."""
+        rng = np.random.default_rng(13)
+        codes = rng.integers(0, 37, 20000).astype(np.int32)
+        values = rng.normal(1000000, 300000, 20000)
+        
+        serial = group_salary_stats(codes, values, workers=1)
+        for workers in (2, 4, 7):
+            parallel = group_salary_stats(codes, values, workers=workers)
+            for key in ('group', 'count', 'mean', 'median', 'min', 'max', 'std'):
+                np.testing.assert_array_equal(parallel[key], serial[key])
+            for percentile in serial['percentiles']:
+                np.testing.assert_array_equal(parallel['percentiles'][percentile], serial['percentiles'][percentile])
+
+    def test_parallel_salary_summary_merges_moments(self):
+        """Test chunked moments and sketches merge to the overall statistics."""
+        rng = np.random.default_rng(17)
+        values = rng.lognormal(13, 0.5, 50000)
+        
+        summary = salary_summary(values, workers=4)
+        self.assertEqual(summary['count'], values.size)
+        self.assertAlmostEqual(summary['mean'], np.mean(values), delta=1e-6)
+        self.assertAlmostEqual(summary['std'], np.std(values), delta=1e-6)
+        self.assertEqual(summary['median'], np.median(values))
+        
+        approximate = salary_summary(values, sketch_k=200, workers=4)
+        self.assertEqual(approximate['max'], values.max())
+        self.assertEqual(approximate['sketch'].count, values.size)
+        self.assertIsNone(summary['sketch'])
+        rank = np.searchsorted(np.sort(values), approximate['percentiles']['p90']) / values.size
+        self.assertLess(abs(rank - 0.9), 0.02)
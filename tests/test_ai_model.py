@@ -1,5 +1,10 @@
+import threading
 import unittest
+from unittest.mock import patch
+import numpy as np
+from src.repositories.job_frame import JobFrame
 from src.services.ai_model import AIModel
+from src.utils.validation import ValidationError
 
 class TestAIModel(unittest.TestCase):
 
@@ -30,3 +35,124 @@ class TestAIModel(unittest.TestCase):
         predictions = model.predict(input_data)
         self.assertIn('predictions', predictions)
         self.assertEqual(len(predictions['predictions']), 2)
+
+    def test_predict_fallback_for_single_point(self):
+        model = AIModel('linear')
+        prediction = model.predict({'years': [2020], 'salaries': [100000], 'future_years': [2021]})
+        self.assertEqual(prediction['predictions'], [100000])
+
+    def test_predict_polynomial_and_tree(self):
+        input_data = {
+            'years': [2019, 2020, 2021, 2022, 2023],
+            'salaries': [100000, 120000, 150000, 190000, 240000],
+            'future_years': [2024]
+        }
+        with patch('src.services.ai_model.Config.POLYNOMIAL_DEGREE', 2):
+            polynomial = AIModel('polynomial').predict(input_data)
+        self.assertAlmostEqual(polynomial['predictions'][0], 300000, delta=1e-6)
+        self.assertAlmostEqual(polynomial['confidence_score'], 1.0)
+        
+        tree = AIModel('decision_tree').predict(input_data)
+        self.assertEqual(tree['model_type'], 'decision_tree')
+        self.assertEqual(tree['predictions'], [240000])
+
+    def test_predict_batch_matches_predict(self):
+        series = [
+            {'years': [2020, 2021, 2022], 'salaries': [100000, 110000, 125000], 'future_years': [2023, 2024]},
+            {'years': [2020], 'salaries': [90000], 'future_years': [2021]},
+            {'years': [2018, 2019, 2020, 2021], 'salaries': [50000, 70000, 65000, 80000], 'future_years': [2022]}
+        ]
+        for model_type in ('linear', 'polynomial', 'decision_tree'):
+            model = AIModel(model_type)
+            results = model.predict_batch(series)
+            self.assertEqual(len(results), len(series))
+            for input_data, result in zip(series, results):
+                expected = model.predict(input_data)
+                self.assertEqual(result['model_type'], model_type)
+                np.testing.assert_allclose(result['predictions'], expected['predictions'], atol=1e-6)
+                # Scores of single-point fallbacks are NaN in both paths
+                np.testing.assert_allclose(result['confidence_score'], expected['confidence_score'], rtol=1e-9)
+
+    def test_predict_batch_invalid_series(self):
+        series = [
+            {'years': [2020, 2021], 'salaries': [1, 2], 'future_years': [2022]},
+            {'years': [2020, 2021], 'salaries': [1], 'future_years': [2022]}
+        ]
+        with self.assertRaisesRegex(ValidationError, 'Series 1'):
+            AIModel().predict_batch(series)
+
+    def test_predict_auto(self):
+        model = AIModel('auto')
+        curved = model.predict({
+            'years': [2019, 2020, 2021, 2022, 2023],
+            'salaries': [100000, 120000, 150000, 190000, 240000],
+            'future_years': [2024]
+        })
+        self.assertEqual(curved['model_type'], 'auto')
+        self.assertEqual((curved['selected_model'], curved['degree']), ('polynomial', 2))
+        self.assertAlmostEqual(curved['predictions'][0], 300000, delta=1e-6)
+        self.assertFalse(curved['budget_exceeded'])
+        
+        # Too few points to cross-validate falls back to a linear fit
+        single = model.predict({'years': [2020], 'salaries': [100000], 'future_years': [2021]})
+        self.assertEqual(single['selected_model'], 'linear')
+        self.assertEqual(single['predictions'], [100000])
+        self.assertIsNone(single['confidence_score'])
+        
+        batch = model.predict_batch([{'years': [2020, 2021, 2022], 'salaries': [1, 2, 3], 'future_years': [2023]}])
+        self.assertEqual(batch[0]['selected_model'], 'linear')
+        self.assertAlmostEqual(batch[0]['predictions'][0], 4)
+
+    def test_predict_concurrent_requests(self):
+        for model_type in ('linear', 'polynomial', 'decision_tree'):
+            model = AIModel(model_type)
+            results = {}
+            barrier = threading.Barrier(8)
+
+            def predict(slope):
+                barrier.wait()
+                for _ in range(20):
+                    results.setdefault(slope, []).append(model.predict({
+                        'years': [2020, 2021, 2022, 2023],
+                        'salaries': [slope * year for year in range(4)],
+                        'future_years': [2023]
+                    })['predictions'][0])
+
+            threads = [threading.Thread(target=predict, args=(slope,)) for slope in range(1, 9)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            # Every request sees its own fit, never another thread's
+            for slope, predictions in results.items():
+                for prediction in predictions:
+                    self.assertAlmostEqual(prediction, slope * 3, delta=0.01)
+
+    def test_analyze_trends_job_frame(self):
+        model = AIModel()
+        job_data = [
+            {'category': 'Engineering', 'salary': 100000},
+            {'category': 'Marketing', 'salary': 80000},
+            {'category': 'Engineering', 'salary': 120000}
+        ]
+        trends = model.analyze_trends(JobFrame.from_records(job_data))
+        
+        self.assertEqual(trends, model.analyze_trends(job_data))
+        self.assertEqual(list(trends), ['Engineering', 'Marketing'])
+        self.assertEqual(trends['Engineering']['median_salary'], 110000)
+        self.assertEqual(trends['Engineering']['salary_percentiles']['p25'], 105000)
+
+    def test_analyze_trends_approximate_quantiles(self):
+        model = AIModel()
+        job_data = [{'category': 'Engineering', 'salary': 1000 * i} for i in range(1, 1002)]
+        
+        with patch('src.services.ai_model.Config.QUANTILE_MODE', 'approximate'), \
+                patch('src.services.ai_model.Config.QUANTILE_SKETCH_K', 100):
+            trends = model.analyze_trends(job_data)
+        
+        engineering = trends['Engineering']
+        self.assertEqual(engineering['average_salary'], 501000)
+        self.assertEqual(engineering['min_salary'], 1000)
+        self.assertLess(abs(engineering['median_salary'] - 501000), 30000)
+        self.assertLess(abs(engineering['salary_percentiles']['p90'] - 901000), 30000)
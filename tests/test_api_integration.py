@@ -47,6 +47,27 @@ class TestAPIIntegration(unittest.TestCase):
         self.assertIn('total_categories', data['data'])
         self.assertIn('overall_average_salary', data['data'])
 
+    def test_get_aggregates(self):
+        """Test drill-down aggregate endpoint."""
+        response = self.client.get('/api/jobs/aggregate?group_by=category,location&company_type=Product')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['status'], 'success')
+        self.assertEqual(data['data']['group_by'], ['category', 'location'])
+        self.assertEqual(data['data']['filters'], {'company_type': 'Product'})
+        self.assertGreater(len(data['data']['cells']), 0)
+        first_cell = data['data']['cells'][0]
+        self.assertIn('category', first_cell)
+        self.assertIn('location', first_cell)
+        self.assertIn('average_salary', first_cell)
+
+    def test_get_aggregates_invalid_dimension(self):
+        """Test drill-down aggregate endpoint with unknown dimension."""
+        response = self.client.get('/api/jobs/aggregate?group_by=salary')
+        self.assertEqual(response.status_code, 400)
+        data = response.get_json()
+        self.assertEqual(data['error_type'], 'validation_error')
+
     def test_predict_valid(self):
         """Test predict endpoint with valid data."""
         payload = {
@@ -109,6 +130,73 @@ class TestAPIIntegration(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(data['status'], 'error')
 
+    def test_predict_batch(self):
+        """Test batch predict endpoint returns one prediction per series in order."""
+        response = self.client.post('/api/jobs/predict/batch', json={'series': [
+            {'years': [2020, 2021, 2022], 'salaries': [100000, 110000, 120000], 'future_years': [2023]},
+            {'years': [2020, 2021, 2022], 'salaries': [90000, 80000, 70000], 'future_years': [2023, 2024]}
+        ]})
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['status'], 'success')
+        predictions = data['data']['predictions']
+        self.assertEqual(len(predictions), 2)
+        self.assertAlmostEqual(predictions[0]['predictions'][0], 130000, places=4)
+        self.assertEqual(len(predictions[1]['predictions']), 2)
+        self.assertAlmostEqual(predictions[1]['predictions'][1], 50000, places=4)
+
+    def test_predict_batch_invalid_series(self):
+        """Test batch predict endpoint names the invalid series."""
+        response = self.client.post('/api/jobs/predict/batch', json={'series': [
+            {'years': [2020, 2021], 'salaries': [100000, 110000], 'future_years': [2022]},
+            {'years': [2020, 2021], 'salaries': [100000], 'future_years': [2022]}
+        ]})
+        self.assertEqual(response.status_code, 400)
+        data = response.get_json()
+        self.assertEqual(data['error_type'], 'validation_error')
+        self.assertIn('Series 1', data['error'])
+
+    def test_predict_batch_empty(self):
+        """Test batch predict endpoint rejects a missing or empty series list."""
+        for body in ({'series': []}, {'series': 'abc'}, {'other': 1}):
+            response = self.client.post('/api/jobs/predict/batch', json=body)
+            self.assertEqual(response.status_code, 400)
+
+    def test_forecast_not_found(self):
+        """Test forecast endpoint returns 404 without a yearly history."""
+        response = self.client.get('/api/jobs/forecast/No%20Such%20Category')
+        self.assertEqual(response.status_code, 404)
+        data = response.get_json()
+        self.assertEqual(data['status'], 'error')
+        self.assertEqual(data['error_type'], 'not_found')
+
+    def test_apply_delta(self):
+        """Test delta endpoint with an added job."""
+        before = self.client.get('/api/jobs/statistics').get_json()['data']['total_jobs']
+        response = self.client.post('/api/jobs/delta', json={
+            'added': [{'category': 'Data Science', 'salary': 1800000, 'location': 'Bangalore'}]
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['status'], 'success')
+        self.assertEqual(data['data']['total_jobs'], before + 1)
+
+    def test_apply_delta_invalid(self):
+        """Test delta endpoint rejects removing an unknown job."""
+        response = self.client.post('/api/jobs/delta', json={
+            'removed': [{'category': 'No Such Category', 'salary': 1}]
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error_type'], 'validation_error')
+
+    def test_apply_delta_reports_invalid_indices(self):
+        """Test delta endpoint reports every invalid added job."""
+        response = self.client.post('/api/jobs/delta', json={
+            'added': [{'category': 'A', 'salary': -1}, {'category': 'B', 'salary': 1}, {'salary': 2}]
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['invalid_indices'], [0, 2])
+
     def test_clear_cache(self):
         """Test clear cache endpoint."""
         response = self.client.post('/api/jobs/cache/clear')
@@ -116,3 +204,13 @@ class TestAPIIntegration(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(data['status'], 'success')
         self.assertIn('Cache cleared', data['message'])
+
+    def test_cache_stats(self):
+        """Test cache statistics endpoint."""
+        self.client.get('/api/jobs/trends')
+        response = self.client.get('/api/jobs/cache/stats')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['status'], 'success')
+        for key in ['hits', 'misses', 'evictions', 'entries', 'bytes']:
+            self.assertIn(key, data['data'])
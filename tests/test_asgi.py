@@ -0,0 +1,162 @@
+import asyncio
+import json
+import time
+import unittest
+from unittest.mock import patch
+import httpx
+from src.api import asgi
+from src.api.asgi import app, job_service
+
+
+async def call_app(method, path, body=None, query=b''):
+    """Send one HTTP request through the ASGI app and return (status, JSON body)."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://testserver') as client:
+        response = await client.request(method, path, content=body, params=query.decode())
+    assert response.headers['content-type'] == 'application/json'
+    return response.status_code, response.json()
+
+
+def request(method, path, body=None, query=b''):
+    return asyncio.run(call_app(method, path, body, query))
+
+
+class TestASGIApp(unittest.TestCase):
+
+    def setUp(self):
+        job_service.clear_cache()
+
+    def test_health_check(self):
+        status, data = request('GET', '/api/jobs/health')
+        self.assertEqual(status, 200)
+        self.assertEqual(data['status'], 'success')
+        self.assertIn('Service is healthy', data['message'])
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data_async')
+    def test_get_trends_and_aggregates(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {
+            'jobs': [
+                {'category': 'Engineering', 'salary': 100000, 'location': 'Pune'},
+                {'category': 'Marketing', 'salary': 80000, 'location': 'Delhi'}
+            ],
+            'metadata': {'region': 'India'}
+        }
+
+        status, data = request('GET', '/api/jobs/trends')
+        self.assertEqual(status, 200)
+        self.assertEqual(sorted(data['data']['trends']), ['Engineering', 'Marketing'])
+        self.assertEqual(data['data']['metadata'], {'region': 'India'})
+
+        status, data = request('GET', '/api/jobs/aggregate', query=b'group_by=location&category=Engineering')
+        self.assertEqual(status, 200)
+        self.assertEqual(data['data']['filters'], {'category': 'Engineering'})
+        self.assertEqual([cell['location'] for cell in data['data']['cells']], ['Pune'])
+        self.assertEqual(mock_fetch_job_data.call_count, 1)
+
+    def test_predict(self):
+        body = json.dumps({'years': [2020, 2021, 2022], 'salaries': [50000, 55000, 60000],
+                           'future_years': [2023]}).encode()
+        status, data = request('POST', '/api/jobs/predict', body)
+        self.assertEqual(status, 200)
+        self.assertAlmostEqual(data['data']['predictions'][0], 65000, delta=1)
+
+        status, data = request('POST', '/api/jobs/predict/batch', json.dumps({'series': [json.loads(body)]}).encode())
+        self.assertEqual(status, 200)
+        self.assertEqual(len(data['data']['predictions']), 1)
+
+    def test_validation_errors(self):
+        for body in (b'', b'{}', b'{"years": [2020'):
+            status, data = request('POST', '/api/jobs/predict', body)
+            self.assertEqual(status, 400)
+            self.assertEqual(data['status'], 'error')
+            self.assertEqual(data['error_type'], 'validation_error')
+
+        status, data = request('POST', '/api/jobs/predict',
+                               json.dumps({'years': [2020], 'salaries': [], 'future_years': [2021]}).encode())
+        self.assertEqual(status, 400)
+        self.assertEqual(data['error_type'], 'validation_error')
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data_async')
+    def test_delta_reports_invalid_indices(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {'jobs': [{'category': 'Engineering', 'salary': 100000}], 'metadata': {}}
+
+        body = json.dumps({'added': [{'category': 'Sales', 'salary': 1}, {'category': 'Sales', 'salary': -1}]})
+        status, data = request('POST', '/api/jobs/delta', body.encode())
+        self.assertEqual(status, 400)
+        self.assertEqual(data['invalid_indices'], [1])
+
+    def test_unknown_route_and_method(self):
+        status, data = request('GET', '/api/jobs/unknown')
+        self.assertEqual((status, data['error_type']), (404, 'not_found'))
+
+        status, data = request('GET', '/api/jobs/predict')
+        self.assertEqual((status, data['error_type']), (405, 'method_not_allowed'))
+
+    def test_cors_preflight(self):
+        async def preflight():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://testserver') as client:
+                return await client.options('/api/jobs/predict', headers={
+                    'Origin': 'http://dashboard.example', 'Access-Control-Request-Method': 'POST'})
+
+        response = asyncio.run(preflight())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['access-control-allow-origin'], '*')
+        self.assertIn('POST', response.headers['access-control-allow-methods'])
+
+    @patch('src.services.job_service.JobService.get_forecast')
+    def test_forecast_not_found(self, mock_get_forecast):
+        mock_get_forecast.return_value = None
+        with patch.object(job_service, 'has_snapshot', return_value=True):
+            status, data = request('GET', '/api/jobs/forecast/Data Science', query=b'location=Pune')
+        self.assertEqual(status, 404)
+        self.assertEqual(data['error'], "No forecast available for 'Data Science' in 'Pune'")
+        mock_get_forecast.assert_called_once_with('Data Science', 'Pune')
+
+    @patch('src.services.job_service.JobService.get_statistics')
+    def test_server_error(self, mock_get_statistics):
+        mock_get_statistics.side_effect = RuntimeError('boom')
+        with patch.object(job_service, 'has_snapshot', return_value=True):
+            status, data = request('GET', '/api/jobs/statistics')
+        self.assertEqual(status, 500)
+        self.assertEqual(data, {'status': 'error', 'error': 'boom', 'error_type': 'server_error'})
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data_async')
+    def test_concurrent_requests_share_one_fetch(self, mock_fetch_job_data):
+        release = asyncio.Event()
+
+        async def slow_fetch(client):
+            await release.wait()
+            return {'jobs': [{'category': 'Engineering', 'salary': 100000}], 'metadata': {}}
+
+        mock_fetch_job_data.side_effect = slow_fetch
+
+        async def scenario():
+            waiting = [asyncio.ensure_future(call_app('GET', '/api/jobs/statistics')) for _ in range(50)]
+            await asyncio.sleep(0.05)
+            # The loop keeps answering while the fetch is in flight
+            health = await call_app('GET', '/api/jobs/health')
+            release.set()
+            return health, await asyncio.gather(*waiting)
+
+        started = time.monotonic()
+        health, responses = asyncio.run(scenario())
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(health[0], 200)
+        self.assertEqual({status for status, _ in responses}, {200})
+        self.assertEqual(mock_fetch_job_data.call_count, 1)
+
+    def test_lifespan(self):
+        service = asgi.AsyncJobService(job_service, workers=1)
+        lifespan_app = asgi.create_app(service)
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(lifespan_app({'type': 'lifespan', 'state': {}}, receive, send))
+        self.assertEqual(sent, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+        with self.assertRaises(RuntimeError):
+            service._executor.submit(lambda: None)
@@ -1,6 +1,8 @@
 import unittest
 from src.utils.cache import Cache
+import threading
 import time
+import numpy as np
 
 class TestCache(unittest.TestCase):
 
@@ -48,3 +50,114 @@ class TestCache(unittest.TestCase):
         cache.delete('key1')
         self.assertIsNone(cache.get('key1'))
         self.assertEqual(cache.get('key2'), 'value2')
+
+    def test_cache_stale_while_revalidate(self):
+        """Test expired entries are served as stale within the grace window."""
+        cache = Cache(ttl=1, stale_ttl=1)
+        cache.set('test_key', 'test_value')
+        self.assertEqual(cache.get_with_refresh('test_key'), ('test_value', False))
+        
+        time.sleep(1.1)
+        self.assertIsNone(cache.get('test_key'))
+        self.assertEqual(cache.get_with_refresh('test_key'), ('test_value', True))
+        
+        time.sleep(1)
+        self.assertEqual(cache.get_with_refresh('test_key'), (None, False))
+
+    def test_cache_refresh_ahead(self):
+        """Test fresh entries are flagged for refresh past the refresh-ahead point."""
+        cache = Cache(ttl=2, stale_ttl=0, refresh_ahead=0.25)
+        cache.set('test_key', 'test_value')
+        self.assertEqual(cache.get_with_refresh('test_key'), ('test_value', False))
+        
+        time.sleep(0.6)
+        self.assertEqual(cache.get('test_key'), 'test_value')
+        self.assertEqual(cache.get_with_refresh('test_key'), ('test_value', True))
+
+    def test_cache_lru_eviction(self):
+        """Test least recently used entry is evicted at the entry limit."""
+        cache = Cache(ttl=10, max_entries=2, policy='lru')
+        cache.set('key1', 'value1')
+        cache.set('key2', 'value2')
+        cache.get('key1')
+        cache.set('key3', 'value3')
+        self.assertIsNone(cache.get('key2'))
+        self.assertEqual(cache.get('key1'), 'value1')
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_cache_lru_eviction_at_steady_state(self):
+        """Test a full LRU cache keeps exactly the most recent entries."""
+        cache = Cache(ttl=10, max_entries=100, policy='lru')
+        for idx in range(1000):
+            cache.set(f'key{idx}', idx)
+        self.assertEqual(cache.stats()['entries'], 100)
+        self.assertEqual(cache.stats()['evictions'], 900)
+        self.assertIsNone(cache.get('key899'))
+        self.assertEqual(cache.get('key900'), 900)
+
+    def test_cache_lfu_eviction(self):
+        """Test least frequently used entry is evicted at the entry limit."""
+        cache = Cache(ttl=10, max_entries=2, policy='lfu')
+        cache.set('key1', 'value1')
+        cache.set('key2', 'value2')
+        cache.get('key1')
+        cache.get('key1')
+        cache.get('key2')
+        cache.set('key3', 'value3')
+        self.assertIsNone(cache.get('key2'))
+        self.assertEqual(cache.get('key1'), 'value1')
+
+    def test_cache_ttl_eviction(self):
+        """Test entry closest to expiry is evicted under the ttl policy."""
+        cache = Cache(ttl=10, max_entries=2, policy='ttl')
+        cache.set('key1', 'value1')
+        cache.set('key2', 'value2')
+        cache.get('key1')
+        cache.set('key3', 'value3')
+        self.assertIsNone(cache.get('key1'))
+        self.assertEqual(cache.get('key2'), 'value2')
+
+    def test_cache_byte_limit(self):
+        """Test entries are evicted by approximate size."""
+        cache = Cache(ttl=10, max_entries=0, max_bytes=20000)
+        cache.set('key1', np.zeros(1000))
+        cache.set('key2', np.zeros(1000))
+        self.assertIsNone(cache.get('key1'))
+        self.assertLessEqual(cache.stats()['bytes'], 20000)
+        
+        # Values larger than the whole cache are not stored
+        cache.set('key3', np.zeros(5000))
+        self.assertIsNone(cache.get('key3'))
+        self.assertIsNotNone(cache.get('key2'))
+
+    def test_cache_sweep_and_stats(self):
+        """Test sweeping expired entries and hit/miss counters."""
+        cache = Cache(ttl=1, stale_ttl=0)
+        cache.set('key1', 'value1')
+        cache.get('key1')
+        cache.get('missing')
+        time.sleep(1.1)
+        self.assertEqual(cache.sweep(), 1)
+        
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['expirations'], 1)
+        self.assertEqual(stats['entries'], 0)
+        self.assertEqual(stats['bytes'], 0)
+
+    def test_cache_concurrent_access(self):
+        """Test concurrent writers keep the cache within its limits."""
+        cache = Cache(ttl=10, max_entries=50)
+        
+        def writer(offset):
+            for idx in range(200):
+                cache.set(f'key{offset}-{idx}', idx)
+                cache.get(f'key{offset}-{idx // 2}')
+        
+        threads = [threading.Thread(target=writer, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(cache.stats()['entries'], 50)
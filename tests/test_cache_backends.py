@@ -0,0 +1,131 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import numpy as np
+from src.utils.cache import Cache
+from src.utils.cache_backends import MemoryBackend, SQLiteBackend, estimate_size
+
+class TestCacheBackends(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'cache.sqlite3')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _sqlite_cache(self, **limits):
+        return Cache(ttl=10, stale_ttl=0, backend=SQLiteBackend(self.path, expire_after=10, **limits))
+
+    def test_estimate_size_counts_array_buffers(self):
+        """Test size estimates include NumPy buffers and nested containers."""
+        self.assertGreater(estimate_size({'salary': np.zeros(1000)}), 8000)
+        self.assertGreater(estimate_size(['a' * 100, ['b' * 100]]), 200)
+
+    def test_estimate_size_extrapolates_large_containers(self):
+        """Test large containers are estimated from a sample and slotted objects are walked."""
+        values = {str(idx): str(idx).rjust(1000) for idx in range(10000)}
+        self.assertAlmostEqual(estimate_size(values), sum(map(sys.getsizeof, values.values())), delta=2000000)
+
+        class Slotted:
+            __slots__ = ('values',)
+
+            def __init__(self):
+                self.values = np.zeros(1000)
+
+        self.assertGreater(estimate_size(Slotted()), 8000)
+
+    def test_memory_backend_is_per_instance(self):
+        """Test memory backends do not share entries."""
+        first = Cache(ttl=10, backend=MemoryBackend(expire_after=10))
+        second = Cache(ttl=10, backend=MemoryBackend(expire_after=10))
+        first.set('job_trends', {'Engineering': 1})
+        self.assertIsNone(second.get('job_trends'))
+
+    def test_sqlite_backend_shared_between_caches(self):
+        """Test caches on the same SQLite file share entries and clears."""
+        worker1 = self._sqlite_cache()
+        worker2 = self._sqlite_cache()
+        
+        worker1.set('job_trends', {'trends': {'Engineering': {'job_count': 2}}})
+        self.assertEqual(worker2.get('job_trends'), {'trends': {'Engineering': {'job_count': 2}}})
+        
+        worker2.clear()
+        self.assertIsNone(worker1.get('job_trends'))
+
+    def test_sqlite_backend_shared_across_processes(self):
+        """Test a value written by another process is visible."""
+        script = (
+            "from src.utils.cache import Cache\n"
+            "from src.utils.cache_backends import SQLiteBackend\n"
+            f"Cache(ttl=10, backend=SQLiteBackend({self.path!r}, expire_after=10)).set('job_trends', [1, 2, 3])\n"
+        )
+        subprocess.run([sys.executable, '-c', script], check=True, capture_output=True,
+                       cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(self._sqlite_cache().get('job_trends'), [1, 2, 3])
+
+    def test_sqlite_backend_reconnects_after_fork(self):
+        backend = SQLiteBackend(self.path, expire_after=60)
+        backend.set('shared', 1, time.time())
+        inherited = backend._connection()
+
+        # A child process inherits the thread-local connection but must open its own
+        backend._local.pid = -1
+        self.assertIsNot(backend._connection(), inherited)
+        self.assertEqual(backend.get('shared')[0], 1)
+
+    def test_sqlite_backend_eviction_and_usage(self):
+        """Test SQLite backend enforces entry limits."""
+        cache = self._sqlite_cache(max_entries=2, policy='lru')
+        cache.set('key1', 'value1')
+        cache.set('key2', 'value2')
+        cache.get('key1')
+        cache.set('key3', 'value3')
+        
+        self.assertIsNone(cache.get('key2'))
+        self.assertEqual(cache.get('key1'), 'value1')
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['backend'], 'SQLiteBackend')
+
+    def test_sqlite_backend_hits_do_not_write(self):
+        """Test reads skip hit bookkeeping without limits and batch it with limits."""
+        unbounded = SQLiteBackend(self.path, expire_after=60)
+        unbounded.set('key1', 'value1', time.time())
+        conn = unbounded._connection()
+        changes = conn.total_changes
+        for _ in range(10):
+            self.assertEqual(unbounded.get('key1')[0], 'value1')
+        self.assertEqual(conn.total_changes, changes)
+
+        bounded = SQLiteBackend(self.path, expire_after=60, max_entries=10, policy='lfu')
+        for _ in range(5):
+            bounded.get('key1')
+        hits = "SELECT hits FROM cache_entries WHERE key = 'key1'"
+        self.assertEqual(bounded._connection().execute(hits).fetchone()[0], 0)
+
+        # Pending hits are recorded before the next write can evict
+        bounded.set('key2', 'value2', time.time())
+        self.assertEqual(bounded._connection().execute(hits).fetchone()[0], 5)
+
+    def test_sqlite_backend_expiry(self):
+        """Test SQLite backend drops entries past expire_after."""
+        cache = Cache(ttl=1, stale_ttl=0, backend=SQLiteBackend(self.path, expire_after=0))
+        cache.set('key1', 'value1')
+        self.assertIsNone(cache.get('key1'))
+
+    def test_sqlite_contains_does_not_unpickle(self):
+        """Test checking for an entry reads its timestamp, not its value."""
+        self._sqlite_cache().set('job_snapshot', {'salary': np.zeros(1000)})
+        cache = self._sqlite_cache()
+        with patch('src.utils.cache_backends.pickle.loads') as mock_loads:
+            self.assertTrue(cache.contains('job_snapshot'))
+            self.assertFalse(cache.contains('missing'))
+        mock_loads.assert_not_called()
+        self.assertTrue(cache.shared)
+        self.assertFalse(Cache(ttl=10, backend=MemoryBackend(expire_after=10)).shared)
@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch
+from src.utils.circuit_breaker import CircuitBreaker
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the circuit."""
+        breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow_request())
+
+    def test_success_resets_failures(self):
+        """Test that a success resets the consecutive failure count."""
+        breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    @patch('src.utils.circuit_breaker.time.time')
+    def test_half_open_trial(self, mock_time):
+        """Test that a single trial request is allowed after the reset timeout."""
+        mock_time.return_value = 1000.0
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow_request())
+        
+        mock_time.return_value = 1031.0
+        self.assertTrue(breaker.allow_request())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(breaker.allow_request())
+        
+        # A failed trial re-opens the circuit, a successful one closes it
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        mock_time.return_value = 1062.0
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    @patch('src.utils.circuit_breaker.time.time')
+    def test_abandoned_trial_times_out(self, mock_time):
+        """Test that a trial recording neither outcome does not block the circuit forever."""
+        mock_time.return_value = 1000.0
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+        mock_time.return_value = 1031.0
+        self.assertTrue(breaker.allow_request())
+        
+        mock_time.return_value = 1050.0
+        self.assertFalse(breaker.allow_request())
+        mock_time.return_value = 1062.0
+        self.assertTrue(breaker.allow_request())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+    def test_disabled_with_zero_threshold(self):
+        """Test that a zero threshold never opens the circuit."""
+        breaker = CircuitBreaker('test', failure_threshold=0, reset_timeout=60)
+        for _ in range(5):
+            breaker.record_failure()
+        self.assertTrue(breaker.allow_request())
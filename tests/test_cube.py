@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+from src.repositories.job_frame import JobFrame
+from src.services.cube import JobCube
+from src.utils.validation import ValidationError
+
+class TestJobCube(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [
+            {'category': 'Engineering', 'salary': 100000, 'location': 'Bangalore', 'experience': '2-4 years', 'company_type': 'Product'},
+            {'category': 'Engineering', 'salary': 140000, 'location': 'Pune', 'experience': '4-6 years', 'company_type': 'Service'},
+            {'category': 'Engineering', 'salary': 120000, 'location': 'Bangalore', 'experience': '4-6 years', 'company_type': 'Product'},
+            {'category': 'Marketing', 'salary': 80000, 'location': 'Pune', 'experience': '2-4 years', 'company_type': 'Product'},
+            {'category': 'Marketing', 'salary': 90000, 'location': 'Bangalore'}
+        ]
+        self.cube = JobCube(JobFrame.from_records(self.records))
+
+    def test_roll_up_matches_raw_rows(self):
+        """Test rolled-up cells match statistics computed from raw rows."""
+        cells = self.cube.query(['location'])
+        self.assertEqual([cell['location'] for cell in cells], ['Bangalore', 'Pune'])
+        
+        bangalore = [job['salary'] for job in self.records if job['location'] == 'Bangalore']
+        self.assertEqual(cells[0]['job_count'], 3)
+        self.assertAlmostEqual(cells[0]['average_salary'], np.mean(bangalore))
+        self.assertAlmostEqual(cells[0]['std_deviation'], np.std(bangalore))
+        self.assertEqual(cells[0]['min_salary'], 90000)
+        self.assertEqual(cells[0]['max_salary'], 120000)
+
+    def test_slice(self):
+        """Test slicing on a dimension value."""
+        cells = self.cube.query(['company_type'], {'category': 'Marketing'})
+        self.assertEqual(cells, [
+            {'company_type': None, 'job_count': 1, 'average_salary': 90000.0,
+             'min_salary': 90000.0, 'max_salary': 90000.0, 'std_deviation': 0.0},
+            {'company_type': 'Product', 'job_count': 1, 'average_salary': 80000.0,
+             'min_salary': 80000.0, 'max_salary': 80000.0, 'std_deviation': 0.0}
+        ])
+        self.assertEqual(self.cube.query(['location'], {'category': 'Unknown'}), [])
+
+    def test_multi_dimension_and_total(self):
+        """Test multi-dimensional group-by and grand total."""
+        cells = self.cube.query(['category', 'location'])
+        self.assertEqual(len(cells), 4)
+        self.assertEqual((cells[0]['category'], cells[0]['location'], cells[0]['job_count']), ('Engineering', 'Bangalore', 2))
+        
+        total = self.cube.query([])
+        self.assertEqual(total[0]['job_count'], 5)
+        self.assertAlmostEqual(total[0]['average_salary'], 106000)
+
+    def test_invalid_dimension(self):
+        """Test unknown and repeated dimensions are rejected."""
+        with self.assertRaises(ValidationError):
+            self.cube.query(['salary'])
+        with self.assertRaises(ValidationError):
+            self.cube.query(['location', 'location'])
+
+    def test_apply_matches_rebuilt_cube(self):
+        """Test deltas applied in place match a cube built from the resulting jobs."""
+        added = [
+            {'category': 'Sales', 'salary': 70000, 'location': 'Pune'},
+            {'category': 'Engineering', 'salary': 160000, 'location': 'Pune', 'experience': '4-6 years', 'company_type': 'Service'}
+        ]
+        removed = [self.records[1], self.records[4]]
+        self.cube.apply(added=JobFrame.from_records(added), removed=JobFrame.from_records(removed))
+
+        jobs = [job for job in self.records if job not in removed] + added
+        rebuilt = JobCube(JobFrame.from_records(jobs))
+        for group_by in ([], ['location'], ['category', 'company_type'], ['category', 'location', 'experience', 'company_type']):
+            key = lambda cell: tuple(str(cell[dim]) for dim in group_by)
+            cells, expected = sorted(self.cube.query(group_by), key=key), sorted(rebuilt.query(group_by), key=key)
+            self.assertEqual(len(cells), len(expected))
+            for cell, expected_cell in zip(cells, expected):
+                for field, value in expected_cell.items():
+                    if isinstance(value, float):
+                        self.assertAlmostEqual(cell[field], value, places=6)
+                    else:
+                        self.assertEqual(cell[field], value)
+        # The removed Pune max (140000) was replaced by the new one; Bangalore lost its min (90000)
+        self.assertEqual([(cell['min_salary'], cell['max_salary']) for cell in self.cube.query(['location'])],
+                         [(100000.0, 120000.0), (70000.0, 160000.0)])
+        self.assertEqual(self.cube.query(['company_type'], {'category': 'Marketing'})[0]['job_count'], 1)
+
+    def test_apply_rejects_missing_job(self):
+        """Test removing an absent job raises ValidationError and leaves the cube unchanged."""
+        before = self.cube.query(['category'])
+        with self.assertRaises(ValidationError):
+            self.cube.apply(removed=JobFrame.from_records([{'category': 'Marketing', 'salary': 90000, 'location': 'Pune'}]))
+        with self.assertRaises(ValidationError):
+            self.cube.apply(removed=JobFrame.from_records([{'category': 'Design', 'salary': 1}]))
+        self.assertEqual(self.cube.query(['category']), before)
@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+from src.repositories.job_frame import JobFrame
+from src.services.forecast import ForecastTable, yearly_series
+
+class TestForecastTable(unittest.TestCase):
+
+    def setUp(self):
+        self.jobs = []
+        for year in range(2019, 2024):
+            self.jobs.append({'category': 'Data Science', 'salary': 100000 + 10000 * (year - 2019),
+                              'location': 'Bangalore', 'year': year})
+            self.jobs.append({'category': 'Data Science', 'salary': 80000 + 10000 * (year - 2019),
+                              'location': 'Pune', 'year': year})
+        self.jobs.append({'category': 'Marketing', 'salary': 70000, 'location': 'Pune', 'year': 2023})
+        self.jobs.append({'category': 'Marketing', 'salary': 90000, 'location': 'Pune'})
+        self.frame = JobFrame.from_records(self.jobs)
+
+    def test_yearly_series(self):
+        """Test yearly averages per group skip jobs without a year."""
+        series = {group: (years, salaries, counts) for group, years, salaries, counts
+                  in yearly_series(self.frame, ('category',))}
+        self.assertEqual(set(series), {('Data Science',), ('Marketing',)})
+        years, salaries, counts = series[('Data Science',)]
+        np.testing.assert_array_equal(years, range(2019, 2024))
+        np.testing.assert_array_equal(salaries, [90000, 100000, 110000, 120000, 130000])
+        np.testing.assert_array_equal(counts, [2] * 5)
+        np.testing.assert_array_equal(series[('Marketing',)][1], [70000])
+
+    def test_forecasts_per_category_and_location(self):
+        """Test every model type forecasts the years after the latest year."""
+        table = ForecastTable.from_frame(self.frame, horizon=2, min_years=2)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.categories(), ['Data Science'])
+        
+        forecast = table.get('Data Science')
+        self.assertEqual(forecast['future_years'], [2024, 2025])
+        self.assertEqual(set(forecast['forecasts']), {'linear', 'polynomial', 'decision_tree', 'auto'})
+        np.testing.assert_allclose(forecast['forecasts']['linear']['predictions'], [140000, 150000])
+        auto = forecast['forecasts']['auto']
+        self.assertEqual((auto['selected_model'], auto['degree']), ('linear', 1))
+        self.assertNotIn('selected_model', forecast['forecasts']['linear'])
+        
+        pune = table.get('Data Science', 'Pune')
+        np.testing.assert_allclose(pune['forecasts']['linear']['predictions'], [130000, 140000])
+        self.assertEqual(pune['history']['job_counts'], [1] * 5)
+        
+        # Too little history
+        self.assertIsNone(table.get('Marketing'))
+        self.assertIsNone(table.get('Data Science', 'Mumbai'))
+
+    def test_no_years(self):
+        """Test a frame without years has no forecasts."""
+        frame = JobFrame.from_records([{'category': 'Engineering', 'salary': 100000}])
+        self.assertEqual(len(ForecastTable.from_frame(frame)), 0)
@@ -0,0 +1,174 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+from src.repositories.job_frame import JobFrame
+from src.services.ai_model import AIModel
+from src.services.incremental import SalaryState, SketchedSalaryState, SortedSalaries, TrendAccumulator
+from src.utils.validation import ValidationError
+
+class TestSalaryState(unittest.TestCase):
+
+    def test_add_and_remove_match_direct_computation(self):
+        """Test merged moments and order statistics against a full recomputation."""
+        rng = np.random.default_rng(3)
+        values = rng.normal(1000000, 250000, 200)
+        state = SalaryState.from_values(values[:50]).add(values[50:]).remove(values[:80])
+        expected = values[80:]
+
+        summary = state.summary()
+        self.assertEqual(summary['job_count'], 120)
+        self.assertAlmostEqual(summary['average_salary'], np.mean(expected), delta=1e-6)
+        self.assertAlmostEqual(summary['std_deviation'], np.std(expected), delta=1e-6)
+        self.assertEqual(summary['median_salary'], np.median(expected))
+        self.assertEqual(summary['min_salary'], expected.min())
+        self.assertEqual(summary['max_salary'], expected.max())
+
+    def test_remove_duplicates_and_everything(self):
+        """Test removing duplicate salaries and emptying the state."""
+        state = SalaryState.from_values([5, 5, 7])
+        self.assertEqual(list(state.remove([5]).salaries.values()), [5, 7])
+        self.assertIsNone(state.remove([5, 7, 5]))
+        with self.assertRaises(ValidationError):
+            state.remove([5, 5, 5])
+
+    def test_sketched_state_merges_batches(self):
+        """Test a sketched state keeps exact moments and estimates quantiles of added minus removed salaries."""
+        rng = np.random.default_rng(11)
+        values = rng.lognormal(13, 0.5, 20000)
+        state = SketchedSalaryState.from_values(values[:5000], k=200)
+        for batch in np.array_split(values[5000:], 10):
+            state = state.add(batch)
+        state = state.remove(values[:4000])
+        expected = np.sort(values[4000:])
+
+        summary = state.summary()
+        self.assertEqual(summary['job_count'], expected.size)
+        self.assertEqual(state.sketch.count, values.size)
+        self.assertEqual(state.removed.count, 4000)
+        self.assertLess(state.sketch.size, 1000)
+        self.assertAlmostEqual(summary['average_salary'], np.mean(expected), delta=1e-3)
+        self.assertAlmostEqual(summary['std_deviation'], np.std(expected), delta=1e-3)
+        for q, estimate in [(0.5, summary['median_salary']), (0.9, summary['salary_percentiles']['p90'])]:
+            rank = np.searchsorted(expected, estimate) / expected.size
+            self.assertLess(abs(rank - q), 0.03)
+
+        self.assertIsNone(state.remove(expected))
+        with self.assertRaises(ValidationError):
+            state.remove(values)
+
+    @patch('src.services.incremental.BLOCK_SIZE', 4)
+    def test_changes_copy_only_touched_blocks(self):
+        """Test blocked salaries stay sorted and in bounds and share untouched blocks."""
+        rng = np.random.default_rng(7)
+        expected = np.sort(rng.integers(0, 20, 64).astype(float))
+        salaries = SortedSalaries.from_sorted(expected)
+        for _ in range(50):
+            batch = np.sort(rng.integers(0, 25, 3).astype(float))
+            if rng.random() < 0.5:
+                updated = salaries.add(batch)
+                expected = np.sort(np.concatenate((expected, batch)))
+            else:
+                batch = rng.choice(expected, 3, replace=False)
+                updated = salaries.remove(batch)
+                for value in batch:
+                    expected = np.delete(expected, np.searchsorted(expected, value))
+            self.assertGreater(len({id(block) for block in salaries.blocks} & {id(block) for block in updated.blocks}), 0)
+            salaries = updated
+            np.testing.assert_array_equal(salaries.values(), expected)
+            self.assertTrue(all(2 <= block.size <= 10 for block in salaries.blocks))
+            np.testing.assert_array_equal(salaries.take([0, 10, len(expected) - 1]),
+                                          expected[[0, 10, len(expected) - 1]])
+
+class TestTrendAccumulator(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [
+            {'category': 'Engineering', 'salary': 100000},
+            {'category': 'Marketing', 'salary': 80000},
+            {'category': 'Engineering', 'salary': 120000},
+            {'category': 'Sales', 'salary': 60000}
+        ]
+
+    def test_matches_analyze_trends(self):
+        """Test accumulated trends equal a full analysis of the same jobs."""
+        frame = JobFrame.from_records(self.records)
+        trends = TrendAccumulator.from_frame(frame).trends()
+        self.assertEqual(trends, AIModel().analyze_trends(frame))
+
+    def test_reuses_known_trends(self):
+        """Test summaries passed to from_frame are served until a category changes."""
+        frame = JobFrame.from_records(self.records)
+        trends = AIModel().analyze_trends(frame)
+        accumulator = TrendAccumulator.from_frame(frame, trends)
+        self.assertIs(accumulator.trends()['Marketing'], trends['Marketing'])
+
+        updated = accumulator.apply(added=JobFrame.from_records([{'category': 'Sales', 'salary': 70000}]))
+        self.assertIs(updated.trends()['Marketing'], trends['Marketing'])
+        self.assertEqual(updated.trends()['Sales']['job_count'], 2)
+        self.assertEqual(updated.categories, ['Engineering', 'Marketing', 'Sales'])
+
+    def test_apply_delta(self):
+        """Test a delta updates only the touched categories."""
+        accumulator = TrendAccumulator.from_frame(JobFrame.from_records(self.records))
+        updated = accumulator.apply(
+            added=JobFrame.from_records([{'category': 'Design', 'salary': 90000},
+                                         {'category': 'Engineering', 'salary': 140000}]),
+            removed=JobFrame.from_records([{'category': 'Sales', 'salary': 60000},
+                                           {'category': 'Engineering', 'salary': 100000}])
+        )
+
+        trends = updated.trends()
+        self.assertEqual(set(trends), {'Engineering', 'Marketing', 'Design'})
+        self.assertEqual(trends['Engineering']['average_salary'], 130000)
+        self.assertEqual(trends['Engineering']['job_count'], 2)
+        self.assertEqual(updated.total.count, 4)
+        self.assertEqual(len(updated), 4)
+        # Untouched state is shared and the original accumulator is unchanged
+        self.assertIs(updated._states['Marketing'], accumulator._states['Marketing'])
+        self.assertEqual(len(accumulator), 4)
+        self.assertIn('Sales', accumulator.trends())
+
+    def test_remove_unknown_job(self):
+        """Test removing a job that is not present raises ValidationError."""
+        accumulator = TrendAccumulator.from_frame(JobFrame.from_records(self.records))
+        with self.assertRaises(ValidationError):
+            accumulator.apply(removed=JobFrame.from_records([{'category': 'Design', 'salary': 1}]))
+        with self.assertRaises(ValidationError):
+            accumulator.apply(removed=JobFrame.from_records([{'category': 'Sales', 'salary': 1}]))
+
+    @patch('src.services.aggregation.Config.AGGREGATION_WORKERS', 3)
+    @patch('src.services.aggregation.Config.AGGREGATION_PARALLEL_THRESHOLD', 0)
+    def test_approximate_mode_merges_sketches(self):
+        """Test sketches built per shard are kept per category and overall and merged with deltas."""
+        rng = np.random.default_rng(5)
+        categories = ['Engineering', 'Marketing', 'Sales', 'Design']
+        records = [{'category': categories[i % 4], 'salary': float(salary)}
+                   for i, salary in enumerate(rng.integers(30000, 300000, 4000))]
+        accumulator = TrendAccumulator.from_frame(JobFrame.from_records(records), sketch_k=50)
+
+        self.assertEqual(accumulator.sketch_k, 50)
+        self.assertEqual(accumulator.categories, categories)
+        self.assertEqual(accumulator.total.sketch.count, 4000)
+        self.assertTrue(all(isinstance(state, SketchedSalaryState) and state.sketch.count == 1000
+                            for state in accumulator._states.values()))
+
+        added = [{'category': 'Engineering', 'salary': 500000.0}] * 10 + [{'category': 'Ops', 'salary': 1000.0}]
+        updated = accumulator.apply(added=JobFrame.from_records(added),
+                                    removed=JobFrame.from_records(records[0:8:4]))
+
+        engineering = updated._states['Engineering']
+        self.assertEqual(engineering.sketch.count, 1010)
+        self.assertEqual(engineering.removed.count, 2)
+        self.assertEqual(updated.total.sketch.count, 4011)
+        self.assertEqual(len(updated), 4009)
+        self.assertEqual(updated._states['Ops'].sketch.k, 50)
+        self.assertIs(updated._states['Design'], accumulator._states['Design'])
+
+        expected = np.sort([job['salary'] for job in records[8::4]] + [500000.0] * 10)
+        trends = updated.trends()
+        self.assertEqual(trends['Engineering']['job_count'], expected.size)
+        self.assertEqual(trends['Engineering']['max_salary'], 500000)
+        self.assertAlmostEqual(trends['Engineering']['average_salary'], np.mean(expected), delta=1e-6)
+        rank = np.searchsorted(expected, trends['Engineering']['median_salary']) / expected.size
+        self.assertLess(abs(rank - 0.5), 0.05)
+        self.assertEqual(trends['Ops']['median_salary'], 1000)
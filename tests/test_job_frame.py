@@ -0,0 +1,143 @@
+import unittest
+import numpy as np
+from src.repositories.job_frame import JobFrame, JobFrameBuilder, JobFrameChanges, MISSING_CODE, as_job_frame
+
+class TestJobFrame(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [
+            {'category': 'Engineering', 'salary': 100000, 'location': 'Bangalore'},
+            {'category': 'Marketing', 'salary': 80000, 'location': 'Mumbai'},
+            {'category': 'Engineering', 'salary': 120000}
+        ]
+
+    def test_from_records_encodes_columns(self):
+        """Test categorical columns are dictionary-encoded in first-seen order."""
+        frame = JobFrame.from_records(self.records)
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(frame.categories('category'), ['Engineering', 'Marketing'])
+        np.testing.assert_array_equal(frame.codes('category'), [0, 1, 0])
+        np.testing.assert_array_equal(frame.codes('location'), [0, 1, MISSING_CODE])
+        self.assertEqual(frame.salary.dtype, np.float64)
+        np.testing.assert_array_equal(frame.salary, [100000, 80000, 120000])
+
+    def test_record_round_trip(self):
+        """Test rows decode back into job dictionaries."""
+        frame = JobFrame.from_records(self.records)
+        self.assertEqual(frame[0], {'category': 'Engineering', 'salary': 100000.0, 'location': 'Bangalore'})
+        self.assertEqual(frame[-1], {'category': 'Engineering', 'salary': 120000.0})
+        self.assertEqual(len(frame.to_records()), 3)
+        with self.assertRaises(IndexError):
+            frame[3]
+
+    def test_missing_and_invalid_salary(self):
+        """Test missing or non-numeric salaries are stored as NaN."""
+        frame = JobFrame.from_records([{'category': 'A'}, {'category': 'B', 'salary': 'high'}])
+        self.assertTrue(np.isnan(frame.salary).all())
+
+    def test_column_decodes_values(self):
+        """Test column decoding returns None for missing values."""
+        frame = JobFrame.from_records(self.records)
+        self.assertEqual(list(frame.column('location')), ['Bangalore', 'Mumbai', None])
+
+    def test_as_job_frame(self):
+        """Test coercion of lists and frames."""
+        frame = JobFrame.from_records(self.records)
+        self.assertIs(as_job_frame(frame), frame)
+        self.assertIsInstance(as_job_frame(self.records), JobFrame)
+        self.assertIsNone(as_job_frame('not jobs'))
+
+    def test_builder_shares_dictionaries_across_chunks(self):
+        """Test incremental encoding matches encoding all records at once."""
+        builder = JobFrameBuilder()
+        builder.extend(self.records[:2])
+        builder.extend(self.records[2:])
+        frame = builder.build()
+        self.assertEqual(len(builder), 3)
+        self.assertEqual(frame.categories('category'), ['Engineering', 'Marketing'])
+        self.assertEqual(frame.to_records(), JobFrame.from_records(self.records).to_records())
+
+    def test_append_merges_dictionaries(self):
+        """Test appending remaps codes of the other frame."""
+        frame = JobFrame.from_records(self.records)
+        other = JobFrame.from_records([{'category': 'Sales', 'salary': 50000}, {'category': 'Marketing', 'salary': 1}])
+        combined = frame.append(other)
+        self.assertEqual(combined.categories('category'), ['Engineering', 'Marketing', 'Sales'])
+        self.assertEqual(combined.to_records(), frame.to_records() + other.to_records())
+
+    def test_remove_matching_rows(self):
+        """Test removal drops one matching row per removed row and unused categories."""
+        frame = JobFrame.from_records(self.records + [self.records[0]])
+        removed = JobFrame.from_records([self.records[0], self.records[1]])
+        remaining = frame.remove(removed)
+        self.assertEqual(remaining.to_records(), [
+            {'category': 'Engineering', 'salary': 120000.0},
+            {'category': 'Engineering', 'salary': 100000.0, 'location': 'Bangalore'}
+        ])
+        self.assertEqual(remaining.categories('category'), ['Engineering'])
+        self.assertEqual(remaining.categories('location'), ['Bangalore'])
+
+    def test_remove_missing_row(self):
+        """Test removing a row that is not present raises ValueError."""
+        frame = JobFrame.from_records(self.records)
+        with self.assertRaises(ValueError):
+            frame.remove(JobFrame.from_records([{'category': 'Engineering', 'salary': 120000, 'location': 'Mumbai'}]))
+        with self.assertRaises(ValueError):
+            frame.remove(JobFrame.from_records([self.records[1], self.records[1]]))
+
+    def test_year_column(self):
+        """Test the optional year column is encoded, decoded and matched on removal."""
+        records = [
+            {'category': 'Engineering', 'salary': 100000, 'year': 2021},
+            {'category': 'Engineering', 'salary': 100000, 'year': 2022},
+            {'category': 'Engineering', 'salary': 100000}
+        ]
+        frame = JobFrame.from_records(records)
+        np.testing.assert_array_equal(frame.year[:2], [2021, 2022])
+        self.assertTrue(np.isnan(frame.year[2]))
+        self.assertEqual(frame.to_records(), records)
+
+        remaining = frame.remove(JobFrame.from_records([records[1]]))
+        self.assertEqual(remaining.to_records(), [records[0], records[2]])
+        self.assertEqual(frame.append(remaining)[-1], records[2])
+
+    def test_validated_marker_propagates(self):
+        """Test appended and reduced frames keep the validated marker when all inputs had it."""
+        frame = JobFrame.from_records(self.records)
+        other = JobFrame.from_records(self.records[:1])
+        self.assertFalse(frame.append(other).validated)
+        
+        frame.validated = other.validated = True
+        self.assertTrue(frame.append(other).validated)
+        self.assertTrue(frame.remove(other).validated)
+        self.assertFalse(frame.append(JobFrame.from_records(self.records)).validated)
+
+    def test_changes_applied_in_one_batch(self):
+        """Test recorded changes match removing and appending every delta in turn."""
+        frame = JobFrame.from_records(self.records + [{'category': 'Sales', 'salary': 1, 'year': 2020}])
+        frame.validated = True
+        changes = JobFrameChanges(frame)
+        first = JobFrame.from_records([{'category': 'Design', 'salary': 2}, {'category': 'Design', 'salary': 3}])
+        first.validated = True
+        changes.record(added=first, removed=JobFrame.from_records([self.records[0]]))
+        # A later delta may remove jobs added by an earlier one
+        changes.record(removed=JobFrame.from_records([{'category': 'Design', 'salary': 2},
+                                                      {'category': 'Sales', 'salary': 1, 'year': 2020}]))
+
+        expected = frame.remove(JobFrame.from_records([self.records[0]])).append(first).remove(
+            JobFrame.from_records([{'category': 'Design', 'salary': 2}, {'category': 'Sales', 'salary': 1, 'year': 2020}]))
+        applied = changes.apply()
+        self.assertEqual(applied.to_records(), expected.to_records())
+        self.assertTrue(applied.validated)
+        self.assertIs(JobFrameChanges(frame).apply(), frame)
+
+    def test_changes_reject_missing_row(self):
+        """Test recording the removal of an absent job raises ValueError and records nothing."""
+        changes = JobFrameChanges(JobFrame.from_records(self.records))
+        with self.assertRaises(ValueError):
+            changes.record(removed=JobFrame.from_records([{'category': 'Engineering', 'salary': 120000,
+                                                           'location': 'Mumbai'}]))
+        with self.assertRaises(ValueError):
+            changes.record(added=JobFrame.from_records([self.records[1]]),
+                           removed=JobFrame.from_records([self.records[1], self.records[1]]))
+        self.assertFalse(changes.pending)
@@ -1,18 +1,38 @@
+import asyncio
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
+from src.repositories.job_frame import JobFrame
 from src.repositories.job_repository import JobRepository
+from src.utils.circuit_breaker import CircuitBreaker
+import httpx
+import json
 import requests
 
+def json_body(payload, chunk_size=16):
+    """Split a JSON payload into byte chunks as iter_content would."""
+    body = json.dumps(payload).encode('utf-8')
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    return lambda **kwargs: iter(chunks)
+
+def fetch_async(repo, handler, times=1):
+    """Fetch job data asynchronously through an httpx client answered by handler."""
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return [await repo.fetch_job_data_async(client) for _ in range(times)]
+    return asyncio.run(fetch())
+
 class TestJobRepository(unittest.TestCase):
 
-    @patch('src.repositories.job_repository.requests.get')
+    @patch('src.repositories.job_repository.requests.Session.get')
     def test_fetch_job_data_success(self, mock_get):
         """Test successful API data fetch."""
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [
+        mock_response.iter_content.side_effect = json_body([
             {'category': 'Engineering', 'salary': 100000}
-        ]
+        ])
         mock_get.return_value = mock_response
         
         repo = JobRepository()
@@ -25,7 +45,7 @@ class TestJobRepository(unittest.TestCase):
         self.assertEqual(len(data['jobs']), 1)
         self.assertEqual(data['jobs'][0]['category'], 'Engineering')
 
-    @patch('src.repositories.job_repository.requests.get')
+    @patch('src.repositories.job_repository.requests.Session.get')
     def test_fetch_job_data_fallback(self, mock_get):
         """Test fallback to mock data on API failure."""
         mock_get.side_effect = requests.exceptions.RequestException("API Error")
@@ -44,7 +64,7 @@ class TestJobRepository(unittest.TestCase):
         self.assertEqual(data['metadata']['region'], 'India')
         self.assertEqual(data['metadata']['currency'], 'INR')
 
-    @patch('src.repositories.job_repository.requests.get')
+    @patch('src.repositories.job_repository.requests.Session.get')
     def test_fetch_job_data_http_error(self, mock_get):
         """Test fallback on HTTP error."""
         mock_response = MagicMock()
@@ -60,3 +80,273 @@ class TestJobRepository(unittest.TestCase):
         self.assertIn('jobs', data)
         self.assertIn('metadata', data)
         self.assertGreater(len(data['jobs']), 0)
+
+    @patch('src.repositories.job_repository.time.sleep')
+    @patch('src.repositories.job_repository.requests.Session.get')
+    def test_fetch_job_data_retries_transient_errors(self, mock_get, mock_sleep):
+        """Test that timeouts and retryable status codes are retried."""
+        unavailable = MagicMock()
+        unavailable.status_code = 503
+        ok = MagicMock()
+        ok.status_code = 200
+        ok.iter_content.side_effect = json_body([{'category': 'Engineering', 'salary': 100000}])
+        mock_get.side_effect = [requests.exceptions.Timeout("timed out"), unavailable, ok]
+        
+        repo = JobRepository()
+        repo.max_retries = 2
+        data = repo.fetch_job_data()
+        
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(data['jobs'][0]['category'], 'Engineering')
+
+    @patch('src.repositories.job_repository.time.sleep')
+    @patch('src.repositories.job_repository.requests.Session.get')
+    def test_fetch_job_data_circuit_opens(self, mock_get, mock_sleep):
+        """Test that repeated failures open the circuit and skip the API."""
+        mock_get.side_effect = requests.exceptions.ConnectionError("refused")
+        
+        repo = JobRepository()
+        repo.max_retries = 0
+        repo.circuit_breaker.failure_threshold = 2
+        for _ in range(2):
+            repo.fetch_job_data()
+        self.assertEqual(mock_get.call_count, 2)
+        
+        data = repo.fetch_job_data()
+        
+        # Circuit is open: fallback is served without calling the API
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(data['metadata']['region'], 'India')
+
+    @patch('src.repositories.job_repository.JobRepository._parse_response')
+    @patch('src.repositories.job_repository.requests.Session.get')
+    def test_unexpected_error_during_trial_reopens_circuit(self, mock_get, mock_parse_response):
+        """Test that an error other than a request failure still ends the half-open trial."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_get.return_value = mock_response
+        mock_parse_response.side_effect = TypeError("unhashable type: 'list'")
+        
+        repo = JobRepository()
+        repo.circuit_breaker.failure_threshold = 1
+        repo.circuit_breaker.reset_timeout = 0
+        repo.circuit_breaker.record_failure()
+        
+        with self.assertRaises(TypeError):
+            repo.fetch_job_data()
+        self.assertEqual(repo.circuit_breaker.state, CircuitBreaker.OPEN)
+        
+        # The next call gets a new trial instead of the fallback forever
+        mock_parse_response.side_effect = None
+        mock_parse_response.return_value = {'jobs': JobFrame.from_records([{'category': 'Engineering', 'salary': 1}]),
+                                            'metadata': {}}
+        self.assertEqual(repo.fetch_job_data()['metadata'], {})
+        self.assertEqual(repo.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    @patch('src.repositories.job_repository.requests.Session.get')
+    def test_fetch_job_data_unexpected_status(self, mock_get):
+        """Test fallback on a 304 without a remembered payload and on other non-200 statuses."""
+        for status_code in (304, 204, 302):
+            mock_response = MagicMock()
+            mock_response.status_code = status_code
+            mock_get.return_value = mock_response
+            
+            repo = JobRepository()
+            data = repo.fetch_job_data()
+            
+            self.assertEqual(data['metadata']['region'], 'India')
+            self.assertGreater(len(data['jobs']), 0)
+            self.assertEqual(repo.circuit_breaker._failures, 1)
+
+    @patch('src.repositories.job_repository.requests.Session.get')
+    def test_fetch_job_data_without_job_list(self, mock_get):
+        """Test that a payload whose jobs are not a list is returned for validation."""
+        for jobs in (None, 42, {'category': 'Engineering'}):
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.headers = {}
+            mock_response.iter_content.side_effect = json_body({'jobs': jobs, 'metadata': {}})
+            mock_get.return_value = mock_response
+            
+            data = JobRepository().fetch_job_data()
+            
+            self.assertEqual(data['jobs'], jobs)
+            self.assertEqual(data['metadata'], {})
+
+    def test_backoff_delay_is_capped(self):
+        """Test that the jittered backoff never exceeds the configured cap."""
+        repo = JobRepository()
+        for attempt in range(10):
+            delay = repo._backoff_delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, 5)
+
+    @patch('src.repositories.job_repository.requests.Session.get')
+    def test_fetch_job_data_not_modified(self, mock_get):
+        """Test that a 304 response reuses the previously parsed payload."""
+        ok = MagicMock()
+        ok.status_code = 200
+        ok.headers = {'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+        ok.iter_content.side_effect = json_body([{'category': 'Engineering', 'salary': 100000}])
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        mock_get.side_effect = [ok, not_modified]
+        
+        repo = JobRepository()
+        first = repo.fetch_job_data()
+        second = repo.fetch_job_data()
+        
+        # Second request carries the validators of the first response
+        headers = mock_get.call_args_list[1].kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Wed, 01 Jan 2025 00:00:00 GMT')
+        self.assertIs(second, first)
+        self.assertIs(second['jobs'], first['jobs'])
+        ok.iter_content.assert_called_once()
+
+    @patch('src.repositories.job_repository.requests.Session.get')
+    def test_fetch_job_data_unconditional_without_validators(self, mock_get):
+        """Test that responses without validators are not revalidated."""
+        ok = MagicMock()
+        ok.status_code = 200
+        ok.headers = {}
+        ok.iter_content.side_effect = json_body([{'category': 'Engineering', 'salary': 100000}])
+        mock_get.return_value = ok
+        
+        repo = JobRepository()
+        repo.fetch_job_data()
+        repo.fetch_job_data()
+        
+        self.assertEqual(mock_get.call_args_list[1].kwargs['headers'], {})
+
+    @patch('src.repositories.job_repository.requests.Session.get')
+    def test_fetch_job_data_streams_jobs_array(self, mock_get):
+        """Test that the jobs array is columnarized in batches with metadata kept."""
+        jobs = [{'category': f'Role {i % 3}', 'salary': 100000 + i, 'location': 'Pune'} for i in range(25)]
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_content.side_effect = json_body(
+            {'metadata': {'region': 'India'}, 'jobs': jobs, 'last_updated': '2025-01-01'}, chunk_size=5
+        )
+        mock_get.return_value = mock_response
+        
+        with patch('src.repositories.job_repository.Config.INGEST_BATCH_SIZE', 4):
+            data = JobRepository().fetch_job_data()
+        
+        self.assertEqual(data['metadata'], {'region': 'India'})
+        self.assertEqual(data['last_updated'], '2025-01-01')
+        self.assertEqual(data['jobs'].to_records(), jobs)
+        self.assertEqual(mock_get.call_args.kwargs['stream'], True)
+        mock_response.close.assert_called()
+
+    @patch('src.repositories.job_repository.requests.Session.get')
+    def test_fetch_job_data_invalid_json(self, mock_get):
+        """Test fallback when the streamed body is not valid JSON."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_content.return_value = iter([b'{"jobs": [{"category": "Eng'])
+        mock_get.return_value = mock_response
+        
+        data = JobRepository().fetch_job_data()
+        
+        self.assertEqual(data['metadata']['region'], 'India')
+        self.assertGreater(len(data['jobs']), 0)
+
+    def test_fetch_job_data_async_streams_and_revalidates(self):
+        """Test the async fetch parses a chunked body and reuses it on 304."""
+        jobs = [{'category': f'Role {i % 3}', 'salary': 100000 + i} for i in range(25)]
+        body = json.dumps({'metadata': {'region': 'India'}, 'jobs': jobs}).encode('utf-8')
+        seen = []
+        
+        async def chunks():
+            for i in range(0, len(body), 5):
+                yield body[i:i + 5]
+        
+        def handler(request):
+            seen.append(request)
+            if len(seen) == 1:
+                return httpx.Response(200, headers={'ETag': '"v1"'}, content=chunks())
+            return httpx.Response(304)
+        
+        with patch('src.repositories.job_repository.Config.INGEST_BATCH_SIZE', 4):
+            first, second = fetch_async(JobRepository(), handler, times=2)
+        
+        self.assertEqual(first['metadata'], {'region': 'India'})
+        self.assertEqual(first['jobs'].to_records(), jobs)
+        self.assertEqual(seen[1].headers['If-None-Match'], '"v1"')
+        self.assertIs(second, first)
+
+    @patch('src.repositories.job_repository.JobRepository._backoff_delay', return_value=0)
+    def test_fetch_job_data_async_retries_and_falls_back(self, mock_backoff):
+        """Test the async fetch retries transient failures, then falls back."""
+        attempts = []
+        
+        def flaky(request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                return httpx.Response(503)
+            return httpx.Response(200, json=[{'category': 'Engineering', 'salary': 100000}])
+        
+        repo = JobRepository()
+        data, = fetch_async(repo, flaky)
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(data['jobs'].to_records(), [{'category': 'Engineering', 'salary': 100000}])
+        
+        def down(request):
+            raise httpx.ConnectError("Connection refused", request=request)
+        
+        data, = fetch_async(repo, down)
+        self.assertEqual(data['metadata']['region'], 'India')
+        self.assertEqual(repo.circuit_breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(repo.circuit_breaker._failures, 1)
+
+    def test_fetch_job_data_reuses_connection_after_not_modified(self):
+        """Test 304 responses hand their keep-alive connection back to the pool."""
+        body = json.dumps([{'category': 'Engineering', 'salary': 100000}]).encode('utf-8')
+        connections = []
+
+        class FeedHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                connections.append(self.client_address)
+
+            def do_GET(self):
+                if self.headers.get('If-None-Match') == '"v1"':
+                    self.send_response(304)
+                    self.send_header('ETag', '"v1"')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', '"v1"')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        async def fetch_async_times(repo, times):
+            async with repo.create_async_client() as client:
+                return [await repo.fetch_job_data_async(client) for _ in range(times)]
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            with patch('src.repositories.job_repository.Config.JOB_DATA_API_URL',
+                       f'http://127.0.0.1:{server.server_port}/jobs'):
+                repo = JobRepository()
+                results = [repo.fetch_job_data() for _ in range(6)]
+                repo.session.close()
+                self.assertTrue(all(result is results[0] for result in results))
+                self.assertEqual(len(connections), 1)
+
+                del connections[:]
+                results = asyncio.run(fetch_async_times(JobRepository(), 6))
+                self.assertTrue(all(result is results[0] for result in results))
+                self.assertEqual(len(connections), 1)
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -1,6 +1,16 @@
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch
+import numpy as np
+from src.repositories.job_frame import JobFrame
 from src.services.job_service import JobService
+from src.utils.cache import Cache
+from src.utils.cache_backends import SQLiteBackend, estimate_size
+from src.utils.executors import get_executor
+from src.utils.validation import ValidationError
 
 class TestJobService(unittest.TestCase):
 
@@ -30,6 +40,302 @@ class TestJobService(unittest.TestCase):
         self.assertEqual(result['trends'], {'Engineering': 110000, 'Marketing': 80000})
         self.assertEqual(result['metadata']['region'], 'India')
 
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_get_job_trends_coalesces_concurrent_misses(self, mock_fetch_job_data):
+        def slow_fetch():
+            time.sleep(0.2)
+            return {
+                'jobs': [{'category': 'Engineering', 'salary': 100000}],
+                'metadata': {'region': 'India'}
+            }
+        mock_fetch_job_data.side_effect = slow_fetch
+
+        service = JobService()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.get_job_trends())) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_fetch_job_data.call_count, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result['trends'] is results[0]['trends'] for result in results))
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_get_job_trends_serves_stale_while_refreshing(self, mock_fetch_job_data):
+        mock_fetch_job_data.side_effect = [
+            {'jobs': [{'category': 'Engineering', 'salary': 100000}], 'metadata': {}},
+            {'jobs': [{'category': 'Engineering', 'salary': 200000}], 'metadata': {}}
+        ]
+
+        service = JobService()
+        service.cache = Cache(ttl=1, stale_ttl=30)
+        first = service.get_job_trends()
+        time.sleep(1.1)
+
+        # Expired entry is returned immediately while the refresh runs in the background
+        stale = service.get_job_trends()
+        self.assertIs(stale['trends'], first['trends'])
+        service._refresh_executor.shutdown(wait=True)
+
+        fresh = service.get_job_trends()
+        self.assertEqual(mock_fetch_job_data.call_count, 2)
+        self.assertEqual(fresh['trends']['Engineering']['average_salary'], 200000)
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_statistics_and_trends_share_one_fetch(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {
+            'jobs': [
+                {'category': 'Engineering', 'salary': 100000, 'location': 'Pune'},
+                {'category': 'Marketing', 'salary': 80000, 'location': 'Pune'}
+            ],
+            'metadata': {'region': 'India'}
+        }
+
+        service = JobService()
+        stats = service.get_statistics()
+        trends = service.get_job_trends()
+        aggregates = service.get_aggregates(['location'])
+        service.get_statistics()
+
+        self.assertEqual(mock_fetch_job_data.call_count, 1)
+        self.assertEqual(stats['total_jobs'], 2)
+        self.assertEqual(stats['overall_average_salary'], 90000)
+        self.assertEqual(stats['salary_percentiles']['p90'], 98000)
+        self.assertEqual(set(trends['trends']), {'Engineering', 'Marketing'})
+        self.assertEqual(aggregates['cells'][0]['job_count'], 2)
+
+        # Clearing the cache invalidates every artifact together
+        service.clear_cache()
+        service.get_statistics()
+        self.assertEqual(mock_fetch_job_data.call_count, 2)
+
+    @patch('src.services.ai_model.AIModel.analyze_trends')
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_unchanged_job_data_reuses_artifacts(self, mock_fetch_job_data, mock_analyze_trends):
+        # A 304 from the feed hands back the same parsed payload
+        payload = {
+            'jobs': JobFrame.from_records([{'category': 'Engineering', 'salary': 100000}]),
+            'metadata': {}
+        }
+        mock_fetch_job_data.return_value = payload
+        mock_analyze_trends.return_value = {'Engineering': {'average_salary': 100000}}
+
+        service = JobService()
+        first = service.get_job_trends()
+        service.cache.delete(JobService.SNAPSHOT_CACHE_KEY)
+        second = service.get_job_trends()
+
+        self.assertEqual(mock_fetch_job_data.call_count, 2)
+        mock_analyze_trends.assert_called_once()
+        self.assertIs(second['trends'], first['trends'])
+
+    @patch('src.utils.cache.Config.CACHE_MAX_BYTES', 20000)
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_snapshot_over_cache_size_limit_is_reused(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {
+            'jobs': [{'category': f'Category {i % 50}', 'salary': 1000.0 * i} for i in range(1, 5001)],
+            'metadata': {}
+        }
+
+        service = JobService()
+        for _ in range(5):
+            self.assertEqual(service.get_statistics()['total_jobs'], 5000)
+        service.get_job_trends()
+        service.get_aggregates(['category'])
+
+        self.assertEqual(mock_fetch_job_data.call_count, 1)
+        self.assertGreater(estimate_size(service._last_snapshot), 20000)
+        self.assertLessEqual(service.cache.stats()['bytes'], 20000)
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_workers_sharing_a_cache_catch_up_without_republishing(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {'jobs': [{'category': 'Engineering', 'salary': 100000}], 'metadata': {}}
+
+        first, second = JobService(), JobService()
+        second.cache = first.cache
+        first.get_statistics()
+        entry = first.cache.get(JobService.SNAPSHOT_CACHE_KEY)
+        for _ in range(3):
+            self.assertEqual(second.get_statistics()['total_jobs'], 1)
+            self.assertEqual(first.get_statistics()['total_jobs'], 1)
+
+        # The second worker fetched once for itself and left the first one's entry in place
+        self.assertEqual(mock_fetch_job_data.call_count, 2)
+        self.assertEqual(first.cache.get(JobService.SNAPSHOT_CACHE_KEY), entry)
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_workers_share_derived_results_and_load_job_data_from_store(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {
+            'jobs': [{'category': ['Engineering', 'Marketing'][i % 2], 'salary': 1000.0 * i} for i in range(1, 2001)],
+            'metadata': {}
+        }
+
+        with tempfile.TemporaryDirectory() as directory, \
+                patch('src.services.job_service.Config.SNAPSHOT_DIR', os.path.join(directory, 'snapshots')):
+            first, second = JobService(), JobService()
+            for service in (first, second):
+                service.cache = Cache(ttl=600, backend=SQLiteBackend(os.path.join(directory, 'cache.sqlite3'), 600))
+            first.get_job_trends()
+            first._persist_executor.submit(lambda: None).result()
+
+            # The entry holds the saved version and derived results, not the job data
+            entry = second.cache.get(JobService.SNAPSHOT_CACHE_KEY)
+            self.assertEqual(entry['base'], (first.snapshot_store.current_version(), []))
+            self.assertNotIn('jobs', entry)
+            self.assertLess(second.cache.stats()['bytes'], estimate_size(first._last_snapshot['jobs']) / 4)
+            with patch.object(second.snapshot_store, 'load') as mock_load:
+                self.assertEqual(second.get_job_trends(), first.get_job_trends())
+                self.assertEqual(second.get_statistics()['total_jobs'], 2000)
+            mock_load.assert_not_called()
+
+            # The job data is memory-mapped from the store instead of fetched
+            cells = second.get_aggregates(['category'])['cells']
+            self.assertEqual({cell['category']: cell['job_count'] for cell in cells},
+                             {'Engineering': 1000, 'Marketing': 1000})
+            self.assertIsInstance(second._last_snapshot['jobs'].salary.base, np.memmap)
+
+            # Deltas reach the other worker through the entry's log and are not lost
+            first.apply_delta({'added': [{'category': 'Sales', 'salary': 50000}] * 2,
+                               'removed': [{'category': 'Engineering', 'salary': 2000.0}]})
+            self.assertLess(second.cache.stats()['bytes'], estimate_size(first._last_snapshot['jobs']) / 4)
+            self.assertEqual(second.get_statistics()['total_jobs'], 2001)
+            second.apply_delta({'added': [{'category': 'Design', 'salary': 70000}]})
+            cells = first.get_aggregates(['category'])['cells']
+            self.assertEqual({cell['category']: cell['job_count'] for cell in cells},
+                             {'Engineering': 999, 'Marketing': 1000, 'Sales': 2, 'Design': 1})
+
+            # Once the flushed frame is saved, workers load it without replaying the log
+            second.flush_deltas()
+            second._persist_executor.submit(lambda: None).result()
+            self.assertEqual(second.cache.get(JobService.SNAPSHOT_CACHE_KEY)['base'],
+                             (second.snapshot_store.current_version(), []))
+            self.assertEqual(first.get_statistics()['total_jobs'], 2002)
+            self.assertEqual(len(first._get_snapshot()['jobs']), 2002)
+            first.flush_deltas()
+            self.assertEqual(mock_fetch_job_data.call_count, 1)
+            for service in (first, second):
+                service._persist_executor.shutdown(wait=True)
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_apply_delta_updates_snapshot(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {
+            'jobs': [
+                {'category': 'Engineering', 'salary': 100000, 'location': 'Pune'},
+                {'category': 'Marketing', 'salary': 80000, 'location': 'Pune'}
+            ],
+            'metadata': {'region': 'India'}
+        }
+
+        service = JobService()
+        service.get_job_trends()
+        result = service.apply_delta({
+            'added': [{'category': 'Engineering', 'salary': 140000, 'location': 'Delhi'}],
+            'removed': [{'category': 'Marketing', 'salary': 80000, 'location': 'Pune'}]
+        })
+        service.apply_delta({'added': [{'category': 'Sales', 'salary': 60000}]})
+
+        self.assertEqual(result, {'added': 1, 'removed': 1, 'total_jobs': 2})
+        self.assertEqual(mock_fetch_job_data.call_count, 1)
+        trends = service.get_job_trends()['trends']
+        self.assertEqual(set(trends), {'Engineering', 'Sales'})
+        self.assertEqual(trends['Engineering']['average_salary'], 120000)
+        stats = service.get_statistics()
+        self.assertEqual(stats['total_jobs'], 3)
+        self.assertEqual(stats['categories'], ['Engineering', 'Sales'])
+        self.assertEqual(stats['overall_median_salary'], 100000)
+        cells = service.get_aggregates(['location'])['cells']
+        self.assertEqual({cell['location']: cell['job_count'] for cell in cells}, {'Pune': 1, 'Delhi': 1, None: 1})
+
+    @patch('src.services.aggregation.Config.QUANTILE_MODE', 'approximate')
+    @patch('src.services.aggregation.Config.QUANTILE_SKETCH_K', 20)
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_approximate_quantiles_keep_sketches_in_snapshot(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {
+            'jobs': [{'category': ['Engineering', 'Marketing'][i % 2], 'salary': 1000.0 * i} for i in range(1, 201)],
+            'metadata': {}
+        }
+
+        service = JobService()
+        stats = service.get_statistics()
+        self.assertEqual(stats['quantile_mode'], 'approximate')
+        accumulator = service._get_snapshot()['accumulator']
+        self.assertEqual(accumulator.sketch_k, 20)
+        self.assertEqual(accumulator.total.sketch.count, 200)
+
+        service.apply_delta({
+            'added': [{'category': 'Engineering', 'salary': 500000.0}],
+            'removed': [{'category': 'Marketing', 'salary': 1000.0}]
+        })
+
+        snapshot = service._get_snapshot()
+        engineering = snapshot['accumulator']._states['Engineering']
+        self.assertEqual(engineering.sketch.count, 101)
+        self.assertEqual(engineering.sketch.k, 20)
+        self.assertEqual(snapshot['accumulator'].total.sketch.count, 201)
+        stats = service.get_statistics()
+        self.assertEqual(stats['total_jobs'], 200)
+        self.assertEqual(stats['quantile_mode'], 'approximate')
+        self.assertEqual(stats['salary_range']['max'], 500000)
+        self.assertLess(abs(stats['overall_median_salary'] - 101000), 15000)
+        self.assertEqual(service.get_job_trends()['trends']['Engineering']['job_count'], 101)
+        self.assertEqual(mock_fetch_job_data.call_count, 1)
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_deltas_flushed_to_job_frame_in_one_batch(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {
+            'jobs': [{'category': 'Engineering', 'salary': 100000 + 10000 * i, 'year': 2020 + i} for i in range(3)],
+            'metadata': {}
+        }
+
+        service = JobService()
+        service.get_forecast('Engineering')
+        frame = service._last_snapshot['jobs']
+        with patch.object(service, '_schedule_forecasts') as mock_schedule, \
+                patch.object(service, '_persist_snapshot') as mock_persist:
+            for i in range(5):
+                service.apply_delta({'added': [{'category': 'Sales', 'salary': 50000 + i, 'year': 2022}]})
+            service.apply_delta({'removed': [{'category': 'Sales', 'salary': 50000, 'year': 2022}]})
+            self.assertIs(service._last_snapshot['jobs'], frame)
+            mock_schedule.assert_not_called()
+            mock_persist.assert_not_called()
+            self.assertEqual(service.get_statistics()['total_jobs'], 7)
+
+            service.flush_deltas()
+            service.flush_deltas()
+
+        snapshot = service._last_snapshot
+        self.assertEqual(len(snapshot['jobs']), 7)
+        self.assertIsNone(snapshot['changes'])
+        self.assertEqual(sorted(snapshot['jobs'].salary[3:]), [50001, 50002, 50003, 50004])
+        mock_schedule.assert_called_once_with(snapshot['jobs'])
+        mock_persist.assert_called_once_with(snapshot)
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_apply_delta_rejects_unknown_removal(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {'jobs': [{'category': 'Engineering', 'salary': 100000}], 'metadata': {}}
+
+        service = JobService()
+        with self.assertRaises(ValidationError):
+            service.apply_delta({'removed': [{'category': 'Engineering', 'salary': 1}]})
+        with self.assertRaises(ValidationError):
+            service.apply_delta({'added': 'not jobs'})
+        with self.assertRaises(ValidationError):
+            # Category and salary match, but the job has no location
+            service.apply_delta({'removed': [{'category': 'Engineering', 'salary': 100000, 'location': 'Pune'}]})
+        self.assertEqual(service.get_statistics()['total_jobs'], 1)
+        self.assertEqual(service.get_aggregates([])['cells'][0]['job_count'], 1)
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_statistics_without_job_data(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {'jobs': [], 'metadata': {}}
+
+        service = JobService()
+        self.assertEqual(service.get_statistics()['total_jobs'], 0)
+        with self.assertRaises(ValidationError):
+            service.get_job_trends()
+
     @patch('src.services.ai_model.AIModel.predict')
     def test_predict_job_trends(self, mock_predict):
         mock_predict.return_value = {'predictions': [130000, 140000]}
@@ -43,3 +349,196 @@ class TestJobService(unittest.TestCase):
         prediction = service.predict_job_trends(input_data)
 
         self.assertEqual(prediction, {'predictions': [130000, 140000]})
+
+    @patch('src.services.ai_model.AIModel.predict')
+    def test_predict_job_trends_memoizes_identical_inputs(self, mock_predict):
+        mock_predict.return_value = {'predictions': [130000, 140000], 'model_type': 'linear', 'confidence_score': 1.0}
+
+        service = JobService()
+        input_data = {
+            'years': [2020, 2021, 2022],
+            'salaries': [100000, 110000, 120000],
+            'future_years': [2023, 2024]
+        }
+        first = service.predict_job_trends(input_data)
+        first['predictions'].append(0)
+        # Same series written with floats normalizes to the same key
+        second = service.predict_job_trends({
+            'years': [2020.0, 2021.0, 2022.0],
+            'salaries': [100000.0, 110000.0, 120000.0],
+            'future_years': [2023.0, 2024.0]
+        })
+
+        self.assertEqual(mock_predict.call_count, 1)
+        self.assertEqual(second['predictions'], [130000, 140000])
+        self.assertEqual(service.get_cache_stats()['predictions']['hits'], 1)
+
+        service.predict_job_trends(dict(input_data, future_years=[2025]))
+        self.assertEqual(mock_predict.call_count, 2)
+
+        service.clear_cache()
+        service.predict_job_trends(input_data)
+        self.assertEqual(mock_predict.call_count, 3)
+
+    @patch('src.services.ai_model.AIModel.predict')
+    def test_predict_job_trends_skips_memoizing_truncated_selection(self, mock_predict):
+        mock_predict.return_value = {'predictions': [130000], 'model_type': 'auto', 'selected_model': 'linear',
+                                     'degree': 1, 'confidence_score': 0.9, 'budget_exceeded': True}
+
+        service = JobService()
+        input_data = {'years': [2020, 2021, 2022], 'salaries': [100000, 110000, 120000], 'future_years': [2023]}
+        service.predict_job_trends(input_data)
+        service.predict_job_trends(input_data)
+
+        self.assertEqual(mock_predict.call_count, 2)
+
+    def test_prediction_cache_key_includes_model(self):
+        service = JobService()
+        input_data = {'years': [2020, 2021], 'salaries': [1, 2], 'future_years': [2022]}
+        linear_key = service.ai_model.cache_key(input_data)
+
+        service.ai_model.model_type = 'decision_tree'
+        self.assertNotEqual(service.ai_model.cache_key(input_data), linear_key)
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_get_forecast_refreshes_with_snapshot(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {
+            'jobs': [{'category': 'Engineering', 'salary': 100000 + 10000 * i, 'year': 2020 + i} for i in range(3)],
+            'metadata': {}
+        }
+
+        service = JobService()
+        forecast = service.get_forecast('Engineering')
+        self.assertEqual(forecast['future_years'][0], 2023)
+        self.assertAlmostEqual(forecast['forecasts']['linear']['predictions'][0], 130000)
+        self.assertIsNone(service.get_forecast('Marketing'))
+
+        service.apply_delta({'added': [{'category': 'Engineering', 'salary': 150000, 'year': 2023}]})
+        service.flush_deltas()
+        service._pending_forecast[1].result()
+        forecast = service.get_forecast('Engineering')
+        self.assertEqual(forecast['future_years'][0], 2024)
+        self.assertAlmostEqual(forecast['forecasts']['linear']['predictions'][0], 160000)
+
+    @patch('src.services.job_service.ForecastTable.from_frame')
+    def test_superseded_forecast_builds_skipped(self, mock_from_frame):
+        release = threading.Event()
+
+        def build(frame):
+            release.wait(5)
+            return ('table', frame)
+
+        mock_from_frame.side_effect = build
+        service = JobService()
+        running = service._schedule_forecasts('first')
+        time.sleep(0.05)
+        superseded = service._schedule_forecasts('second')
+        latest = service._schedule_forecasts('third')
+        release.set()
+
+        self.assertEqual(running.result(timeout=5), ('table', 'first'))
+        self.assertIs(superseded, latest)
+        self.assertEqual(latest.result(timeout=5), ('table', 'third'))
+        self.assertEqual([call.args[0] for call in mock_from_frame.call_args_list], ['first', 'third'])
+        self.assertEqual(service._forecasts, ('third', ('table', 'third')))
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_get_forecast_without_years(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {'jobs': [{'category': 'Engineering', 'salary': 100000}], 'metadata': {}}
+        self.assertIsNone(JobService().get_forecast('Engineering'))
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_job_data_validated_once_at_ingestion(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {'jobs': [{'category': 'Engineering', 'salary': 100000}], 'metadata': {}}
+
+        service = JobService()
+        service.get_job_trends()
+        frame = service._get_snapshot()['jobs']
+        self.assertTrue(frame.validated)
+
+        # Marked frames are trusted downstream instead of being checked again
+        frame.salary[0] = -1
+        service.ai_model.analyze_trends(frame)
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_warm_start_from_snapshot_store(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {'jobs': [{'category': 'Engineering', 'salary': 100000}], 'metadata': {}}
+
+        with tempfile.TemporaryDirectory() as directory, \
+                patch('src.services.job_service.Config.SNAPSHOT_DIR', directory):
+            first = JobService()
+            first.get_job_trends()
+            first._persist_executor.shutdown(wait=True)
+
+            # A new process serves the saved snapshot without fetching while it is fresh
+            mock_fetch_job_data.return_value = {'jobs': [{'category': 'Marketing', 'salary': 80000}], 'metadata': {}}
+            second = JobService()
+            self.assertEqual(list(second.get_job_trends()['trends']), ['Engineering'])
+            self.assertEqual(second.get_aggregates(['category'])['cells'][0]['job_count'], 1)
+            self.assertEqual(mock_fetch_job_data.call_count, 1)
+            second._persist_executor.shutdown(wait=True)
+
+            # Once older than the cache TTL it is served stale while a fresh fetch runs in the background
+            time.sleep(0.1)
+            with patch('src.utils.cache.Config.CACHE_TTL', 0.05):
+                second = JobService()
+            self.assertEqual(list(second.get_job_trends()['trends']), ['Engineering'])
+            for _ in range(100):
+                if list(second.get_job_trends()['trends']) == ['Marketing']:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(list(second.get_job_trends()['trends']), ['Marketing'])
+            self.assertEqual(mock_fetch_job_data.call_count, 2)
+            second._persist_executor.shutdown(wait=True)
+
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_switches_to_version_saved_by_another_worker(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {'jobs': [{'category': 'Engineering', 'salary': 100000}], 'metadata': {}}
+
+        with tempfile.TemporaryDirectory() as directory, \
+                patch('src.services.job_service.Config.SNAPSHOT_DIR', directory), \
+                patch('src.services.job_service.Config.SNAPSHOT_POLL_INTERVAL', 0):
+            first = JobService()
+            second = JobService()
+            first.get_job_trends()
+            first._persist_executor.submit(lambda: None).result()
+
+            # The second worker maps the saved version instead of fetching
+            self.assertEqual(list(second.get_job_trends()['trends']), ['Engineering'])
+            self.assertEqual(mock_fetch_job_data.call_count, 1)
+            self.assertEqual(second._store_version, first.snapshot_store.current_version())
+
+            # ... and switches when the first worker publishes a newer version
+            mock_fetch_job_data.return_value = {'jobs': [{'category': 'Marketing', 'salary': 80000}], 'metadata': {}}
+            first.clear_cache()
+            first.get_job_trends()
+            first._persist_executor.submit(lambda: None).result()
+            self.assertEqual(list(second.get_job_trends()['trends']), ['Marketing'])
+            self.assertEqual(mock_fetch_job_data.call_count, 2)
+            second._persist_executor.shutdown(wait=True)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requires fork")
+    @patch('src.repositories.job_repository.JobRepository.fetch_job_data')
+    def test_preload_before_fork(self, mock_fetch_job_data):
+        mock_fetch_job_data.return_value = {'jobs': [{'category': 'Engineering', 'salary': 100000}], 'metadata': {}}
+
+        service = JobService()
+        service.preload()
+        self.assertTrue(service.has_snapshot())
+        get_executor('model-selection', 2).submit(lambda: None).result()
+
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                service.after_fork()
+                # The worker serves the preloaded data and can start new pool threads
+                served = list(service.get_job_trends()['trends']) == ['Engineering']
+                service._refresh_executor.submit(lambda: None).result(timeout=5)
+                get_executor('model-selection', 2).submit(lambda: None).result(timeout=5)
+                code = 0 if served and mock_fetch_job_data.call_count == 1 else 1
+            finally:
+                os._exit(code)
+
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
@@ -0,0 +1,60 @@
+import json
+import unittest
+from src.utils.json_stream import parse_json_stream
+
+def chunked(text, size):
+    body = text.encode('utf-8')
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+class TestParseJsonStream(unittest.TestCase):
+
+    def parse(self, text, size=3, batch_size=2, array_key='jobs'):
+        batches = []
+        document, streamed = parse_json_stream(chunked(text, size), batches.append,
+                                               array_key=array_key, batch_size=batch_size)
+        return document, streamed, batches
+
+    def test_streams_array_in_object(self):
+        payload = {'metadata': {'region': 'India'}, 'jobs': [{'salary': i} for i in range(5)], 'count': 5}
+        document, streamed, batches = self.parse(json.dumps(payload))
+
+        self.assertTrue(streamed)
+        self.assertEqual(document, {'metadata': {'region': 'India'}, 'count': 5})
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(sum(batches, []), payload['jobs'])
+
+    def test_streams_top_level_array(self):
+        document, streamed, batches = self.parse('[1, 2, 3]')
+
+        self.assertIsNone(document)
+        self.assertTrue(streamed)
+        self.assertEqual(sum(batches, []), [1, 2, 3])
+
+    def test_numbers_split_across_chunks(self):
+        # Every chunk boundary falls inside or right after a number
+        values = [123456789, -0.5, 1e-07, 98765.4321, 0]
+        for size in range(1, 8):
+            document, streamed, batches = self.parse(json.dumps({'jobs': values, 'n': 123456}), size=size)
+            self.assertEqual(sum(batches, []), values)
+            self.assertEqual(document, {'n': 123456})
+
+    def test_multibyte_characters_split_across_chunks(self):
+        payload = {'jobs': [{'location': 'Bengaluru ₹ भारत'}]}
+        for size in range(1, 5):
+            _, _, batches = self.parse(json.dumps(payload, ensure_ascii=False), size=size)
+            self.assertEqual(batches, [payload['jobs']])
+
+    def test_empty_array_and_object(self):
+        self.assertEqual(self.parse('{"jobs": []}'), ({}, True, []))
+        self.assertEqual(self.parse(' {} '), ({}, False, []))
+
+    def test_non_array_value_is_decoded(self):
+        document, streamed, batches = self.parse('{"jobs": null, "other": [1, 2]}')
+        self.assertEqual(document, {'jobs': None, 'other': [1, 2]})
+        self.assertFalse(streamed)
+        self.assertEqual(batches, [])
+
+    def test_invalid_json(self):
+        for text in ('{"jobs": [1, 2', '{"jobs": [1 2]}', '[1, 2] x', '', '{jobs: []}'):
+            with self.assertRaises(json.JSONDecodeError):
+                self.parse(text)
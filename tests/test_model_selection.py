@@ -0,0 +1,75 @@
+import math
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from sklearn.tree import DecisionTreeRegressor
+from src.services.model_selection import evaluate_estimator, select_model
+
+def create_tree():
+    return DecisionTreeRegressor(random_state=42, max_depth=5)
+
+class TestModelSelection(unittest.TestCase):
+
+    def setUp(self):
+        self.years = np.arange(2016, 2024, dtype=np.float64)
+        self.future = np.array([2024.0, 2025.0])
+
+    def test_selects_linear_for_linear_data(self):
+        """Test a linear trend selects the simplest exact candidate."""
+        salaries = 1000000 + 50000 * (self.years - 2016)
+        selected, complete = select_model(self.years, salaries, self.future, create_tree, max_degree=3, budget=5)
+        self.assertTrue(complete)
+        self.assertEqual(selected['model_type'], 'linear')
+        self.assertEqual(selected['degree'], 1)
+        np.testing.assert_allclose(selected['predictions'], [1400000, 1450000])
+        self.assertAlmostEqual(selected['score'], 1.0)
+
+    def test_selects_polynomial_for_curved_data(self):
+        """Test a quadratic trend selects the quadratic candidate."""
+        salaries = 1000000 + 2000 * (self.years - 2016) ** 2
+        selected, _ = select_model(self.years, salaries, self.future, create_tree, max_degree=3, budget=5)
+        self.assertEqual((selected['model_type'], selected['degree']), ('polynomial', 2))
+        np.testing.assert_allclose(selected['predictions'], [1128000, 1162000])
+
+    def test_tree_score_is_held_out(self):
+        """Test the tree is scored on points it was not fitted on."""
+        salaries = 1000000 + 50000 * (self.years - 2016)
+        _, score = evaluate_estimator(self.years, salaries, self.future, create_tree)
+        self.assertLess(score, 1.0)
+        self.assertIsNone(evaluate_estimator(self.years[:1], salaries[:1], self.future, create_tree))
+
+    def test_budget_drops_slow_candidates(self):
+        """Test candidates still running when the budget expires are ignored."""
+        def slow_tree():
+            import time
+            time.sleep(0.05)
+            return create_tree()
+
+        salaries = 1000000 + 2000 * (self.years - 2016) ** 2
+        selected, complete = select_model(self.years, salaries, self.future, slow_tree, max_degree=2, budget=0.02)
+        self.assertIn(selected['model_type'], ('linear', 'polynomial'))
+        self.assertFalse(complete)
+
+    def test_unlimited_budget_on_own_executor(self):
+        """Test an infinite budget waits for every candidate on the given pool."""
+        threads = []
+
+        def slow_tree():
+            import threading
+            import time
+            threads.append(threading.current_thread().name)
+            time.sleep(0.05)
+            return create_tree()
+
+        salaries = 1000000 + 2000 * (self.years - 2016) ** 2
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='own') as executor:
+            selected, complete = select_model(self.years, salaries, self.future, slow_tree, max_degree=2,
+                                              budget=math.inf, executor=executor)
+        self.assertTrue(complete)
+        self.assertEqual((selected['model_type'], selected['degree']), ('polynomial', 2))
+        self.assertTrue(threads)
+        self.assertTrue(all(name.startswith('own') for name in threads))
+
+    def test_nothing_to_validate(self):
+        """Test a single point has no cross-validated candidate."""
+        self.assertEqual(select_model(self.years[:1], np.array([1.0]), self.future, create_tree, budget=5), (None, True))
@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+from src.services.quantile_sketch import KLLSketch, batch_quantiles
+
+class TestKLLSketch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.values = rng.lognormal(13, 0.6, 200000)
+        self.sorted_values = np.sort(self.values)
+        self.qs = [0.1, 0.25, 0.5, 0.75, 0.9]
+
+    def assert_ranks_close(self, sketch, tolerance=0.02):
+        for q, estimate in zip(self.qs, sketch.quantiles(self.qs)):
+            rank = np.searchsorted(self.sorted_values, estimate) / self.values.size
+            self.assertLess(abs(rank - q), tolerance)
+
+    def test_quantiles_within_rank_error(self):
+        """Test estimates stay within the rank error bound of the sketch."""
+        sketch = KLLSketch.from_values(self.values, k=200)
+        self.assertEqual(sketch.count, self.values.size)
+        self.assertLess(sketch.size, 1000)
+        self.assert_ranks_close(sketch)
+
+    def test_merge_of_shards(self):
+        """Test merged shard sketches are as accurate as one sketch."""
+        shards = [KLLSketch.from_values(part, k=200) for part in np.array_split(self.values, 8)]
+        merged = shards[0]
+        for shard in shards[1:]:
+            merged = merged.merge(shard)
+        self.assertEqual(merged.count, self.values.size)
+        self.assertEqual(merged.min, self.values.min())
+        self.assertEqual(merged.max, self.values.max())
+        self.assert_ranks_close(merged)
+
+    def test_incremental_updates(self):
+        """Test many small batches give the same accuracy."""
+        sketch = KLLSketch(k=200)
+        for batch in np.array_split(self.values, 500):
+            sketch.update(batch)
+        self.assertEqual(sketch.count, self.values.size)
+        self.assert_ranks_close(sketch)
+
+    def test_small_input_is_exact(self):
+        """Test inputs smaller than k are kept exactly."""
+        sketch = KLLSketch.from_values([3.0, 1.0, 2.0, np.nan], k=10)
+        self.assertEqual(sketch.count, 3)
+        self.assertEqual(sketch.quantile(0), 1.0)
+        self.assertEqual(sketch.quantile(0.5), 2.0)
+        self.assertEqual(sketch.quantile(1), 3.0)
+
+    def test_removed_values(self):
+        """Test quantiles of added minus removed values."""
+        sketch = KLLSketch.from_values([1.0, 2.0, 3.0, 4.0, 5.0], k=10)
+        removed = KLLSketch.from_values([1.0, 5.0], k=10)
+        np.testing.assert_array_equal(sketch.quantiles([0, 0.5, 1], removed), [2.0, 3.0, 4.0])
+        self.assertIsNone(sketch.quantiles([0.5], KLLSketch.from_values(range(1, 6), k=10)))
+
+        removed = KLLSketch.from_values(self.values[:50000], k=200)
+        remaining = np.sort(self.values[50000:])
+        for q, estimate in zip(self.qs, KLLSketch.from_values(self.values, k=200).quantiles(self.qs, removed)):
+            rank = np.searchsorted(remaining, estimate) / remaining.size
+            self.assertLess(abs(rank - q), 0.03)
+
+    def test_segments_and_batch_quantiles(self):
+        """Test per-segment sketches and batched estimates match single sketches."""
+        values = self.values[:3000]
+        starts, counts = np.array([0, 10, 2010]), np.array([10, 2000, 990])
+        sketches = KLLSketch.from_segments(values, starts, counts, k=200)
+        self.assertEqual([sketch.count for sketch in sketches], [10, 2000, 990])
+        self.assertEqual(sketches[0].quantile(1), values[:10].max())
+        self.assertLess(sketches[1].size, 2000)
+
+        batched = batch_quantiles(sketches, self.qs)
+        for sketch, estimates in zip(sketches, batched):
+            np.testing.assert_array_equal(estimates, sketch.quantiles(self.qs))
+        # Segments of at most k values are kept exactly
+        self.assertEqual(batched[0][2], np.sort(values[:10])[4])
+
+    def test_empty_and_invalid(self):
+        """Test empty sketches and invalid arguments."""
+        self.assertIsNone(KLLSketch().quantile(0.5))
+        with self.assertRaises(ValueError):
+            KLLSketch(k=1)
+        with self.assertRaises(ValueError):
+            KLLSketch().quantiles([1.5])
+        with self.assertRaises(ValueError):
+            KLLSketch(k=10).merge(KLLSketch(k=20))
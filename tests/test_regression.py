@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from src.services.regression import PolynomialFit, fit_polynomial_batch, loo_predictions, r2_score
+
+class TestPolynomialFit(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        self.years = np.arange(2010, 2024, dtype=np.float64)
+        self.salaries = 1000000 + 50000 * (self.years - 2010) + rng.normal(0, 20000, self.years.size)
+        self.future = np.array([2024.0, 2025.0, 2026.0])
+
+    def test_linear_matches_sklearn(self):
+        """Test the closed-form linear fit against LinearRegression."""
+        fit = PolynomialFit.fit(self.years, self.salaries, 1)
+        model = LinearRegression().fit(self.years.reshape(-1, 1), self.salaries)
+        
+        np.testing.assert_allclose(fit.predict(self.future), model.predict(self.future.reshape(-1, 1)), rtol=1e-9)
+        self.assertAlmostEqual(fit.score(self.years, self.salaries),
+                               model.score(self.years.reshape(-1, 1), self.salaries), places=9)
+
+    def test_polynomial_matches_reference(self):
+        """Test a quadratic fit against a fit in a well-conditioned basis."""
+        fit = PolynomialFit.fit(self.years, self.salaries, 2)
+        reference = np.polynomial.Polynomial.fit(self.years, self.salaries, 2)
+        
+        np.testing.assert_allclose(fit.predict(self.future), reference(self.future), rtol=1e-9)
+
+    def test_rank_deficient_returns_none(self):
+        """Test too few distinct years for the degree has no closed-form fit."""
+        self.assertIsNone(PolynomialFit.fit([2020.0], [100000.0], 1))
+        self.assertIsNone(PolynomialFit.fit([2020.0, 2021.0, 2021.0], [1.0, 2.0, 3.0], 2))
+
+    def test_r2_score_constant_target(self):
+        """Test R² follows scikit-learn for constant targets."""
+        y = np.array([5.0, 5.0, 5.0])
+        self.assertEqual(r2_score(y, y), 1.0)
+        self.assertEqual(r2_score(y, np.array([5.0, 5.0, 6.0])), 0.0)
+        self.assertEqual(r2_score(np.array([1.0, 2.0, 3.0]), np.array([1.0, 2.0, 3.0])), 1.0)
+
+    def test_batch_matches_single_fits(self):
+        """Test batched fits of mixed shapes against individual fits, in input order."""
+        years = [self.years, self.years[:5], self.years]
+        salaries = [self.salaries, self.salaries[:5], self.salaries[::-1]]
+        future = [self.future, self.future[:1], self.future]
+        
+        for degree in (1, 2):
+            results = fit_polynomial_batch(years, salaries, future, degree)
+            self.assertEqual(len(results), 3)
+            for x, y, f, (predictions, score) in zip(years, salaries, future, results):
+                fit = PolynomialFit.fit(x, y, degree)
+                np.testing.assert_allclose(predictions, fit.predict(f), rtol=1e-9)
+                self.assertAlmostEqual(score, fit.score(x, y), places=9)
+
+    def test_batch_rank_deficient_returns_none(self):
+        """Test rank-deficient series in a batch are left to another solver."""
+        results = fit_polynomial_batch([[2020.0], [2020.0, 2021.0], [2021.0]],
+                                       [[1.0], [1.0, 3.0], [2.0]], [[2021.0], [2022.0], [2022.0]], 1)
+        self.assertIsNone(results[0])
+        self.assertIsNone(results[2])
+        np.testing.assert_allclose(results[1][0], [5.0])
+        self.assertEqual(results[1][1], 1.0)
+
+    def test_loo_predictions_match_refits(self):
+        """Test closed-form leave-one-out predictions against explicit refits."""
+        for degree in (1, 2):
+            held_out = loo_predictions(self.years, self.salaries, degree)
+            expected = [PolynomialFit.fit(np.delete(self.years, idx), np.delete(self.salaries, idx), degree)
+                        .predict(self.years[idx:idx + 1])[0] for idx in range(self.years.size)]
+            np.testing.assert_allclose(held_out, expected, rtol=1e-9)
+
+    def test_loo_predictions_undetermined(self):
+        """Test no leave-one-out predictions when a refit would be rank deficient."""
+        self.assertIsNone(loo_predictions([2020.0, 2021.0], [1.0, 2.0], 1))
+        self.assertIsNone(loo_predictions([2020.0, 2021.0, 2022.0], [1.0, 2.0, 4.0], 2))
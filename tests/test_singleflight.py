@@ -0,0 +1,57 @@
+import threading
+import time
+import unittest
+from src.utils.singleflight import SingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+
+    def _run_concurrently(self, flight, fn, callers=8):
+        results, errors = [], []
+        
+        def worker():
+            try:
+                results.append(flight.do('key', fn))
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_concurrent_calls_share_result(self):
+        """Test concurrent callers for a key trigger a single execution."""
+        flight = SingleFlight()
+        calls = []
+        
+        def slow_fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'trends'
+        
+        results, errors = self._run_concurrently(flight, slow_fetch)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['trends'] * 8)
+        self.assertEqual(errors, [])
+        self.assertFalse(flight.in_flight('key'))
+
+    def test_concurrent_calls_share_error(self):
+        """Test waiters receive the leader's exception."""
+        flight = SingleFlight()
+        
+        def failing_fetch():
+            time.sleep(0.2)
+            raise ValueError("feed down")
+        
+        results, errors = self._run_concurrently(flight, failing_fetch, callers=4)
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 4)
+        self.assertTrue(all(isinstance(e, ValueError) for e in errors))
+
+    def test_sequential_calls_run_again(self):
+        """Test a completed call does not pin its result."""
+        flight = SingleFlight()
+        self.assertEqual(flight.do('key', lambda: 1), 1)
+        self.assertEqual(flight.do('key', lambda: 2), 2)
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.repositories.job_frame import JobFrame
+from src.repositories.snapshot_store import CURRENT_NAME, MANIFEST_NAME, SnapshotStore
+
+class TestSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(os.path.join(self.temp_dir.name, 'snapshot'))
+        self.records = [
+            {'category': 'Engineering', 'salary': 100000.0, 'location': 'Pune', 'year': 2022},
+            {'category': 'Marketing', 'salary': 80000.0},
+            {'category': 'Engineering', 'salary': 120000.0, 'company_type': 'Product'}
+        ]
+        self.frame = JobFrame.from_records(self.records)
+        self.frame.validated = True
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test a saved snapshot loads back with memory-mapped columns."""
+        self.store.save(self.frame, {'region': 'India'}, {'Engineering': {'job_count': 2}}, {'total_jobs': 3})
+        saved = self.store.load()
+
+        frame = saved['jobs']
+        self.assertEqual(frame.to_records(), self.records)
+        self.assertTrue(frame.validated)
+        self.assertIsInstance(frame.salary.base, np.memmap)
+        self.assertFalse(frame.salary.flags.writeable)
+        self.assertEqual(saved['metadata'], {'region': 'India'})
+        self.assertEqual(saved['trends'], {'Engineering': {'job_count': 2}})
+        self.assertEqual(saved['statistics'], {'total_jobs': 3})
+
+    def test_save_publishes_new_version(self):
+        """Test every save creates a version directory and makes it current."""
+        first = self.store.save(self.frame, {}, None, {})
+        smaller = JobFrame.from_records(self.records[:1])
+        second = self.store.save(smaller, {}, None, {})
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.store.current_version(), second)
+        self.assertEqual(len(self.store.load()['jobs']), 1)
+        self.assertEqual(len(self.store.load(first)['jobs']), 3)
+        self.assertFalse([name for name in os.listdir(self.store.directory) if name.endswith('.tmp')])
+
+    def test_prunes_old_versions(self):
+        """Test only the most recent versions are kept."""
+        versions = [self.store.save(self.frame, {}, None, {}) for _ in range(4)]
+
+        remaining = sorted(name for name in os.listdir(self.store.directory) if name != CURRENT_NAME)
+        self.assertEqual(remaining, versions[-2:])
+        self.assertIsNone(self.store.load(versions[0]))
+
+    def test_missing_or_unreadable_snapshot(self):
+        """Test a missing or damaged snapshot is ignored."""
+        self.assertIsNone(self.store.current_version())
+        self.assertIsNone(self.store.load())
+
+        version = self.store.save(self.frame, {}, None, {})
+        os.remove(os.path.join(self.store.directory, version, 'salary.npy'))
+        self.assertIsNone(self.store.load())
+
+        version = self.store.save(self.frame, {}, None, {})
+        with open(os.path.join(self.store.directory, version, MANIFEST_NAME), 'w') as f:
+            f.write('{"version": 2,')
+        self.assertIsNone(self.store.load())
@@ -1,4 +1,5 @@
 import unittest
+from src.repositories.job_frame import JobFrame
 from src.utils.validation import validate_prediction_input, validate_job_data, ValidationError
 
 class TestValidation(unittest.TestCase):
@@ -95,3 +96,76 @@ class TestValidation(unittest.TestCase):
         with self.assertRaises(ValidationError) as context:
             validate_job_data(job_data)
         self.assertIn('non-negative', str(context.exception))
+
+    def test_validate_job_frame_valid(self):
+        """Test validation passes for a valid job frame."""
+        frame = JobFrame.from_records([
+            {'category': 'Engineering', 'salary': 100000},
+            {'category': 'Marketing', 'salary': 80000}
+        ])
+        # Should not raise exception
+        validate_job_data(frame)
+
+    def test_validate_job_frame_invalid(self):
+        """Test validation fails for frames with missing or negative values."""
+        with self.assertRaises(ValidationError) as context:
+            validate_job_data(JobFrame.from_records([{'category': 'A', 'salary': 1}, {'salary': 2}]))
+        self.assertIn('index 1', str(context.exception))
+        self.assertIn('category', str(context.exception))
+        
+        with self.assertRaises(ValidationError) as context:
+            validate_job_data(JobFrame.from_records([{'category': 'A', 'salary': -1}]))
+        self.assertIn('non-negative', str(context.exception))
+
+    def test_validate_job_data_reports_all_indices(self):
+        """Test bulk validation reports every offending row."""
+        job_data = [
+            {'category': 'A', 'salary': 1},
+            {'salary': 2},
+            'not a job',
+            {'category': 'B', 'salary': -1},
+            {'category': 'C', 'salary': 'high'},
+            {'category': 'D', 'salary': -2}
+        ]
+        with self.assertRaises(ValidationError) as context:
+            validate_job_data(job_data)
+        self.assertEqual(context.exception.indices, [1, 2, 3, 4, 5])
+        message = str(context.exception)
+        self.assertIn('must be a dictionary at index 2', message)
+        self.assertIn("missing 'category' field at indices 1, 2", message)
+        self.assertIn('non-negative at indices 3, 5', message)
+
+    def test_validate_job_data_tells_missing_from_non_numeric_salary(self):
+        """Test a missing salary and a non-numeric salary are reported apart."""
+        job_data = [
+            {'category': 'A'},
+            {'category': 'B', 'salary': 'high'},
+            {'category': 'C', 'salary': None},
+            {'category': 'D', 'salary': 1}
+        ]
+        for data in (job_data, JobFrame.from_records(job_data)):
+            with self.assertRaises(ValidationError) as context:
+                validate_job_data(data)
+            self.assertEqual(context.exception.indices, [0, 1, 2])
+            message = str(context.exception)
+            self.assertIn("missing 'salary' field at index 0", message)
+            self.assertIn('salary must be a number at indices 1, 2', message)
+
+    def test_validate_job_data_rejects_none_category(self):
+        """Test a category of None counts as missing, unlike the per-record validator it replaced."""
+        with self.assertRaises(ValidationError) as context:
+            validate_job_data([{'category': 'A', 'salary': 1}, {'category': None, 'salary': 2}])
+        self.assertEqual(context.exception.indices, [1])
+        self.assertIn("missing 'category' field at index 1", str(context.exception))
+
+    def test_validate_job_frame_marks_validated(self):
+        """Test a valid frame is marked and not re-validated."""
+        frame = JobFrame.from_records([{'category': 'Engineering', 'salary': 100000}])
+        self.assertFalse(frame.validated)
+        validate_job_data(frame)
+        self.assertTrue(frame.validated)
+        
+        invalid = JobFrame.from_records([{'salary': -1}])
+        with self.assertRaises(ValidationError):
+            validate_job_data(invalid)
+        self.assertFalse(invalid.validated)